@@ -0,0 +1,57 @@
+import time
+from sources.browser_pool import get_browser_pool, run_browser_job
+from sources.finviz_table import SCREENER_TABLE_SELECTOR, extract_screener_rows
+
+# 벤치마크 반복 횟수 및 테이블 크기 (Finviz 스크리너는 페이지당 20행)
+ROUNDS = 20
+ROW_COUNTS = [20, 100]
+
+HEADERS = ["No.", "Ticker", "Company", "Sector", "Industry", "Country",
+           "Market Cap", "P/E", "Price", "Change", "Volume"]
+
+def build_screener_html(row_count):
+    """data/finviz_*.json 과 비슷한 형태의 가짜 스크리너 테이블 HTML 생성"""
+    head = "".join(f"<th>{h}</th>" for h in HEADERS)
+    body = []
+    for i in range(1, row_count + 1):
+        cells = [str(i), f"SYM{i}", f"Company {i} Inc", "Healthcare", "Biotechnology",
+                 "USA", "255.02M", "-", "3.95", f"{i * 1.5:.2f}%", f"{i * 12345:,}"]
+        body.append("<tr>" + "".join(f"<td>{c}</td>" for c in cells) + "</tr>")
+    return (f"<html><body><table class='styled-table-new'><thead><tr>{head}</tr></thead>"
+            f"<tbody>{''.join(body)}</tbody></table></body></html>")
+
+async def extract_per_cell(page):
+    """기존 방식: 행 목록 조회 후 셀마다 text_content() 호출"""
+    results = []
+    rows = await page.query_selector_all(f"{SCREENER_TABLE_SELECTOR} tbody tr")
+    for row in rows:
+        cells = await row.query_selector_all("td")
+        symbol = await cells[1].text_content()
+        name = await cells[2].text_content()
+        change_percent = float((await cells[9].text_content()).strip('%'))
+        results.append({"symbol": symbol, "name": name, "change": change_percent})
+    return results
+
+async def measure(page, extract):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        records = await extract(page)
+    elapsed = (time.perf_counter() - start) / ROUNDS
+    return elapsed, len(records)
+
+async def run_benchmark():
+    async with get_browser_pool().page() as page:
+        for row_count in ROW_COUNTS:
+            await page.set_content(build_screener_html(row_count))
+
+            per_cell, n1 = await measure(page, extract_per_cell)
+            single, n2 = await measure(page, extract_screener_rows)
+
+            print(f"\n[{row_count} rows]")
+            print(f"  per-cell text_content : {per_cell * 1000:8.2f} ms ({n1} records, ~{1 + row_count * 4} round trips)")
+            print(f"  single page.evaluate  : {single * 1000:8.2f} ms ({n2} records, 1 round trip)")
+            print(f"  speedup               : {per_cell / single:8.1f}x")
+
+if __name__ == "__main__":
+    print(f"Finviz screener table extraction benchmark ({ROUNDS} rounds each)")
+    run_browser_job(run_benchmark())
@@ -0,0 +1,68 @@
+import glob
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+# HWP 텍스트 추출 백엔드 벤치마크
+# 사용법: python bench_hwp_extraction.py [HWP 파일 디렉토리]  (기본값: downloads/ 와 state/attachments/blobs/)
+# 백엔드마다 별도 프로세스에서 실행해 최대 RSS 를 따로 잰다 (hwp5html 은 자식 프로세스의 최대 RSS 도 함께 표시)
+BACKENDS = ["inprocess", "hwp5html"]
+DEFAULT_CORPUS_DIRS = ["downloads", os.path.join("state", "attachments", "blobs")]
+
+def find_corpus(dirs):
+    paths = []
+    for directory in dirs:
+        paths.extend(glob.glob(os.path.join(directory, "**", "*.hwp"), recursive=True))
+    return sorted(set(paths))
+
+def run_worker(backend, paths):
+    """자식 프로세스: 한 백엔드로 코퍼스 전체를 추출하고 결과를 JSON 으로 출력"""
+    from utils.hwp_processor import BACKENDS as EXTRACTORS
+    extract = EXTRACTORS[backend]
+
+    ok, chars = 0, 0
+    start = time.perf_counter()
+    for path in paths:
+        text = extract(path)
+        if text:
+            ok += 1
+            chars += len(text)
+    elapsed = time.perf_counter() - start
+
+    print(json.dumps({
+        "elapsed": elapsed,
+        "ok": ok,
+        "chars": chars,
+        # 리눅스의 ru_maxrss 단위는 KB
+        "self_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "child_rss_kb": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    }))
+
+def run_backend(backend, paths):
+    cmd = [sys.executable, os.path.abspath(__file__), "--worker", backend, *paths]
+    result = subprocess.run(cmd, capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    if result.returncode != 0:
+        print(f"  {backend:<10}: failed\n{result.stderr}")
+        return
+    stats = json.loads(result.stdout.strip().splitlines()[-1])
+    docs_per_sec = len(paths) / stats["elapsed"] if stats["elapsed"] else float("inf")
+    print(f"  {backend:<10}: {docs_per_sec:8.1f} docs/sec, "
+          f"{stats['ok']}/{len(paths)} ok, {stats['chars']:,} chars, "
+          f"peak RSS {stats['self_rss_kb'] / 1024:6.1f} MB (children {stats['child_rss_kb'] / 1024:6.1f} MB)")
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == "--worker":
+        run_worker(sys.argv[2], sys.argv[3:])
+        sys.exit(0)
+
+    corpus = find_corpus(sys.argv[1:] or DEFAULT_CORPUS_DIRS)
+    if not corpus:
+        print("No .hwp files found. Usage: python bench_hwp_extraction.py <corpus dir>")
+        sys.exit(1)
+
+    print(f"HWP text extraction benchmark ({len(corpus)} documents)")
+    for backend in BACKENDS:
+        run_backend(backend, corpus)
@@ -0,0 +1,99 @@
+import random
+import time
+import tracemalloc
+from utils.text_normalizer import normalize_text
+
+# 추출 텍스트 정리 벤치마크: 기존 clean_content / clean_extracted_text vs 스트리밍 정리기
+# output.txt(공고문 예시)를 반복해 문서 크기를 키우고, 표 테두리/빈 줄/중복 줄을 섞는다
+ROUNDS = 5
+SIZES_KB = [32, 1024, 8192]
+CHUNK_SIZE = 64 * 1024
+
+def legacy_clean_content(content):
+    """기존 clean_content (줄 목록을 만든 뒤 다시 합치는 방식)"""
+    if not content:
+        return ""
+    lines = []
+    prev_line = ""
+    for line in content.split('\n'):
+        line = line.strip()
+        if not line:
+            if prev_line:
+                lines.append("")
+                prev_line = ""
+            continue
+        if line.startswith('+') and line.endswith('+'):
+            lines.append(line)
+            prev_line = line
+            continue
+        if line != prev_line:
+            lines.append(line)
+            prev_line = line
+    while lines and not lines[-1]:
+        lines.pop()
+    return '\n'.join(lines)
+
+def legacy_clean_extracted_text(text):
+    """기존 clean_extracted_text (공백을 한 칸으로 합치는 방식, 비교용으로만 남겨 둠)"""
+    if not text:
+        return ""
+    text = ' '.join(text.split())
+    return text.replace('\x0c', '')
+
+def build_document(size_kb):
+    with open("output.txt", "r", encoding="utf-8") as f:
+        words = f.read().split()
+    rng = random.Random(0)
+    border = "+" + "+".join("-" * rng.randint(4, 12) for _ in range(4)) + "+"
+    lines, size = [], 0
+    while size < size_kb * 1024:
+        kind = rng.random()
+        if kind < 0.1:
+            line = border
+        elif kind < 0.2:
+            line = "   "
+        elif kind < 0.25 and lines:
+            line = lines[-1]
+        else:
+            start = rng.randrange(len(words))
+            line = "  " + " ".join(words[start:start + rng.randint(3, 15)]) + " \x0c"
+        lines.append(line)
+        size += len(line.encode("utf-8")) + 1
+    return "\n".join(lines)
+
+def iter_chunks(text):
+    for start in range(0, len(text), CHUNK_SIZE):
+        yield text[start:start + CHUNK_SIZE]
+
+def measure(func, text):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        result = func(text)
+    elapsed = (time.perf_counter() - start) / ROUNDS
+
+    tracemalloc.start()
+    func(text)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+if __name__ == "__main__":
+    cases = [
+        ("legacy clean_content", legacy_clean_content),
+        ("legacy clean_extracted_text", legacy_clean_extracted_text),
+        ("normalize_text (str)", normalize_text),
+        ("normalize_text (64KB chunks)", lambda text: normalize_text(iter_chunks(text))),
+    ]
+    print(f"Extracted text normalizer benchmark ({ROUNDS} rounds each)")
+    for size_kb in SIZES_KB:
+        text = build_document(size_kb)
+        mb = len(text.encode("utf-8")) / (1024 * 1024)
+        print(f"\n[{size_kb} KB document]")
+        expected = None
+        for name, func in cases:
+            elapsed, peak, result = measure(func, text)
+            if func is legacy_clean_content:
+                expected = result
+            elif name.startswith("normalize_text"):
+                assert result == expected, f"{name} output differs from clean_content"
+            print(f"  {name:<30}: {mb / elapsed:8.1f} MB/s, peak alloc {peak / (1024 * 1024):7.2f} MB")
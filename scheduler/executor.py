@@ -0,0 +1,185 @@
+# scheduler/executor.py
+"""
+스케줄된 작업을 워커 풀에서 실행하는 비차단 실행기.
+
+- schedule 루프는 작업을 넘기기만 하고 바로 다음 작업을 확인한다.
+- 같은 작업은 동시에 한 번만 실행된다 (중복 실행 방지).
+- 실행 중에 다시 도착한 트리거는 작업별 정책으로 처리한다.
+    skip     : 버린다
+    coalesce : 여러 번 밀려도 끝난 뒤 한 번만 실행한다
+    catchup  : 밀린 횟수만큼 차례로 실행한다 (max_pending 까지)
+- 작업별 타임아웃: process 격리는 자식 프로세스 그룹을 종료한다.
+  thread 격리는 스레드를 강제 종료할 수 없으므로 시간 초과를 기록만 하고(권고용),
+  작업이 time_remaining() 으로 남은 시간을 읽어 스스로 마감을 지켜야 한다.
+- 큐 지연(예정 시각과 실제 시작 시각의 차이)을 로깅한다.
+"""
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from utils.process_utils import kill_process_group
+
+SKIP = "skip"
+COALESCE = "coalesce"
+CATCHUP = "catchup"
+
+class JobSpec:
+    def __init__(self, name, func, timeout=None, misfire_policy=SKIP, isolation="thread", max_pending=10):
+        """
+        Args:
+            name (str): 작업 이름 (로그 및 중복 실행 판단 기준)
+            func (callable): 실행할 함수 (process 격리 시 모듈 최상위 함수여야 함)
+            timeout (float, optional): 작업 제한 시간(초)
+            misfire_policy (str): 실행 중 도착한 트리거 처리 정책 (skip / coalesce / catchup)
+            isolation (str): thread 또는 process
+            max_pending (int): catchup 정책에서 쌓아둘 최대 트리거 수
+        """
+        if misfire_policy not in (SKIP, COALESCE, CATCHUP):
+            raise ValueError(f"알 수 없는 misfire 정책: {misfire_policy}")
+        if isolation not in ("thread", "process"):
+            raise ValueError(f"알 수 없는 격리 방식: {isolation}")
+        self.name = name
+        self.func = func
+        self.timeout = timeout
+        self.misfire_policy = misfire_policy
+        self.isolation = isolation
+        self.max_pending = max_pending
+
+def _process_entry(func):
+    """process 격리 작업의 진입점. 타임아웃 시 자식(Chrome 등)까지 함께 종료할 수 있도록 새 프로세스 그룹을 만든다."""
+    if hasattr(os, "setpgrp"):
+        os.setpgrp()
+    logging.basicConfig(
+        level=logging.INFO,
+        format='[%(asctime)s] %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+    func()
+
+_job_context = threading.local()
+
+def time_remaining():
+    """
+    thread 격리 작업 안에서 호출하면 이번 실행의 제한 시간까지 남은 초(0 이상)를 반환한다.
+    제한 시간이 없거나 작업 밖에서 호출하면 None.
+    """
+    deadline = getattr(_job_context, "deadline", None)
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+class JobExecutor:
+    def __init__(self, max_workers=4):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._lock = threading.Lock()
+        self._running = set()
+        self._pending = {}
+        self._jobs = {}
+
+    def schedule(self, every, spec):
+        """
+        schedule.every(...) 빌더에 작업을 등록한다.
+        예) executor.schedule(schedule.every(1).minutes, JobSpec("realtime", run))
+        """
+        job = every.do(self.dispatch, spec)
+        self._jobs[spec.name] = job
+        return job
+
+    def dispatch(self, spec):
+        """schedule 루프에서 호출된다. 작업을 워커 풀로 넘기고 즉시 반환한다."""
+        job = self._jobs.get(spec.name)
+        # schedule 은 작업 함수를 호출한 뒤에 next_run 을 갱신하므로, 지금 값이 이번 예정 시각이다
+        scheduled_at = job.next_run if job is not None and job.next_run else datetime.now()
+
+        with self._lock:
+            if spec.name in self._running:
+                self._handle_misfire(spec, scheduled_at)
+                return
+            self._running.add(spec.name)
+
+        self._pool.submit(self._run, spec, scheduled_at)
+
+    def _handle_misfire(self, spec, scheduled_at):
+        pending = self._pending.setdefault(spec.name, deque())
+
+        if spec.misfire_policy == SKIP:
+            logging.warning(f"⏭️ [{spec.name}] 이전 실행이 진행 중이라 이번 실행을 건너뜁니다")
+        elif spec.misfire_policy == COALESCE:
+            if pending:
+                logging.info(f"🔁 [{spec.name}] 밀린 실행을 1회로 병합합니다")
+            else:
+                pending.append(scheduled_at)
+                logging.info(f"🔁 [{spec.name}] 이전 실행 종료 후 1회 실행 예약")
+        else:
+            if len(pending) >= spec.max_pending:
+                logging.warning(f"⏭️ [{spec.name}] 밀린 실행이 {spec.max_pending}회를 넘어 이번 실행을 건너뜁니다")
+            else:
+                pending.append(scheduled_at)
+                logging.info(f"🔁 [{spec.name}] 밀린 실행 {len(pending)}회 대기 중")
+
+    def _run(self, spec, scheduled_at):
+        while True:
+            lag = (datetime.now() - scheduled_at).total_seconds()
+            logging.info(f"▶️ [{spec.name}] 실행 시작 (큐 지연 {lag:.2f}초)")
+            started = datetime.now()
+
+            try:
+                if spec.isolation == "process":
+                    self._call_in_process(spec)
+                else:
+                    self._call_in_thread(spec)
+            except Exception as e:
+                logging.error(f"❌ [{spec.name}] 작업 실패: {str(e)}")
+
+            elapsed = (datetime.now() - started).total_seconds()
+            logging.info(f"⏹️ [{spec.name}] 실행 종료 ({elapsed:.1f}초)")
+
+            with self._lock:
+                pending = self._pending.get(spec.name)
+                if not pending:
+                    self._running.discard(spec.name)
+                    return
+                scheduled_at = pending.popleft()
+
+    def _call_in_thread(self, spec):
+        if not spec.timeout:
+            spec.func()
+            return
+
+        def on_timeout():
+            logging.error(f"⏰ [{spec.name}] {spec.timeout}초 제한 시간 초과 (스레드 작업은 종료될 때까지 중복 실행을 막습니다)")
+
+        watchdog = threading.Timer(spec.timeout, on_timeout)
+        watchdog.daemon = True
+        watchdog.start()
+        _job_context.deadline = time.monotonic() + spec.timeout
+        try:
+            spec.func()
+        finally:
+            _job_context.deadline = None
+            watchdog.cancel()
+
+    def _call_in_process(self, spec):
+        proc = multiprocessing.get_context("spawn").Process(
+            target=_process_entry,
+            args=(spec.func,),
+            name=f"job-{spec.name}",
+            daemon=False
+        )
+        proc.start()
+        proc.join(spec.timeout)
+
+        if proc.is_alive():
+            logging.error(f"⏰ [{spec.name}] {spec.timeout}초 제한 시간 초과, 프로세스를 종료합니다")
+            kill_process_group(proc)
+            raise TimeoutError(f"{spec.name} 작업 시간 초과")
+
+        if proc.exitcode != 0:
+            raise RuntimeError(f"{spec.name} 프로세스 종료 코드 {proc.exitcode}")
+
+    def shutdown(self, wait=False):
+        self._pool.shutdown(wait=wait, cancel_futures=True)
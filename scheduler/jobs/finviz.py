@@ -1,6 +1,6 @@
 import logging
-import asyncio
 from sources.finviz_selenium import main as finviz_main
+from sources.browser_pool import run_browser_job
 
 def run():
     """
@@ -11,7 +11,7 @@ def run():
     logging.info("📡 [FINVIZ] 히트맵 캡처 시작")
     
     try:
-        asyncio.run(finviz_main())
+        run_browser_job(finviz_main())
         logging.info("✅ [FINVIZ] 히트맵 캡처 및 업로드 완료")
     except Exception as e:
         logging.error(f"❌ [FINVIZ] 작업 실패: {str(e)}") 
\ No newline at end of file
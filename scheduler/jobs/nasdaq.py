@@ -1,21 +1,17 @@
 import logging
-import asyncio
-from sources.nasdaq_gainers import scrape_and_filter_nasdaq_gainers
-from sources.nasdaq_losers import scrape_and_filter_nasdaq_losers
+from sources.screener import run_screeners
+from sources.browser_pool import run_browser_job
 
 def run():
     """
     스케줄러에서 실행될 메인 함수
-    - Nasdaq 상승 종목 크롤링
-    - Nasdaq 하락 종목 크롤링
+    - NIGHTLY_SCREENERS 에 등록된 스크리너(기본: Nasdaq 상승/하락 종목)를 동시에 크롤링
     """
-    logging.info("📡 [NASDAQ] 상승 종목 크롤링 시작")
+    logging.info("📡 [NASDAQ] 스크리너 크롤링 시작")
     
     try:
-        asyncio.run(scrape_and_filter_nasdaq_gainers())
-        logging.info("✅ [NASDAQ] 상승 종목 크롤링 완료")
-        logging.info("📡 [NASDAQ] 하락 종목 크롤링 시작")
-        asyncio.run(scrape_and_filter_nasdaq_losers())
-        logging.info("✅ [NASDAQ] 하락 종목 크롤링 완료")
+        results = run_browser_job(run_screeners())
+        summary = ", ".join(f"{name} {len(rows)}개" for name, rows in results.items())
+        logging.info(f"✅ [NASDAQ] 스크리너 크롤링 완료 ({summary})")
     except Exception as e:
-        logging.error(f"❌ [NASDAQ] 작업 실패: {str(e)}") 
\ No newline at end of file
+        logging.error(f"❌ [NASDAQ] 작업 실패: {str(e)}")
@@ -1,21 +1,61 @@
 # jobs/realtime.py
 import logging
+import os
+from scheduler.executor import time_remaining
 from sources.realtime_selenium import get_first_source_keywords
-from utils.api import post_keywords_to_api
+from utils.api import build_keyword_payloads
+from utils.config import STATE_DIR, REALTIME_DELIVERY_MODE, REALTIME_HEARTBEAT_MINUTES
+from utils.keyword_snapshot import KeywordSnapshotStore, plan_delivery
+from utils.outbox import deliver, TOPIC_SEARCH_TERMS
+
+_snapshot_store = None
+
+def _get_snapshot_store():
+    global _snapshot_store
+    if _snapshot_store is None:
+        _snapshot_store = KeywordSnapshotStore(os.path.join(STATE_DIR, "realtime_keywords.json"))
+    return _snapshot_store
 
 def run():
     """
     스케줄러에서 실행될 메인 함수.
     - 키워드 수집
-    - API 전송
+    - 마지막 전송 스냅샷과 비교해 전송할 항목 선택 (REALTIME_DELIVERY_MODE)
+    - API 전송 후, 전송에 성공한 플랫폼의 스냅샷 갱신
     """
     logging.info("📡 [REALTIME] 키워드 수집 시작")
 
-    data = get_first_source_keywords()
+    # 스케줄러 제한 시간 안에서만 수집 (thread 작업은 실행기가 강제 종료하지 못하므로 수집기가 마감을 지킨다)
+    data = get_first_source_keywords(timeout=time_remaining())
 
     if not data:
         logging.warning("❌ [REALTIME] 키워드 수집 실패 또는 결과 없음")
         return
 
-    post_keywords_to_api(data)
+    store = _get_snapshot_store()
+    plan = plan_delivery(store, data, REALTIME_DELIVERY_MODE, REALTIME_HEARTBEAT_MINUTES)
+
+    if not plan:
+        logging.info("💤 [REALTIME] 순위 변동 없음, 전송 생략")
+        return
+
+    for platform, item in plan.items():
+        diff = item["diff"]
+        logging.info(
+            f"🔀 [REALTIME] {platform}: 신규 {len(diff['new'])} / 변동 {len(diff['moved'])} / "
+            f"이탈 {len(diff['dropped'])} → {len(item['entries'])}건 {'전체' if item['full'] else '변경분'} 전송"
+        )
+
+    platforms = list(plan)
+    payloads = build_keyword_payloads({platform: plan[platform]["entries"] for platform in platforms})
+    flags = deliver(TOPIC_SEARCH_TERMS, payloads)
+
+    # 플랫폼의 모든 항목이 전송(outbox 기록)된 경우에만 스냅샷 갱신 (실패분은 다음 실행에서 다시 변경으로 잡힘)
+    offset = 0
+    for platform in platforms:
+        count = len(plan[platform]["entries"])
+        if all(flags[offset:offset + count]):
+            store.update(platform, data[platform], plan[platform]["full"])
+        offset += count
+
     logging.info("✅ [REALTIME] 키워드 수집 및 저장 완료")
@@ -2,29 +2,41 @@
 import schedule
 import logging
 from datetime import datetime
+from scheduler.executor import JobSpec, SKIP, COALESCE
 from scheduler.jobs.realtime import run
 from scheduler.jobs.mofa import run_mofa_crawler
 from scheduler.jobs.finviz import run as run_finviz
 from scheduler.jobs.nasdaq import run as run_nasdaq
 
-def register_jobs():
+def _register(every, spec, executor):
+    """executor 가 있으면 워커 풀에서, 없으면 기존처럼 schedule 루프에서 직접 실행"""
+    if executor is None:
+        every.do(spec.func)
+    else:
+        executor.schedule(every, spec)
+
+def register_jobs(executor=None):
     """크롤러별 실행 시간 등록 (EC2 UTC 기준)"""
     
-    # 실시간 검색어 크롤러 (매 10분마다)
-    schedule.every(1).minutes.do(run)
+    # 실시간 검색어 크롤러 (매 1분마다, 이전 실행이 끝나지 않았으면 건너뜀)
+    # thread 격리 작업의 timeout 은 권고용이다 (실행기가 스레드를 강제로 끝낼 수 없음).
+    # realtime 작업은 남은 시간으로 페이지 로드/스크립트/렌더링 대기 상한을 줄여 스스로 55초 안에 끝낸다.
+    # 강제 종료가 필요한 작업은 isolation="process" 로 등록한다.
+    _register(schedule.every(1).minutes, JobSpec("realtime", run, timeout=55, misfire_policy=SKIP), executor)
     
     # # 외교부 채용정보 크롤러 (매일 오전 9시, 오후 9시)
     # schedule.every().day.at("09:00").do(run_mofa_crawler)
     # schedule.every().day.at("21:00").do(run_mofa_crawler)
     
     # 외교부 채용정보 크롤러 (한국 시간 오전 6시 = UTC 21:00)
-    # schedule.every().day.at("21:00").do(run_mofa_crawler)
+    # _register(schedule.every().day.at("21:00"),
+    #           JobSpec("mofa", run_mofa_crawler, timeout=1800, misfire_policy=COALESCE, isolation="process"), executor)
     
     # Finviz 히트맵 캡처 (한국 시간 오전 6시 5분 = UTC 21:05)
-    schedule.every().day.at("21:05").do(run_finviz)
+    _register(schedule.every().day.at("21:05"), JobSpec("finviz", run_finviz, timeout=600, misfire_policy=COALESCE), executor)
     
     # Nasdaq 상승 하락 종목 크롤러 (한국 시간 오전 6시 10분 = UTC 21:10)
-    schedule.every().day.at("21:10").do(run_nasdaq)
+    _register(schedule.every().day.at("21:10"), JobSpec("nasdaq", run_nasdaq, timeout=600, misfire_policy=COALESCE), executor)
 
     logging.info("✅ 크롤러 스케줄 등록 완료")
     logging.info(f"📅 등록된 크롤러: 실시간 검색어(10분), 외교부 채용정보(한국시간 06:00), Finviz 히트맵(한국시간 06:05), Nasdaq 종목(한국시간 06:10)")
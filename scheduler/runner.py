@@ -3,6 +3,9 @@ import time
 import logging
 import schedule
 from scheduler.registry import register_jobs  # 절대 경로만 사용
+from scheduler.executor import JobExecutor
+from utils.config import SCHEDULER_MODE, SCHEDULER_MAX_WORKERS
+from utils.outbox import start_outbox_flusher, stop_outbox_flusher
 
 logging.basicConfig(
     level=logging.INFO,
@@ -11,12 +14,21 @@ logging.basicConfig(
 )
 
 def run_scheduler():
-    register_jobs()
-    logging.info("⏱️ 스케줄러 시작!")
+    # concurrent: 작업을 워커 풀에서 실행 (느린 작업이 다른 작업을 막지 않음), serial: 기존 단일 스레드 실행
+    executor = JobExecutor(max_workers=SCHEDULER_MAX_WORKERS) if SCHEDULER_MODE == "concurrent" else None
+    register_jobs(executor)
+    # 작업들은 outbox 에 기록만 하고, 전송은 이 flusher 가 백그라운드에서 담당
+    start_outbox_flusher()
+    logging.info(f"⏱️ 스케줄러 시작! (모드: {SCHEDULER_MODE})")
 
-    while True:
-        schedule.run_pending()
-        time.sleep(1)
+    try:
+        while True:
+            schedule.run_pending()
+            time.sleep(1)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        stop_outbox_flusher()
 
 if __name__ == "__main__":
-    run_scheduler()
\ No newline at end of file
+    run_scheduler()
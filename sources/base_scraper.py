@@ -1,24 +1,46 @@
 import asyncio
 import logging
 from datetime import datetime
-from playwright.async_api import async_playwright, TimeoutError
+from playwright.async_api import TimeoutError
+from utils.config import FINVIZ_FETCH_MODE
+from .browser_pool import get_browser_pool
+from .finviz_http import fetch_screener_rows
+from .finviz_table import extract_screener_rows
+from .readiness import wait_for_network_idle
 
 class BaseFinvizScraper:
-    def __init__(self, max_retries=3, retry_delay=5):
+    def __init__(self, max_retries=3, retry_delay=5, fetch_mode=FINVIZ_FETCH_MODE):
         self.max_retries = max_retries
         self.retry_delay = retry_delay
+        self.fetch_mode = fetch_mode  # auto: HTTP 우선 후 브라우저 폴백, http: HTTP 만, browser: 브라우저만
         
-    async def _setup_browser(self):
-        p = await async_playwright().start()
-        browser = await p.chromium.launch(
-            headless=False,
-            slow_mo=50,
-        )
-        context = await browser.new_context(
-            user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36',
+    def _browser_context(self):
+        """공유 브라우저 풀에서 격리된 context 를 빌려온다 (async with 로 사용)."""
+        return get_browser_pool().context(
             viewport={'width': 1920, 'height': 1080}
         )
-        return p, browser, context
+
+    async def fetch_screener(self, url, limit=None):
+        """
+        스크리너 종목 레코드를 가져온다.
+        HTTP 빠른 경로를 먼저 시도하고, 테이블이 없거나 차단된 경우에만 브라우저로 폴백한다.
+        """
+        if self.fetch_mode != "browser":
+            records = await asyncio.to_thread(fetch_screener_rows, url, limit)
+            if records:
+                logging.info(f"⚡ HTTP 경로로 {len(records)}개 행 수집")
+                return records
+            if self.fetch_mode == "http":
+                logging.error("❌ HTTP 경로 실패 (브라우저 폴백 비활성화)")
+                return []
+            logging.info("🌐 HTTP 경로 실패, 브라우저로 폴백합니다")
+
+        async with self._browser_context() as context:
+            page, success = await self._load_page_with_retry(context, url)
+            if not success:
+                logging.error("❌ 최대 재시도 횟수 초과")
+                return []
+            return await extract_screener_rows(page, limit)
 
     async def _load_page_with_retry(self, context, url):
         page = await context.new_page()
@@ -34,7 +56,8 @@ class BaseFinvizScraper:
                     logging.info("⚠️ 페이지 로딩 시간 초과, 새로고침...")
                     await page.evaluate("window.stop();")
                     await page.reload(timeout=60000)
-                    await page.wait_for_timeout(2000)
+                    # 고정 2초 대기 대신 잠깐의 네트워크 유휴만 확인하고 아래 테이블 대기로 넘어감
+                    await wait_for_network_idle(page, idle_ms=500, timeout=2)
                 
                 # Wait for the table to load
                 table_selector = "table.styled-table-new"
@@ -0,0 +1,150 @@
+# sources/browser_pool.py
+"""
+스케줄러 프로세스 전체에서 공유하는 Playwright 브라우저 풀.
+
+Chromium 은 프로세스당 한 번만 실행하고, 각 스크래퍼에는 격리된 context/page 를 빌려준다.
+Playwright 객체는 생성된 이벤트 루프에 묶이므로, 풀은 전용 이벤트 루프 스레드를 가지고
+스크래퍼 코루틴은 `run_browser_job()` 으로 그 루프에서 실행한다.
+"""
+import asyncio
+import atexit
+import logging
+import threading
+from contextlib import asynccontextmanager
+from playwright.async_api import async_playwright
+from utils.config import BROWSER_HEADLESS, BROWSER_MAX_USES
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36'
+
+class BrowserPool:
+    def __init__(self, headless=True, max_uses=50, slow_mo=0):
+        self.headless = headless
+        self.max_uses = max_uses  # 이 횟수만큼 context 를 내준 뒤 브라우저 재시작
+        self.slow_mo = slow_mo
+        self._playwright = None
+        self._browser = None
+        self._uses = 0
+        self._active = 0
+        self._lock = asyncio.Lock()
+        self._loop = None
+        self._thread = None
+        self._thread_lock = threading.Lock()
+
+    def _ensure_loop(self):
+        with self._thread_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever,
+                    name="browser-pool",
+                    daemon=True
+                )
+                self._thread.start()
+        return self._loop
+
+    def run(self, coro):
+        """코루틴을 풀 전용 이벤트 루프에서 실행하고 결과를 반환한다 (동기 호출용)."""
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("브라우저 풀 루프 안에서는 run() 을 호출할 수 없습니다. await 를 사용하세요.")
+        loop = self._ensure_loop()
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+    def _check_loop(self):
+        if asyncio.get_running_loop() is not self._loop:
+            raise RuntimeError("BrowserPool 은 run_browser_job() 으로 실행된 코루틴에서만 사용할 수 있습니다.")
+
+    async def _launch(self):
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+        self._browser = await self._playwright.chromium.launch(
+            headless=self.headless,
+            slow_mo=self.slow_mo,
+        )
+        self._uses = 0
+        logging.info("🚀 공유 Chromium 브라우저 실행")
+
+    async def _close_browser(self):
+        if self._browser is None:
+            return
+        try:
+            await self._browser.close()
+        except Exception as e:
+            logging.warning(f"⚠️ 브라우저 종료 중 오류: {str(e)}")
+        self._browser = None
+
+    async def _acquire_browser(self):
+        async with self._lock:
+            # 헬스 체크: 크래시 등으로 연결이 끊어진 브라우저는 교체
+            if self._browser is not None and not self._browser.is_connected():
+                logging.warning("⚠️ 브라우저 연결이 끊어져 재시작합니다")
+                self._browser = None
+            # 사용 횟수 초과 시, 빌려준 context 가 모두 반환된 뒤에 재활용
+            if self._browser is not None and self._uses >= self.max_uses and self._active == 0:
+                logging.info(f"♻️ 브라우저 {self._uses}회 사용, 재시작합니다")
+                await self._close_browser()
+            if self._browser is None:
+                await self._launch()
+            self._uses += 1
+            self._active += 1
+            return self._browser
+
+    @asynccontextmanager
+    async def context(self, **options):
+        """격리된 BrowserContext 를 빌려준다. 블록을 벗어나면 context 는 닫힌다."""
+        self._check_loop()
+        browser = await self._acquire_browser()
+        options.setdefault("user_agent", DEFAULT_USER_AGENT)
+        context = None
+        try:
+            context = await browser.new_context(**options)
+            yield context
+        finally:
+            self._active -= 1
+            if context is not None:
+                try:
+                    await context.close()
+                except Exception as e:
+                    logging.warning(f"⚠️ 브라우저 컨텍스트 종료 중 오류: {str(e)}")
+
+    @asynccontextmanager
+    async def page(self, **options):
+        """새 context 의 page 하나를 빌려준다."""
+        async with self.context(**options) as context:
+            yield await context.new_page()
+
+    async def close(self):
+        async with self._lock:
+            await self._close_browser()
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+
+    def shutdown(self):
+        """브라우저와 전용 이벤트 루프를 정리한다. 프로세스 종료 시 자동 호출된다."""
+        if self._loop is None:
+            return
+        try:
+            self.run(self.close())
+        except Exception as e:
+            logging.warning(f"⚠️ 브라우저 풀 종료 중 오류: {str(e)}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        self._loop = None
+        self._thread = None
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_browser_pool():
+    """프로세스 전역 브라우저 풀을 반환한다."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool(headless=BROWSER_HEADLESS, max_uses=BROWSER_MAX_USES)
+            atexit.register(_pool.shutdown)
+        return _pool
+
+def run_browser_job(coro):
+    """스크래퍼 코루틴을 공유 브라우저 풀의 이벤트 루프에서 실행한다."""
+    return get_browser_pool().run(coro)
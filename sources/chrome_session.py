@@ -0,0 +1,133 @@
+# sources/chrome_session.py
+"""
+여러 번의 실행에 걸쳐 재사용하는 상주형 Selenium Chrome 세션.
+
+매 실행마다 Chrome 을 새로 띄우는 대신 하나의 드라이버를 살려 두고,
+세션 상태를 확인해 크래시/사용 횟수 초과/메모리(RSS) 초과 시 투명하게 재시작한다.
+종료 시 chromedriver 의 자식 프로세스까지 정리해 좀비 프로세스가 쌓이지 않게 한다.
+"""
+import atexit
+import logging
+import threading
+from contextlib import contextmanager
+import psutil
+from selenium import webdriver
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+class ChromeSession:
+    def __init__(self, options_factory, setup=None, name="chrome", max_runs=100, max_rss_mb=None):
+        """
+        Args:
+            options_factory (callable): 새 ChromeOptions 를 만드는 함수
+            setup (callable, optional): 드라이버 생성 직후 한 번 호출할 함수 (driver → None)
+            name (str): 로그에 표시할 세션 이름
+            max_runs (int): 이 횟수만큼 사용한 뒤 재시작
+            max_rss_mb (int, optional): chromedriver + Chrome 프로세스 RSS 합계 상한(MB)
+        """
+        self.options_factory = options_factory
+        self.setup = setup
+        self.name = name
+        self.max_runs = max_runs
+        self.max_rss_mb = max_rss_mb
+        self._driver = None
+        self._runs = 0
+        self._lock = threading.Lock()
+        atexit.register(self.quit)
+
+    def _start(self):
+        logging.info(f"🚀 [{self.name}] Chrome 세션 시작")
+        driver = webdriver.Chrome(options=self.options_factory())
+        try:
+            if self.setup:
+                self.setup(driver)
+        except Exception:
+            self._quit_driver(driver)
+            raise
+        self._driver = driver
+        self._runs = 0
+
+    def _is_healthy(self):
+        try:
+            return self._driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def _processes(self, driver):
+        """chromedriver 프로세스와 그 자식(Chrome 렌더러 등) 목록"""
+        try:
+            root = psutil.Process(driver.service.process.pid)
+            return [root] + root.children(recursive=True)
+        except (AttributeError, psutil.Error):
+            return []
+
+    def rss_mb(self):
+        if self._driver is None:
+            return 0.0
+        total = 0
+        for proc in self._processes(self._driver):
+            try:
+                total += proc.memory_info().rss
+            except psutil.Error:
+                continue
+        return total / (1024 * 1024)
+
+    def _restart_reason(self):
+        if self._driver is None:
+            return "최초 실행"
+        if not self._is_healthy():
+            return "세션 응답 없음"
+        if self.max_runs and self._runs >= self.max_runs:
+            return f"{self._runs}회 사용"
+        if self.max_rss_mb:
+            rss = self.rss_mb()
+            if rss > self.max_rss_mb:
+                return f"RSS {rss:.0f}MB > {self.max_rss_mb}MB"
+        return None
+
+    def _quit_driver(self, driver):
+        processes = self._processes(driver)
+        try:
+            driver.quit()
+        except Exception as e:
+            logging.warning(f"⚠️ [{self.name}] 드라이버 종료 중 오류: {str(e)}")
+        # quit 이후에도 남은 Chrome 프로세스 정리 (좀비 방지)
+        for proc in processes:
+            try:
+                if proc.is_running():
+                    proc.kill()
+            except psutil.Error:
+                continue
+        psutil.wait_procs(processes, timeout=5)
+
+    def restart(self, reason="요청"):
+        """현재 드라이버를 종료한다. 다음 사용 시 새 Chrome 이 시작된다."""
+        if self._driver is not None:
+            logging.info(f"♻️ [{self.name}] Chrome 세션 정리 ({reason})")
+            self._quit_driver(self._driver)
+            self._driver = None
+
+    @contextmanager
+    def session(self):
+        """
+        상태가 확인된 드라이버를 빌려준다. 블록 안에서 WebDriverException 이 발생하면
+        세션을 폐기해 다음 실행에서 새로 시작한다.
+        """
+        with self._lock:
+            reason = self._restart_reason()
+            if reason:
+                self.restart(reason)
+                self._start()
+            try:
+                yield self._driver
+            except TimeoutException:
+                # 페이지 로딩 시간 초과는 세션 자체의 문제는 아니므로 다음 헬스 체크에 맡긴다
+                raise
+            except WebDriverException:
+                self.restart("WebDriver 오류")
+                raise
+            finally:
+                self._runs += 1
+
+    def quit(self):
+        with self._lock:
+            self.restart("종료")
@@ -0,0 +1,71 @@
+# sources/finviz_http.py
+"""
+브라우저 없이 Finviz 스크리너를 가져오는 HTTP 빠른 경로.
+
+스크리너 테이블은 서버에서 렌더링되므로, 풀링된 requests.Session 으로 HTML 을 받아
+테이블 부분만 파싱한다. 테이블이 없거나 봇 차단 응답이면 None 을 반환하고,
+호출 측(BaseFinvizScraper)이 브라우저 경로로 폴백한다.
+"""
+import logging
+import requests
+from bs4 import BeautifulSoup, SoupStrainer
+from .browser_pool import DEFAULT_USER_AGENT
+from .finviz_table import parse_screener_rows
+from .http_session import HTML_PARSER, SharedSession
+
+# 봇 차단/요청 제한으로 보는 응답 코드
+BLOCKED_STATUS_CODES = {403, 429, 503}
+
+REQUEST_HEADERS = {
+    "User-Agent": DEFAULT_USER_AGENT,
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9,ko;q=0.8",
+}
+
+_session = SharedSession(REQUEST_HEADERS)
+
+def get_session():
+    """Finviz 요청용 keep-alive 세션 (프로세스 전역)"""
+    return _session.get()
+
+def parse_screener_html(html, limit=None):
+    """
+    스크리너 HTML 에서 styled-table-new 테이블을 찾아 종목 레코드 목록으로 변환한다.
+    테이블이 없으면 None 을 반환한다.
+    """
+    strainer = SoupStrainer("table", class_="styled-table-new")
+    soup = BeautifulSoup(html, HTML_PARSER, parse_only=strainer)
+    table = soup.find("table")
+    if table is None:
+        return None
+
+    headers = [th.get_text(strip=True) for th in table.select("thead th")]
+    rows = [
+        [td.get_text() for td in tr.find_all("td")]
+        for tr in table.select("tbody tr")
+    ]
+    return parse_screener_rows(headers, rows, limit)
+
+def fetch_screener_rows(url, limit=None, timeout=10):
+    """
+    스크리너 페이지를 HTTP 로 받아 종목 레코드 목록을 반환한다.
+    차단되었거나 테이블을 찾지 못하면 None (브라우저 폴백 필요).
+    """
+    try:
+        res = get_session().get(url, timeout=timeout)
+    except requests.RequestException as e:
+        logging.warning(f"⚠️ Finviz HTTP 요청 실패: {str(e)}")
+        return None
+
+    if res.status_code in BLOCKED_STATUS_CODES:
+        logging.warning(f"⚠️ Finviz HTTP 차단 응답 → {res.status_code}")
+        return None
+    if res.status_code != 200:
+        logging.warning(f"⚠️ Finviz HTTP 응답 오류 → {res.status_code}")
+        return None
+
+    records = parse_screener_html(res.text, limit)
+    if not records:
+        logging.warning("⚠️ HTTP 응답에서 스크리너 테이블을 찾을 수 없습니다 (봇 차단 가능성)")
+        return None
+    return records
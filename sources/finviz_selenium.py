@@ -1,10 +1,12 @@
 import asyncio
-from playwright.async_api import async_playwright
 import time
 import os
 from datetime import datetime
 import requests
 from utils.api import get_s3_presigned_url
+from sources.browser_pool import get_browser_pool, run_browser_job
+from sources.readiness import wait_for_canvas_stable
+from utils.config import FINVIZ_MAP_READY_TIMEOUT
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
 
@@ -21,12 +23,10 @@ async def capture_canvas_screenshot():
         if os.path.exists(IMAGE_PATH):
             os.remove(IMAGE_PATH)
             
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            context = await browser.new_context(
+        async with get_browser_pool().context(
                 viewport={'width': 1200, 'height': 800},
                 user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/136.0.0.0 Safari/537.36'
-            )
+        ) as context:
             
             # 우회
             await context.add_init_script("""
@@ -37,7 +37,8 @@ async def capture_canvas_screenshot():
             
             page = await context.new_page()
             await page.goto("https://finviz.com/map.ashx?t=sec", wait_until='domcontentloaded')
-            await asyncio.sleep(3)
+            # 고정 3초 대신 히트맵 캔버스가 붙을 때까지 기다림
+            await page.wait_for_selector('canvas.hover-canvas', state='attached', timeout=FINVIZ_MAP_READY_TIMEOUT * 1000)
 
             # 광고 닫기
             try:
@@ -45,7 +46,6 @@ async def capture_canvas_screenshot():
                 if close_btn:
                     await close_btn.click()
                     print("✅ 광고 닫기 버튼 클릭 완료")
-                    await asyncio.sleep(1)
             except Exception as e:
                 print(f"❌ 광고 닫기 클릭 에러: {str(e)}")
 
@@ -58,7 +58,8 @@ async def capture_canvas_screenshot():
             """)
             print("✅ 광고 및 고정 요소 제거 완료")
 
-            await asyncio.sleep(15)
+            # 고정 15초 대신 캔버스 픽셀이 더 이상 바뀌지 않을 때까지 기다림 (상한 FINVIZ_MAP_READY_TIMEOUT)
+            await wait_for_canvas_stable(page, 'canvas.hover-canvas', timeout=FINVIZ_MAP_READY_TIMEOUT)
 
             canvas = await page.query_selector('canvas.hover-canvas')
             if canvas:
@@ -73,7 +74,6 @@ async def capture_canvas_screenshot():
                 print(f"✅ 캡처 완료: {IMAGE_PATH}")
             else:
                 raise Exception("❌ canvas.hover-canvas 요소를 찾을 수 없습니다.")
-            await browser.close()
     except Exception as e:
         print(f"❌ 에러 발생: {str(e)}")
         raise e
@@ -138,8 +138,9 @@ def update_google_sheet(image_url):
 async def main():
     try:
         await capture_canvas_screenshot()
-        image_url = upload_to_s3(IMAGE_PATH)
-        update_google_sheet(image_url)
+        # 업로드/시트 갱신은 동기 I/O 라 스레드에서 실행 (공유 브라우저 풀 루프의 다른 작업을 막지 않도록)
+        image_url = await asyncio.to_thread(upload_to_s3, IMAGE_PATH)
+        await asyncio.to_thread(update_google_sheet, image_url)
     except Exception as e:
         print(f"❌ 프로그램 실행 중 에러 발생: {str(e)}")
     finally:
@@ -151,4 +152,4 @@ async def main():
                 pass
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_browser_job(main())
@@ -0,0 +1,136 @@
+# sources/finviz_table.py
+"""
+Finviz 스크리너 테이블(table.styled-table-new) 추출 헬퍼.
+
+셀마다 text_content() 를 호출하면 행당 CDP 왕복이 4번 이상 발생하므로,
+테이블 전체를 page.evaluate 한 번으로 가져와 파이썬에서 레코드로 변환한다.
+"""
+import logging
+
+SCREENER_TABLE_SELECTOR = "table.styled-table-new"
+
+# 헤더 이름 → 레코드 키 (data/finviz_*.json 과 같은 키 사용)
+HEADER_KEYS = {
+    "Ticker": "symbol",
+    "Company": "name",
+    "Sector": "sector",
+    "Industry": "industry",
+    "Market Cap": "marketCap",
+    "Price": "price",
+    "Change": "change",
+    "Volume": "volume",
+}
+
+# 헤더를 읽지 못했을 때 사용하는 기본 열 위치 (v=111 개요 화면 기준)
+DEFAULT_COLUMNS = {
+    "symbol": 1,
+    "name": 2,
+    "sector": 3,
+    "industry": 4,
+    "marketCap": 6,
+    "price": 8,
+    "change": 9,
+    "volume": 10,
+}
+
+_EXTRACT_TABLE_JS = """
+(selector) => {
+    const table = document.querySelector(selector);
+    if (!table) return null;
+    const headers = Array.from(table.querySelectorAll('thead th'), th => th.textContent.trim());
+    const rows = Array.from(table.querySelectorAll('tbody tr'));
+    return {
+        headers: headers,
+        rows: rows.map(tr => Array.from(tr.cells, td => td.textContent))
+    };
+}
+"""
+
+def _parse_text(value):
+    return value or None
+
+def _parse_float(value):
+    if not value or value == "-":
+        return None
+    return float(value.replace(",", "").rstrip("%"))
+
+def _parse_int(value):
+    if not value or value == "-":
+        return None
+    return int(value.replace(",", ""))
+
+FIELD_PARSERS = {
+    "symbol": _parse_text,
+    "name": _parse_text,
+    "sector": _parse_text,
+    "industry": _parse_text,
+    "marketCap": _parse_text,
+    "price": _parse_float,
+    "change": _parse_float,
+    "volume": _parse_int,
+}
+
+def _column_index(headers):
+    """
+    헤더로 레코드 키별 열 위치를 찾는다.
+    헤더를 읽지 못했을 때만 기본 열 위치를 쓰고, 헤더가 있으면 찾은 열만 사용한다
+    (열 구성이 바뀐 화면에서 엉뚱한 열을 읽지 않도록 못 찾은 키는 비워 둔다).
+    """
+    if not headers:
+        return dict(DEFAULT_COLUMNS)
+    columns = {}
+    for idx, header in enumerate(headers):
+        key = HEADER_KEYS.get(header.strip())
+        if key:
+            columns[key] = idx
+    missing = [key for key in DEFAULT_COLUMNS if key not in columns]
+    if missing:
+        logging.warning(f"⚠️ 스크리너 헤더에서 찾지 못한 열: {', '.join(missing)}")
+    return columns
+
+def parse_screener_rows(headers, rows, limit=None):
+    """
+    셀 텍스트 행 목록을 타입이 지정된 종목 레코드로 변환한다.
+
+    Args:
+        headers (list): 테이블 헤더 텍스트 (없으면 기본 열 위치 사용)
+        rows (list): 행별 셀 텍스트 목록
+        limit (int, optional): 최대 레코드 수
+
+    Returns:
+        list: symbol, name, sector, industry, marketCap, price, change, volume 키를 가진 dict 목록
+              (헤더에서 찾지 못한 열의 값은 None)
+    """
+    columns = _column_index(headers)
+    records = []
+
+    for cells in rows:
+        try:
+            record = dict.fromkeys(FIELD_PARSERS)
+            record.update(
+                (key, FIELD_PARSERS[key](cells[idx].strip()))
+                for key, idx in columns.items()
+            )
+        except (IndexError, ValueError) as e:
+            logging.error(f"❌ 데이터 추출 중 오류: {str(e)}")
+            continue
+
+        if not record["symbol"] or record["change"] is None:
+            continue
+
+        records.append(record)
+        if limit and len(records) >= limit:
+            break
+
+    return records
+
+async def extract_screener_rows(page, limit=None, selector=SCREENER_TABLE_SELECTOR):
+    """
+    스크리너 테이블 전체를 page.evaluate 한 번으로 추출해 종목 레코드 목록으로 반환한다.
+    테이블이 없으면 빈 리스트를 반환한다.
+    """
+    table = await page.evaluate(_EXTRACT_TABLE_JS, selector)
+    if not table:
+        logging.warning(f"⚠️ {selector} 테이블을 찾을 수 없습니다")
+        return []
+    return parse_screener_rows(table["headers"], table["rows"], limit)
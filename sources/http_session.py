@@ -0,0 +1,42 @@
+# sources/http_session.py
+"""
+HTTP 수집 경로(Finviz, 외교부)가 함께 쓰는 requests 세션과 HTML 파서 설정.
+
+- 사이트마다 keep-alive 세션 하나를 프로세스 전역으로 만들어 재사용한다 (처음 요청할 때 생성)
+- lxml 이 설치돼 있으면 lxml 로, 없으면 html.parser 로 파싱한다
+"""
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+class SharedSession:
+    def __init__(self, headers, pool_connections=4, pool_maxsize=8):
+        """
+        Args:
+            headers (dict): 모든 요청에 붙일 기본 헤더
+            pool_connections (int): 호스트별 연결 풀 수
+            pool_maxsize (int): 풀마다 유지할 최대 연결 수
+        """
+        self.headers = headers
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self._session = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        """keep-alive 세션 (없으면 만든다)"""
+        with self._lock:
+            if self._session is None:
+                session = requests.Session()
+                session.headers.update(self.headers)
+                adapter = HTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._session = session
+            return self._session
@@ -0,0 +1,327 @@
+# sources/mapping_engine.py
+"""
+GPT 국내 종목 매핑 비동기 엔진.
+
+- 실행 동안 AsyncOpenAI 클라이언트 하나를 공유한다 (커넥션 재사용)
+- 동시에 진행하는 GPT 요청 수를 concurrency 로 제한한다
+- 분당 요청 수(RPM) / 토큰 수(TPM) 토큰 버킷으로 요청 속도를 맞추고,
+  429 를 받으면 Retry-After 만큼 모든 요청을 멈춘 뒤 재시도한다
+- 고정 대기(time.sleep) 없이, 매핑이 끝난 종목부터 바로 저장한다
+- 캐시(MappingCache)가 있으면 유효한 응답이 있는 종목은 GPT 를 다시 부르지 않고,
+  저장까지 끝난 종목은 아예 건너뛴다
+- 실행 원장(RunLedger)이 있으면 종목별 진행 상태(in_flight / done / failed)와 저장된 행을 기록하고,
+  다시 처리할 때는 아직 저장되지 않은 행만 보낸다
+- batch_size 개 종목을 요청 하나로 묻고, 스트리밍 응답을 증분 파싱해 종목별 매핑이 완성되는 즉시
+  검증·저장한다. 응답에서 빠졌거나 유효한 항목이 없는 종목은 단건 요청으로 다시 묻는다
+"""
+import asyncio
+import logging
+import random
+import time
+from email.utils import parsedate_to_datetime
+import openai
+from sources.mapping_prompt import (
+    PROMPT_VERSION, build_prompt, build_batch_prompt, parse_mapping_response, parse_batch_entry,
+    validate_mappings, mapping_row_key
+)
+from utils.config import (
+    MAPPING_MODEL, MAPPING_TEMPERATURE, MAPPING_CONCURRENCY, MAPPING_RPM, MAPPING_TPM,
+    MAPPING_MAX_RETRIES, MAPPING_COMPLETION_TOKENS, MAPPING_BATCH_SIZE
+)
+from utils.json_stream import JsonArrayStream
+from utils.rate_limiter import RateLimiter
+from utils.run_ledger import IN_FLIGHT, DONE, FAILED
+
+def _retry_after_seconds(response):
+    """429 응답의 retry-after-ms / Retry-After(초 또는 HTTP 날짜) 헤더를 초 단위로 읽는다."""
+    if response is None:
+        return None
+    headers = response.headers
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        value = headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class MappingEngine:
+    def __init__(self, client=None, model=MAPPING_MODEL, concurrency=MAPPING_CONCURRENCY,
+                 rpm=MAPPING_RPM, tpm=MAPPING_TPM, max_retries=MAPPING_MAX_RETRIES,
+                 completion_tokens=MAPPING_COMPLETION_TOKENS, save=None,
+                 cache=None, prompt_version=PROMPT_VERSION, ledger=None, batch_size=MAPPING_BATCH_SIZE,
+                 backoff_base=1.0, backoff_max=30.0):
+        """
+        Args:
+            client (openai.AsyncOpenAI, optional): 공유 클라이언트 (없으면 만들고 실행 후 닫음)
+            model (str): GPT 모델
+            concurrency (int): 동시에 진행할 GPT 요청 수
+            rpm (int): 분당 요청 수 상한 (0 이면 제한 없음)
+            tpm (int): 분당 토큰 수 상한 (0 이면 제한 없음)
+            max_retries (int): 429 / 5xx / 연결 오류 재시도 횟수
+            completion_tokens (int): 요청당 응답 토큰 예상치 (TPM 버킷 차감용)
+            save (callable): 매핑 저장 함수 (symbol, mapping_list, is_sp500) → 항목별 성공 여부, 스레드에서 실행
+                             (필수, 보통 sources.mapping.save_mapping)
+            cache (MappingCache, optional): GPT 응답 캐시 (없으면 캐시 사용 안 함)
+            prompt_version (str): 캐시 키에 들어가는 프롬프트 템플릿 해시
+            ledger (RunLedger, optional): 종목별 진행 상태를 기록할 실행 원장
+            batch_size (int): 요청 하나에 묶어 물어볼 종목 수 (1 이면 종목별 단건 요청)
+        """
+        if save is None:
+            raise ValueError("매핑 저장 함수(save)가 필요합니다")
+        self._owns_client = client is None
+        self.client = client or openai.AsyncOpenAI(api_key=openai.api_key, max_retries=0)
+        self.model = model
+        self.concurrency = max(1, concurrency)
+        self.limiter = RateLimiter(rpm, tpm)
+        self.max_retries = max_retries
+        self.completion_tokens = completion_tokens
+        self.save = save
+        self.cache = cache
+        self.prompt_version = prompt_version
+        self.ledger = ledger
+        self.batch_size = max(1, batch_size)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    def _backoff(self, attempt):
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return delay * (0.5 + random.random() / 2)
+
+    def estimate_tokens(self, prompt, symbols=1):
+        # 한글 위주 프롬프트는 대략 2글자당 1토큰, 여기에 종목당 응답 토큰 예상치를 더한다
+        return len(prompt) // 2 + self.completion_tokens * symbols
+
+    async def _create(self, label, estimated, **kwargs):
+        """요청 한도를 지키며 chat completion 을 호출하고, 429 / 5xx / 연결 오류는 재시도한다."""
+        for attempt in range(self.max_retries + 1):
+            await self.limiter.acquire(estimated)
+            try:
+                return await self.client.chat.completions.create(
+                    model=self.model, temperature=MAPPING_TEMPERATURE, **kwargs
+                )
+            except openai.RateLimitError as e:
+                # 처리되지 않은 요청이므로 차감한 토큰은 돌려준다
+                self.limiter.adjust(-estimated)
+                if attempt == self.max_retries:
+                    raise
+                delay = _retry_after_seconds(e.response) or self._backoff(attempt)
+                logging.warning(f"⏳ [{label}] GPT 요청 한도 초과(429), {delay:.1f}초 후 재시도")
+                self.limiter.pause(delay)
+            except (openai.APIConnectionError, openai.InternalServerError) as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = self._backoff(attempt)
+                logging.warning(f"⚠️ [{label}] GPT 요청 실패({type(e).__name__}), {delay:.1f}초 후 재시도")
+                await asyncio.sleep(delay)
+
+    def _adjust_usage(self, usage, estimated):
+        if usage and usage.total_tokens:
+            self.limiter.adjust(usage.total_tokens - estimated)
+
+    async def request_mapping(self, symbol, name):
+        """
+        종목 하나의 매핑을 요청해 검증된 목록을 반환한다.
+
+        Raises:
+            ValueError: 유효한 매핑 항목이 하나도 없는 응답
+        """
+        prompt = build_prompt(symbol, name)
+        estimated = self.estimate_tokens(prompt)
+        response = await self._create(symbol, estimated, messages=[{"role": "user", "content": prompt}])
+        self._adjust_usage(getattr(response, "usage", None), estimated)
+        logging.info(f"GPT 응답 수신 완료: {symbol}")
+
+        mapping = validate_mappings(parse_mapping_response(response.choices[0].message.content, symbol), symbol)
+        if not mapping:
+            raise ValueError("유효한 매핑 항목이 없습니다")
+        return mapping
+
+    async def stream_batch_mapping(self, companies):
+        """
+        여러 종목을 요청 하나로 묻고, 스트리밍 응답에서 종목별 결과가 완성되는 대로
+        (미국 종목 심볼, 검증된 매핑 목록) 을 내보낸다.
+        """
+        label = ",".join(company["symbol"] for company in companies)
+        prompt = build_batch_prompt(companies)
+        estimated = self.estimate_tokens(prompt, len(companies))
+        stream = await self._create(
+            label, estimated,
+            messages=[{"role": "user", "content": prompt}],
+            response_format={"type": "json_object"},
+            stream=True,
+            stream_options={"include_usage": True}
+        )
+
+        parser = JsonArrayStream()
+        usage = None
+        try:
+            async for chunk in stream:
+                if getattr(chunk, "usage", None):
+                    usage = chunk.usage
+                for choice in chunk.choices:
+                    if not choice.delta or not choice.delta.content:
+                        continue
+                    for entry in parser.feed(choice.delta.content):
+                        parsed = parse_batch_entry(entry)
+                        if parsed is not None:
+                            yield parsed
+        finally:
+            await stream.close()
+            self._adjust_usage(usage, estimated)
+        logging.info(f"GPT 배치 응답 수신 완료: {label}")
+
+    def _mark(self, symbol, status, error=None):
+        if self.ledger:
+            self.ledger.mark(symbol, status, error)
+
+    async def _store(self, company, mapping, is_sp500, fresh=True):
+        symbol = company["symbol"]
+        cache_key = (symbol, company["name"], self.model, self.prompt_version)
+        try:
+            if fresh and self.cache:
+                self.cache.put(*cache_key, mapping)
+            # 이전 시도에서 저장된 행은 빼고 보낸다
+            saved_keys = self.ledger.saved_rows(symbol) if self.ledger else set()
+            keys = [mapping_row_key(symbol, item, is_sp500, self.prompt_version) for item in mapping]
+            pending = [(key, item) for key, item in zip(keys, mapping) if key not in saved_keys]
+            if len(pending) < len(mapping):
+                logging.info(f"📒 {symbol} 이미 저장된 {len(mapping) - len(pending)}건 제외")
+
+            # 저장(API 전송)은 GPT 동시 요청 슬롯을 잡지 않고 스레드에서 진행
+            results = []
+            if pending:
+                results = await asyncio.to_thread(self.save, symbol, [item for _, item in pending], is_sp500)
+            if self.ledger:
+                self.ledger.mark_rows_saved(symbol, [key for (key, _), ok in zip(pending, results) if ok])
+            failed = len(pending) - sum(1 for ok in results if ok)
+            if failed:
+                self._mark(symbol, FAILED, f"매핑 {failed}/{len(mapping)}건 저장 실패")
+                return symbol, False
+            if self.cache:
+                self.cache.mark_saved(*cache_key)
+            self._mark(symbol, DONE)
+            return symbol, True
+        except Exception as e:
+            logging.error(f"❌ 오류 발생 - {symbol}: {str(e)}")
+            self._mark(symbol, FAILED, f"{type(e).__name__}: {str(e)}")
+            return symbol, False
+
+    async def _process(self, semaphore, company, is_sp500, cached=None):
+        symbol = company["symbol"]
+        self._mark(symbol, IN_FLIGHT)
+        if cached is not None:
+            # GPT 응답은 캐시에 있고 저장만 실패했던 종목
+            return await self._store(company, cached["mapping"], is_sp500, fresh=False)
+        try:
+            async with semaphore:
+                mapping = await self.request_mapping(symbol, company["name"])
+        except Exception as e:
+            logging.error(f"❌ 오류 발생 - {symbol}: {str(e)}")
+            self._mark(symbol, FAILED, f"{type(e).__name__}: {str(e)}")
+            return symbol, False
+        return await self._store(company, mapping, is_sp500)
+
+    async def _process_batch(self, semaphore, batch, is_sp500):
+        """배치 요청 하나를 처리하고 [(symbol, 성공 여부)] 를 반환한다."""
+        by_symbol = {company["symbol"].upper(): company for company in batch}
+        for company in batch:
+            self._mark(company["symbol"], IN_FLIGHT)
+
+        stores = []
+        try:
+            async with semaphore:
+                async for symbol, mapping in self.stream_batch_mapping(batch):
+                    company = by_symbol.pop(symbol, None)
+                    if company is None:
+                        logging.warning(f"⚠️ 배치 응답에 요청하지 않았거나 중복된 종목: {symbol}")
+                    elif not mapping:
+                        by_symbol[symbol] = company
+                    else:
+                        # 스트림을 계속 읽는 동안 완성된 종목부터 저장
+                        stores.append(asyncio.create_task(self._store(company, mapping, is_sp500)))
+        except Exception as e:
+            logging.warning(f"⚠️ 배치 매핑 요청 실패({type(e).__name__}): {str(e)}")
+
+        missing = list(by_symbol.values())
+        if missing:
+            logging.warning(
+                f"🔁 배치 응답에 유효한 매핑이 없는 종목 {len(missing)}개 단건 재요청: "
+                f"{', '.join(company['symbol'] for company in missing)}"
+            )
+            stores += [asyncio.create_task(self._process(semaphore, company, is_sp500)) for company in missing]
+        return [await store for store in stores]
+
+    def _lookup_cache(self, company, refresh):
+        if not self.cache or refresh:
+            return None
+        return self.cache.get(company["symbol"], company["name"], self.model, self.prompt_version)
+
+    async def run(self, companies, is_sp500=False, refresh=False):
+        """
+        모든 종목의 매핑을 요청하고 끝나는 순서대로 저장한다.
+
+        Args:
+            refresh (bool): 캐시를 무시하고 모두 다시 요청
+
+        Returns:
+            dict: {"done": [symbol], "failed": [symbol], "skipped": [symbol]}
+        """
+        market_type = "S&P 500" if is_sp500 else "나스닥"
+        summary = {"done": [], "failed": [], "skipped": []}
+        semaphore = asyncio.Semaphore(self.concurrency)
+        started = time.monotonic()
+
+        jobs = []
+        requests = []
+        for company in companies:
+            cached = self._lookup_cache(company, refresh)
+            if cached is not None and cached["saved"]:
+                summary["skipped"].append(company["symbol"])
+                self._mark(company["symbol"], DONE)
+            elif cached is not None:
+                jobs.append((company, cached))
+            else:
+                requests.append(company)
+        total = len(jobs) + len(requests)
+        logging.info(
+            f"🚀 {market_type} {total}개 종목 매핑 시작 (동시 {self.concurrency}, 배치 {self.batch_size}, "
+            f"캐시로 건너뜀 {len(summary['skipped'])})"
+        )
+
+        batches = [requests[i:i + self.batch_size] for i in range(0, len(requests), self.batch_size)]
+        jobs += [(batch[0], None) for batch in batches if len(batch) == 1]
+        try:
+            tasks = [
+                asyncio.create_task(self._process(semaphore, company, is_sp500, cached))
+                for company, cached in jobs
+            ]
+            tasks += [
+                asyncio.create_task(self._process_batch(semaphore, batch, is_sp500))
+                for batch in batches if len(batch) > 1
+            ]
+            finished = 0
+            for task in asyncio.as_completed(tasks):
+                result = await task
+                for symbol, ok in (result if isinstance(result, list) else [result]):
+                    finished += 1
+                    summary["done" if ok else "failed"].append(symbol)
+                    logging.info(f"[{finished}/{total}] {market_type} 종목 {symbol} {'처리 완료' if ok else '실패'}")
+        finally:
+            if self._owns_client:
+                await self.client.close()
+
+        logging.info(
+            f"✅ {market_type} 매핑 완료: 성공 {len(summary['done'])}, 실패 {len(summary['failed'])}, "
+            f"건너뜀 {len(summary['skipped'])} ({time.monotonic() - started:.1f}초)"
+        )
+        return summary
+
+def run_mapping_engine(companies, is_sp500=False, refresh=False, **kwargs):
+    """동기 코드에서 매핑 엔진을 실행한다 (kwargs 는 MappingEngine 인자)."""
+    return asyncio.run(MappingEngine(**kwargs).run(companies, is_sp500, refresh))
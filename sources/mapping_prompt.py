@@ -0,0 +1,190 @@
+# sources/mapping_prompt.py
+"""
+GPT 국내 종목 매핑의 프롬프트, 응답 파싱/검증, 행 키.
+
+매핑 스크립트(sources/mapping.py)와 비동기 매핑 엔진(sources/mapping_engine.py)이 함께 사용한다.
+프롬프트 템플릿을 고치면 PROMPT_VERSION 이 바뀌어 캐시된 응답과 행 키가 새로 만들어진다.
+"""
+import hashlib
+import json
+import logging
+
+_SELECTION_RULES = """──────────────────
+📌 선정 기준
+1. 사업 영역 유사성  
+   • 두 기업이 속한 **세부 산업**(예: 파운드리, SaaS, 2차전지 소재)이 동일·유사한가?  
+   • 최근 연간 매출 비중(%)이나 주력 제품이 겹치는지 명시.
+
+2. 공급망 연관성  
+   • 한국 기업이 美 기업의 **직·간접 부품·소재·장비·서비스 공급사**(또는 역으로 공급받는 입장)인가?  
+   • 최근 3년 내 납품 계약·수출입 실적(가능하면 금액·기간)을 근거로 제시.
+
+3. 경쟁 관계  
+   • 글로벌/국내 시장에서 **동일 제품·서비스**로 시장 점유율 경쟁 중인가?  
+   • 주요 경쟁 지표(점유율 %, 출하량, MAU 등)와 경쟁 구도(1위 vs 2위 등)를 1줄로 요약.
+
+4. 기술 유사성 / 기술 제휴  
+   • **공동 연구·특허 라이선스·MOU·합작 공장** 또는 **동일 핵심 기술**(예: GAA 2 nm, LLM, SiC 전력반도체)을 보유?  
+   • 최근 5년 내 발표·로드맵·로열티 계약 유무를 포함.
+
+5. 글로벌 투자 테마  
+   • 두 기업이 **같은 메가트렌드**(AI, 반도체, 전기차, 친환경, 바이오, 클라우드 등)에 속하며  
+   • 정부 정책·ETF 편입·기관 리포트 등 **테마 근거**가 있는가?
+
+──────────────────
+📌 결과 작성 규칙
+• 총 20개: **"POSITIVE"** 10개, **"NEGATIVE"** 10개.  
+• KOSPI·KOSDAQ 비율을 가능하면 골고루.  
+• `reason` 필드는 위 5가지 기준 중 **가장 설득력 있는 1–2가지**만 120자 이내로 요약(출처 표기는 제외).  
+• 동일 기업·중복 이유 금지.  
+• 아래 예시 형식을 반드시 지키고, 다른 설명·주석·텍스트는 절대 출력하지 말 것.
+"""
+
+_MAPPING_EXAMPLE = """  {
+    "krName": "삼성전자",
+    "krSymbol": "005930",
+    "reason": "파운드리 시장 2위 vs 1위 TSMC, 글로벌 점유율 17% 차지",
+    "marketType": "KOSPI",
+    "correlationType": "POSITIVE"
+  }"""
+
+_VALUE_RULES = """위 예시처럼 marketType은 반드시 "KOSPI" 또는 "KOSDAQ" 중 하나여야 하며,
+correlationType은 반드시 "POSITIVE" 또는 "NEGATIVE" 중 하나여야 함.
+"""
+
+def build_prompt(us_symbol, us_name):
+    """미국 종목 하나에 대한 국내 관련 종목 매핑 프롬프트"""
+    return f"""
+미국 주식 {us_symbol} ({us_name})과 관련된 한국 주식 종목 20개를 찾아 JSON 배열로만 반환해라.
+코드 블록(```)을 사용하지 말고, 순수 JSON 배열만 반환하세요.
+
+{_SELECTION_RULES}
+[
+{_MAPPING_EXAMPLE}
+]
+
+{_VALUE_RULES}"""
+
+def build_batch_prompt(companies):
+    """
+    여러 미국 종목을 한 번에 묻는 매핑 프롬프트.
+    응답은 {"results": [{"usSymbol": ..., "mappings": [...]}, ...]} 형태의 JSON 객체이며,
+    종목 순서대로 하나씩 완성되므로 스트리밍 중에 종목 단위로 파싱할 수 있다.
+    """
+    targets = "\n".join(f"- {company['symbol']} ({company['name']})" for company in companies)
+    example = "\n".join(f"      {line}" for line in _MAPPING_EXAMPLE.splitlines())
+    return f"""
+아래 미국 주식 {len(companies)}개 각각에 대해, 관련된 한국 주식 종목을 종목마다 20개씩 찾아 JSON 객체로만 반환해라.
+코드 블록(```)을 사용하지 말고, 순수 JSON 객체만 반환하세요.
+results 배열에 아래 순서대로 종목마다 usSymbol(미국 종목 심볼)과 mappings(20개)를 담아라.
+
+{targets}
+
+{_SELECTION_RULES}
+{{
+  "results": [
+    {{
+      "usSymbol": "{companies[0]['symbol']}",
+      "mappings": [
+{example}
+      ]
+    }}
+  ]
+}}
+
+{_VALUE_RULES}"""
+
+# 프롬프트 템플릿 해시 (단건 + 배치): 프롬프트를 고치면 캐시 키가 바뀌어 모든 종목을 다시 요청한다
+PROMPT_VERSION = hashlib.sha256(
+    (build_prompt("{symbol}", "{name}") + build_batch_prompt([{"symbol": "{symbol}", "name": "{name}"}])).encode("utf-8")
+).hexdigest()[:16]
+
+def parse_mapping_response(content, us_symbol=""):
+    """
+    GPT 응답 본문을 매핑 목록으로 바꾼다 (코드 블록 표시가 있으면 제거).
+
+    Raises:
+        json.JSONDecodeError: JSON 배열이 아닌 응답
+    """
+    content = content.strip()
+
+    # Remove code block markers if present
+    if content.startswith('```'):
+        content = content.split('```')[1] if '```' in content else content
+    if content.startswith('json'):
+        content = content[4:].strip()
+
+    try:
+        return json.loads(content)
+    except json.JSONDecodeError as e:
+        logging.error(f"JSON 파싱 오류{f' ({us_symbol})' if us_symbol else ''}: {str(e)}")
+        logging.error(f"파싱 실패한 응답: {content}")
+        raise
+
+MARKET_TYPES = ("KOSPI", "KOSDAQ")
+CORRELATION_TYPES = ("POSITIVE", "NEGATIVE")
+
+def validate_mapping_item(item):
+    """
+    매핑 객체 하나를 검사해 저장할 필드만 남긴 dict 로 돌려준다.
+    marketType 이 없으면 'KOSPI', krSymbol 은 6자리 종목코드로 맞춘다.
+
+    Raises:
+        ValueError: 필수 필드 누락 또는 허용되지 않는 값
+    """
+    if not isinstance(item, dict):
+        raise ValueError(f"매핑 항목이 객체가 아닙니다: {item!r}")
+    missing = [field for field in ("krName", "krSymbol", "reason", "correlationType") if not item.get(field)]
+    if missing:
+        raise ValueError(f"필수 필드 누락: {', '.join(missing)}")
+
+    kr_symbol = str(item["krSymbol"]).strip()
+    if not kr_symbol.isdigit() or len(kr_symbol) > 6:
+        raise ValueError(f"잘못된 종목코드: {item['krSymbol']!r}")
+    market_type = item.get("marketType") or "KOSPI"
+    if market_type not in MARKET_TYPES:
+        raise ValueError(f"잘못된 marketType: {market_type!r}")
+    if item["correlationType"] not in CORRELATION_TYPES:
+        raise ValueError(f"잘못된 correlationType: {item['correlationType']!r}")
+
+    return {
+        "krName": item["krName"],
+        "krSymbol": kr_symbol.zfill(6),
+        "reason": item["reason"],
+        "marketType": market_type,
+        "correlationType": item["correlationType"]
+    }
+
+def validate_mappings(items, us_symbol=""):
+    """매핑 목록에서 유효한 항목만 남긴다 (잘못된 항목은 경고 후 버림)."""
+    if not isinstance(items, list):
+        logging.warning(f"⚠️ {us_symbol} 매핑이 배열이 아닙니다")
+        return []
+    valid = []
+    for item in items:
+        try:
+            valid.append(validate_mapping_item(item))
+        except ValueError as e:
+            logging.warning(f"⚠️ {us_symbol} 매핑 항목 제외: {str(e)}")
+    return valid
+
+def parse_batch_entry(entry):
+    """
+    배치 응답의 results 원소 하나를 (미국 종목 심볼, 유효한 매핑 목록) 으로 바꾼다.
+    usSymbol 이 없으면 None.
+    """
+    if not isinstance(entry, dict) or not entry.get("usSymbol"):
+        logging.warning("⚠️ 배치 응답에서 usSymbol 이 없는 항목을 건너뜁니다")
+        return None
+    symbol = str(entry["usSymbol"]).strip().upper()
+    return symbol, validate_mappings(entry.get("mappings"), symbol)
+
+def mapping_row_key(us_symbol, item, is_sp500=False, prompt_version=PROMPT_VERSION):
+    """
+    매핑 행의 안정적인 키 (멱등성 키 / 실행 원장 기록용).
+    같은 프롬프트 버전에서 같은 미국 종목 → 국내 종목 행은 다시 보내도 같은 키가 된다.
+    """
+    market = "sp500" if is_sp500 else "nasdaq"
+    return hashlib.sha256(
+        f"{market}\n{us_symbol}\n{item['krSymbol']}\n{prompt_version}".encode("utf-8")
+    ).hexdigest()
@@ -0,0 +1,236 @@
+# sources/mofa_http.py
+"""
+외교부 채용정보 게시판의 HTTP 수집 경로.
+
+- 공유 keep-alive 세션으로 목록 페이지를 동시에 가져온다 (페이지 창 단위)
+- 페이지별 ETag / Last-Modified 를 기억해 조건부 요청을 보내고, 304 면 해당 페이지를 건너뛴다
+- 목록은 최신순이므로, 페이지의 마지막 행이 대상 날짜보다 오래되면 다음 페이지를 요청하지 않는다
+- 목록 테이블만 lxml 로 파싱한다 (lxml 이 없으면 html.parser)
+- 상세 페이지의 첨부파일 링크와 본문(.bo_con)을 정적 HTML 에서 읽고, 첨부파일은 같은 세션과 캐시를 거쳐 받는다
+"""
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from urllib.parse import urljoin
+import requests
+from bs4 import BeautifulSoup, SoupStrainer
+from utils.attachment_cache import AttachmentCache
+from utils.config import MOFA_URL, STATE_DIR, ATTACHMENT_TEXT_CACHE_MB
+from utils.json_store import load_json, save_json
+from sources.http_session import HTML_PARSER, SharedSession
+
+LIST_URL = f"{MOFA_URL}/www/brd/m_4079/list.do"
+
+REQUEST_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "ko-KR,ko;q=0.9,en;q=0.8",
+}
+
+_session = SharedSession(REQUEST_HEADERS)
+
+def get_session():
+    """외교부 사이트 요청용 keep-alive 세션 (프로세스 전역)"""
+    return _session.get()
+
+class ListPageCache:
+    """
+    목록 페이지별 조건부 요청 헤더(ETag / Last-Modified) 저장소.
+    수집 결과를 모두 처리한 뒤 save() 해야, 중간에 실패한 실행의 페이지가 다음 실행에서 건너뛰어지지 않는다.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._entries = load_json(path, label="목록 캐시")
+        self._pending = {}
+
+    def conditional_headers(self, url):
+        entry = self._entries.get(url) or {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def remember(self, url, response):
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag or last_modified:
+            self._pending[url] = {"etag": etag, "last_modified": last_modified}
+
+    def save(self):
+        if not self.path or not self._pending:
+            return
+        self._entries.update(self._pending)
+        self._pending = {}
+        save_json(self.path, self._entries)
+
+def parse_job_list_html(html, base_url=LIST_URL):
+    """
+    목록 HTML 에서 게시글 행을 읽는다.
+
+    Returns:
+        list: [{"title", "link", "write_date", "department"}] (게시판 순서 그대로)
+    """
+    strainer = SoupStrainer("table", class_="tableB")
+    soup = BeautifulSoup(html, HTML_PARSER, parse_only=strainer)
+
+    rows = []
+    for tr in soup.select("table.tableB tbody tr"):
+        cols = tr.find_all("td")
+        if len(cols) < 6:
+            continue
+        title_el = cols[2].find("a")
+        if not title_el or not title_el.get("href"):
+            continue
+        date_str = cols[5].get_text(strip=True)
+        if len(date_str) != 10:
+            continue
+        rows.append({
+            "title": title_el.get_text(strip=True),
+            "link": urljoin(base_url, title_el["href"]),
+            "write_date": date_str,
+            "department": cols[4].get_text(strip=True),
+        })
+    return rows
+
+def _row_date(row):
+    try:
+        return datetime.strptime(row["write_date"], "%Y-%m-%d").date()
+    except ValueError:
+        return None
+
+def fetch_list_page(page, cache=None, timeout=10):
+    """
+    목록 한 페이지를 가져온다.
+
+    Returns:
+        tuple: (상태, 행 목록) — 상태는 "ok" / "unchanged"(304) / "error"
+    """
+    url = f"{LIST_URL}?page={page}"
+    headers = cache.conditional_headers(url) if cache else {}
+    try:
+        res = get_session().get(url, headers=headers, timeout=timeout)
+    except requests.RequestException as e:
+        logging.error(f"❌ [MOFA] 목록 {page}페이지 요청 오류: {str(e)}")
+        return "error", []
+
+    if res.status_code == 304:
+        logging.info(f"💤 [MOFA] 목록 {page}페이지 변경 없음 (304)")
+        return "unchanged", []
+    if res.status_code != 200:
+        logging.warning(f"⚠️ [MOFA] 목록 {page}페이지 응답 {res.status_code}")
+        return "error", []
+
+    rows = parse_job_list_html(res.text)
+    if cache:
+        cache.remember(url, res)
+    logging.info(f"📄 [MOFA] 목록 {page}페이지 {len(rows)}행")
+    return "ok", rows
+
+def _scan_page(page, status, rows, target_date, jobs):
+    """페이지 결과를 jobs 에 반영하고, 다음 페이지를 더 볼지 여부를 반환한다."""
+    if status == "unchanged":
+        # 새 글이 올라오면 앞 페이지부터 바뀌므로, 변경 없는 페이지 뒤는 볼 필요가 없다
+        logging.info(f"⏹️ [MOFA] {page}페이지 변경 없음, 목록 탐색 종료")
+        return False
+    jobs.extend(row for row in rows if _row_date(row) == target_date)
+
+    dates = [d for d in map(_row_date, rows) if d is not None]
+    if status == "error" or not dates or dates[-1] < target_date:
+        logging.info(f"⏹️ [MOFA] {page}페이지에서 목록 탐색 종료")
+        return False
+    return True
+
+def fetch_job_list(target_date=None, max_pages=3, window=3, cache=None):
+    """
+    target_date 에 작성된 게시글을 목록 페이지에서 찾는다.
+
+    1페이지를 먼저 확인한 뒤, 이후 페이지는 window 개씩 동시에 요청해 페이지 순서대로 확인한다.
+    - 304(변경 없음) 페이지를 만나면 이미 처리한 목록이므로 탐색을 끝낸다
+    - 페이지의 마지막 행이 target_date 보다 오래됐으면 이후 페이지는 요청하지 않는다
+      (상단 고정 공지처럼 오래된 행이 앞에 있을 수 있으므로 판단은 마지막 행 기준)
+
+    Returns:
+        list: target_date 에 작성된 게시글 목록
+    """
+    target_date = target_date or datetime.now().date()
+    jobs = []
+
+    status, rows = fetch_list_page(1, cache)
+    if _scan_page(1, status, rows, target_date, jobs) and max_pages > 1:
+        with ThreadPoolExecutor(max_workers=window, thread_name_prefix="mofa-list") as pool:
+            page = 2
+            while page <= max_pages:
+                pages = list(range(page, min(page + window, max_pages + 1)))
+                results = pool.map(lambda p: fetch_list_page(p, cache), pages)
+                if not all(_scan_page(p, status, rows, target_date, jobs) for p, (status, rows) in zip(pages, results)):
+                    break
+                page += window
+
+    logging.info(f"🔎 [MOFA] {target_date} 게시글 {len(jobs)}건")
+    return jobs
+
+def parse_job_detail_html(html, base_url):
+    """
+    상세 페이지 HTML 에서 첨부파일 링크와 본문을 읽는다.
+
+    Returns:
+        dict: {"attachments": [{"url", "name"}], "body": 본문 텍스트 또는 None}
+    """
+    soup = BeautifulSoup(html, HTML_PARSER)
+
+    attachments = []
+    seen = set()
+    for a in soup.select("a[href*='down.do']"):
+        url = urljoin(base_url, a["href"])
+        if url in seen:
+            continue
+        seen.add(url)
+        attachments.append({"url": url, "name": a.get_text(strip=True)})
+
+    body_el = soup.select_one(".bo_con")
+    body = body_el.get_text("\n") if body_el else None
+    return {"attachments": attachments, "body": body}
+
+def fetch_job_detail(url, timeout=10):
+    """
+    상세 페이지를 HTTP 로 가져와 파싱한다.
+    요청 실패 시 None, 첨부파일과 본문이 모두 없으면(스크립트 렌더링 페이지) 빈 결과를 반환한다.
+    """
+    try:
+        res = get_session().get(url, timeout=timeout)
+    except requests.RequestException as e:
+        logging.error(f"❌ [MOFA] 상세 페이지 요청 오류: {str(e)}")
+        return None
+    if res.status_code != 200:
+        logging.warning(f"⚠️ [MOFA] 상세 페이지 응답 {res.status_code}: {url}")
+        return None
+    return parse_job_detail_html(res.text, res.url or url)
+
+_attachment_cache = None
+_attachment_cache_lock = threading.Lock()
+
+def get_attachment_cache():
+    """첨부파일 캐시 (STATE_DIR/attachments, 프로세스 전역)"""
+    global _attachment_cache
+    session = get_session()
+    with _attachment_cache_lock:
+        if _attachment_cache is None:
+            _attachment_cache = AttachmentCache(
+                os.path.join(STATE_DIR, "attachments"),
+                session=session,
+                text_cache_bytes=ATTACHMENT_TEXT_CACHE_MB * 1024 * 1024
+            )
+        return _attachment_cache
+
+def download_attachment(url, name=""):
+    """
+    첨부파일을 캐시를 거쳐 받는다. 이미 받은 파일은 조건부 GET 으로 변경 여부만 확인한다.
+
+    Returns:
+        tuple: (파일 경로, SHA-256) — 실패 시 (None, None)
+    """
+    return get_attachment_cache().fetch(url, name)
@@ -1,35 +1,48 @@
-import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, parse_qs, urlparse
 from datetime import datetime
+import hashlib
 import os
 import tempfile
-import subprocess
-import re
-import shutil
-from utils.api import post_crawled_data_to_api  # ✅ 크롤링 결과 백엔드로 전송
-from utils.config import MOFA_URL
-from pdf2image import convert_from_path
-import time
+from utils.outbox import deliver, flush_outbox, TOPIC_CRAWL_DATA  # ✅ 크롤링 결과를 outbox 를 거쳐 백엔드로 전송
+from utils.config import (
+    STATE_DIR, MOFA_LIST_MAX_PAGES, MOFA_LIST_CONCURRENCY, MOFA_EXTRACT_WORKERS, MOFA_EXTRACT_TIMEOUT,
+    OCR_DPI, OCR_WINDOW_PAGES, OCR_WORKERS,
+    OFFICE_CONVERTER_MODE, OFFICE_CONVERT_TIMEOUT, MOFA_CONTENT_MAX_CHARS, HWP_TEXT_BACKEND
+)
+from utils.extraction_engine import ExtractionEngine
+from utils.hwp_processor import iter_hwp_text_chunks
+from utils.ocr_pipeline import iter_ocr_pages, TESSERACT_ENV
+from utils.text_normalizer import normalize_text
+from utils.office_converter import (
+    RESIDENT_AVAILABLE, get_office_listener_pool, convert_to_pdf_cold, convert_to_pdf_via_listener
+)
+from sources.mofa_http import (
+    ListPageCache, fetch_job_list,
+    fetch_job_detail, parse_job_detail_html, download_attachment, get_attachment_cache
+)
+from sources.chrome_session import ChromeSession
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-import pytesseract
-from PIL import Image
-import io
 
 
-LIST_URL = f"{MOFA_URL}/www/brd/m_4079/list.do"
-DETAIL_URL_BASE = f"{MOFA_URL}/www/brd/m_4079/view.do"
-
 # 작업 디렉토리 설정
 WORKSPACE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 CONVERSION_DIR = os.path.join(WORKSPACE_DIR, "conversion_temp")
 os.makedirs(CONVERSION_DIR, exist_ok=True)
 
-def convert_hwp_to_images(hwp_path, output_dir=None):
-    """Convert HWP file to images using LibreOffice"""
+# 추출 텍스트 메모 버전: 추출 결과에 영향을 주는 설정이나 추출 방식(_EXTRACTOR_REVISION)이 바뀌면
+# 캐시 키가 달라져 첨부파일을 다시 추출한다
+_EXTRACTOR_REVISION = "1"
+EXTRACTOR_VERSION = hashlib.sha256(
+    f"{_EXTRACTOR_REVISION}\n{HWP_TEXT_BACKEND}\n{OCR_DPI}\n{MOFA_CONTENT_MAX_CHARS}".encode("utf-8")
+).hexdigest()[:16]
+
+def convert_to_pdf(hwp_path, output_dir=None, listener=None):
+    """
+    Convert HWP (or other office) file to PDF using LibreOffice. Returns the PDF path or None.
+    listener 가 (ports, lock_dir) 이면 상주 LibreOffice 리스너로, 아니면 soffice 단발 실행으로 변환한다.
+    """
     try:
         # 출력 디렉토리 설정
         if output_dir is None:
@@ -38,22 +51,7 @@ def convert_hwp_to_images(hwp_path, output_dir=None):
         # Create output directory if it doesn't exist
         os.makedirs(output_dir, exist_ok=True)
         
-        # Convert HWP to PDF first
-        base_name = os.path.splitext(os.path.basename(hwp_path))[0]
-        temp_pdf = os.path.join(output_dir, f"{base_name}.pdf")
-        
-        cmd = [
-            "soffice",
-            "--headless",
-            "--convert-to", "pdf",
-            "--outdir", output_dir,
-            hwp_path
-        ]
-        
-        print(f"Converting HWP to PDF: {' '.join(cmd)}")
-        print(f"Input HWP path: {hwp_path}")
-        print(f"Output directory: {output_dir}")
-        print(f"Target PDF path: {temp_pdf}")
+        print(f"Converting HWP to PDF: {hwp_path} → {output_dir} ({'listener' if listener else 'soffice'})")
         
         # Check if input file exists
         if not os.path.exists(hwp_path):
@@ -70,397 +68,210 @@ def convert_hwp_to_images(hwp_path, output_dir=None):
             print(f"Error: No write permission for output directory {output_dir}")
             return None
             
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-        
-        print(f"Command stdout: {result.stdout}")
-        print(f"Command stderr: {result.stderr}")
-        
-        if result.returncode != 0:
-            print(f"Error converting HWP to PDF: {result.stderr}")
-            return None
+        if listener:
+            ports, lock_dir = listener
+            temp_pdf = convert_to_pdf_via_listener(hwp_path, output_dir, ports, lock_dir, timeout=OFFICE_CONVERT_TIMEOUT)
+        else:
+            temp_pdf = convert_to_pdf_cold(hwp_path, output_dir, timeout=OFFICE_CONVERT_TIMEOUT)
             
         # Check if PDF was created
-        if not os.path.exists(temp_pdf):
-            print(f"Error: PDF file was not created at {temp_pdf}")
+        if not temp_pdf:
+            print("Error: PDF file was not created")
             print("Directory contents:")
             for f in os.listdir(output_dir):
                 print(f"  - {f}")
             return None
-            
-        # Convert PDF to images
-        print(f"Converting PDF to images from {temp_pdf}")
-        try:
-            images = convert_from_path(temp_pdf)
-        except Exception as e:
-            print(f"Error converting PDF to images: {str(e)}")
-            return None
-            
-        # Save images
-        image_paths = []
-        for i, image in enumerate(images):
-            image_path = os.path.join(output_dir, f"{base_name}_page_{i+1}.png")
-            image.save(image_path, "PNG")
-            image_paths.append(image_path)
-            print(f"Saved image: {image_path}")
-            
-        # Clean up temporary PDF
-        try:
-            os.remove(temp_pdf)
-            print(f"Removed temporary PDF: {temp_pdf}")
-        except Exception as e:
-            print(f"Warning: Failed to remove temporary PDF: {str(e)}")
-            
-        return image_paths
-        
-    except Exception as e:
-        print(f"Error in convert_hwp_to_images: {str(e)}")
-        import traceback
-        print(f"Traceback: {traceback.format_exc()}")
-        return None
 
-def extract_text_from_images(image_paths):
-    """Extract text from images using Tesseract OCR"""
-    try:
-        full_text = ""
-        for image_path in image_paths:
-            print(f"Processing image: {image_path}")
-            image = Image.open(image_path)
-            text = pytesseract.image_to_string(image, lang='kor+eng')
-            full_text += text + "\n"
-        return full_text
+        return temp_pdf
+
     except Exception as e:
-        print(f"Error in extract_text_from_images: {str(e)}")
+        print(f"Error in convert_to_pdf: {str(e)}")
         return None
 
-def clean_extracted_text(text):
-    """Clean the extracted text"""
-    if not text:
-        return ""
-        
-    # Remove extra whitespace
-    text = ' '.join(text.split())
-    
-    # Remove special characters
-    text = text.replace('\x0c', '')  # Form feed character
-    
-    return text
-
-def format_table(table_data):
-    """표 데이터 포맷팅"""
-    if not table_data:
-        return []
-        
-    # 각 열의 최대 너비 계산
-    col_widths = []
-    for row in table_data:
-        while len(col_widths) < len(row):
-            col_widths.append(0)
-        for i, cell in enumerate(row):
-            col_widths[i] = max(col_widths[i], len(cell))
-    
-    # 표 형식으로 포맷팅
-    formatted_table = []
-    border = '+' + '+'.join('-' * (w + 2) for w in col_widths) + '+'
-    formatted_table.append(border)
-    
-    for row in table_data:
-        cells = []
-        for i, cell in enumerate(row):
-            if i < len(col_widths):
-                cells.append(f' {cell:<{col_widths[i]}} ')
-        formatted_table.append('|' + '|'.join(cells) + '|')
-        formatted_table.append(border)
-    
-    return formatted_table
-
-def clean_content(content):
-    """추출된 내용 정리"""
-    if not content:
-        return ""
-        
-    # 줄 단위로 처리
-    lines = []
-    prev_line = ""
-    
-    for line in content.split('\n'):
-        line = line.strip()
-        if not line:
-            if prev_line:  # 연속된 빈 줄 제거
-                lines.append("")
-                prev_line = ""
-            continue
-            
-        # 표 형식 유지
-        if line.startswith('+') and line.endswith('+'):
-            lines.append(line)
-            prev_line = line
-            continue
-            
-        # 일반 텍스트 처리
-        if line != prev_line:  # 중복 라인 제거
-            lines.append(line)
-            prev_line = line
-    
-    # 마지막 빈 줄 제거
-    while lines and not lines[-1]:
-        lines.pop()
-        
-    return '\n'.join(lines)
-
-def parse_job_list_page(page=1):
-    url = f"{LIST_URL}?page={page}"
-    print(f"Fetching URL: {url}")  # URL 출력
-    
-    response = requests.get(url)
-    print(f"Response status: {response.status_code}")  # 응답 상태 출력
-    
-    soup = BeautifulSoup(response.text, "html.parser")
-    
-    # 디버깅: HTML 구조 출력
-    print("Page structure:")
-    print(soup.prettify()[:500])  # 처음 500자만 출력
-    
-    rows = soup.select("table.tableB tbody tr")
-    print(f"Found {len(rows)} rows")  # 발견된 행 수 출력
-    
-    job_data = []
-    target_date = datetime.now().date()  # 당일 날짜 사용
-
-    for idx, row in enumerate(rows):
+def iter_text_with_ocr(path, listener=None):
+    """
+    PDF 는 그대로, 그 외 형식은 LibreOffice 로 PDF 변환 후
+    페이지 창 단위 렌더링 + 병렬 Tesseract 로 OCR 해 페이지별 텍스트를 내보낸다 (중간 PNG 파일 없음).
+    """
+    with tempfile.TemporaryDirectory(dir=CONVERSION_DIR) as temp_dir:
+        pdf_path = path if path.lower().endswith(".pdf") else convert_to_pdf(path, temp_dir, listener)
+        if not pdf_path:
+            return
         try:
-            cols = row.select("td")
-            print(f"\nProcessing row {idx + 1}, columns: {len(cols)}")  # 행 처리 정보 출력
-            
-            if len(cols) < 6:
-                print(f"Skipping row {idx + 1}: insufficient columns")
-                continue
+            for text in iter_ocr_pages(pdf_path, dpi=OCR_DPI, window=OCR_WINDOW_PAGES, workers=OCR_WORKERS):
+                yield text + "\n"
+        except Exception as e:
+            print(f"Error in iter_text_with_ocr: {str(e)}")
 
-            title_el = cols[2].find("a")
-            if not title_el:
-                print(f"Skipping row {idx + 1}: no title link found")
-                continue
-                
-            title = title_el.get_text(strip=True)
-            href = title_el.get("href", "")
-            if not href:
-                print(f"Skipping row {idx + 1}: no href found")
-                continue
-                
-            full_url = urljoin(LIST_URL, href)
-            date_str = cols[5].text.strip()
-            
-            print(f"Row {idx + 1} data:")
-            print(f"  Title: {title}")
-            print(f"  Date: {date_str}")
-            
-            if not date_str or len(date_str) != 10:
-                print(f"Skipping row {idx + 1}: invalid date format")
-                continue
-                
-            write_date = datetime.strptime(date_str, "%Y-%m-%d")
+def clean_content(content, max_chars=None):
+    """추출된 내용 정리 (청크 스트리밍 정리기 사용, max_chars 를 주면 그 길이까지만)"""
+    return normalize_text(content, max_chars)
 
-            # 월과 일만 비교
-            if write_date.month == target_date.month and write_date.day == target_date.day:
-                print(f"Found matching posting: {title} - {date_str}")
-                job_data.append({
-                    "title": title,
-                    "link": full_url,
-                    "write_date": date_str,
-                    "department": cols[4].text.strip(),
-                })
-        except Exception as e:
-            print(f"Error processing row {idx + 1}: {str(e)}")
-            continue
+def _build_detail_options():
+    options = webdriver.ChromeOptions()
+    options.add_argument('--headless')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    return options
+
+_detail_session = None
 
-    print(f"\nFound {len(job_data)} matching jobs")
-    return job_data
+def _get_detail_session():
+    """스크립트 렌더링이 필요한 상세 페이지에만 쓰는 공유 Chrome 세션"""
+    global _detail_session
+    if _detail_session is None:
+        _detail_session = ChromeSession(_build_detail_options, name="mofa", max_runs=50)
+    return _detail_session
 
-def download_hwp_file(url):
-    """HWP 파일 다운로드"""
+def fetch_job_detail_with_browser(url):
+    """정적 HTML 에 첨부파일/본문이 없을 때만 공유 Chrome 으로 렌더링한 뒤 같은 파서로 읽는다"""
     try:
-        # 상세 페이지에서 다운로드 링크 찾기
-        options = webdriver.ChromeOptions()
-        options.add_argument('--headless')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        driver = webdriver.Chrome(options=options)
-        
-        try:
-            print(f"Accessing URL: {url}")
+        with _get_detail_session().session() as driver:
+            print(f"Accessing URL with browser: {url}")
             driver.get(url)
-            wait = WebDriverWait(driver, 10)
-            
-            # 파일 링크 찾기
-            file_link = wait.until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "a[href*='down.do']"))
-            )
-            download_url = file_link.get_attribute('href')
-            
-            if not download_url:
-                print("Download URL not found")
-                return None
-                
-            # 상대 경로를 절대 경로로 변환
-            if download_url.startswith('./'):
-                base_url = '/'.join(url.split('/')[:-1])
-                download_url = f"{base_url}/{download_url[2:]}"
-            elif download_url.startswith('/'):
-                base_url = '/'.join(url.split('/')[:3])
-                download_url = f"{base_url}{download_url}"
-                
-            print(f"Found download URL: {download_url}")
-            
-            # 파일명 추출
-            file_name = file_link.text.strip()
-            if not file_name:
-                file_name = "downloaded.hwp"
-            
-            # 다운로드 디렉토리 생성
-            download_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "downloads")
-            os.makedirs(download_dir, exist_ok=True)
-            
-            # 파일 경로 설정
-            file_path = os.path.join(download_dir, file_name)
-            
-            # 파일 다운로드
-            response = requests.get(download_url, allow_redirects=True)
-            if response.status_code == 200:
-                with open(file_path, 'wb') as f:
-                    f.write(response.content)
-                print(f"Downloaded HWP file to: {file_path}")
-                print(f"File size: {len(response.content)} bytes")
-                return file_path
-            else:
-                print(f"Failed to download file. Status code: {response.status_code}")
-                return None
-                
-        finally:
-            driver.quit()
-            
+            try:
+                WebDriverWait(driver, 10).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, "a[href*='down.do'], .bo_con"))
+                )
+            except Exception:
+                print("Detail content not rendered within 10s")
+            return parse_job_detail_html(driver.page_source, driver.current_url)
     except Exception as e:
-        print(f"Error downloading HWP file: {str(e)}")
+        print(f"Error rendering job detail: {str(e)}")
         return None
 
-def extract_text_from_hwp_html(hwp_path):
-    """HWP 파일을 HTML로 변환하고 텍스트 추출"""
-    try:
-        # 임시 디렉토리 생성
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # HWP를 HTML로 변환
-            cmd = ["hwp5html", "--output", temp_dir, hwp_path]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode != 0:
-                print(f"Error converting HWP to HTML: {result.stderr}")
-                return None
-                
-            # HTML 파일 읽기
-            html_path = os.path.join(temp_dir, "index.xhtml")
-            if os.path.exists(html_path):
-                with open(html_path, 'r', encoding='utf-8') as f:
-                    html_content = f.read()
-                    
-                # HTML에서 텍스트 추출
-                soup = BeautifulSoup(html_content, 'html.parser')
-                text = soup.get_text()
-                return text
-            else:
-                print(f"HTML file not found at {html_path}")
-                return None
-                
-    except Exception as e:
-        print(f"Error processing HWP file: {str(e)}")
-        return None
+def get_job_detail(url):
+    """상세 페이지의 첨부파일 링크와 본문. HTTP 로 먼저 읽고, 비어 있으면 브라우저로 폴백"""
+    detail = fetch_job_detail(url)
+    if detail and (detail["attachments"] or detail["body"]):
+        return detail
+    return fetch_job_detail_with_browser(url) or detail
 
-def get_content_from_hwp(url):
-    """HWP 파일 다운로드 및 텍스트 추출"""
-    try:
-        # HWP 파일 다운로드
-        hwp_path = download_hwp_file(url)
-        if not hwp_path:
-            print("Failed to download HWP file")
-            return None
-            
-        try:
-            # HWP에서 텍스트 추출
-            text = extract_text_from_hwp_html(hwp_path)
-            if text:
-                return clean_content(text)
-            else:
-                print("Failed to extract text from HWP")
-                return None
-                
-        except Exception as e:
-            print(f"Error processing HWP file: {str(e)}")
-            return None
-                
-    except Exception as e:
-        print(f"Error processing HWP file: {str(e)}")
-        return None
+def _download_hwp_attachment(url, detail=None):
+    """
+    상세 페이지의 첫 번째 첨부파일을 첨부파일 캐시를 거쳐 받는다.
+    이미 받은 파일은 조건부 GET 으로 확인만 한다.
 
-def parse_job_detail(url):
-    """채용공고 상세 페이지 파싱"""
+    Returns:
+        tuple: (파일 경로, SHA-256) — 실패 시 (None, None)
+    """
     try:
-        # HWP 파일에서 내용 추출 시도
-        content = get_content_from_hwp(url)
-        if content:
-            return content
-            
-        # 실패시 페이지 내용 직접 추출 시도
-        options = webdriver.ChromeOptions()
-        options.add_argument('--headless')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        driver = webdriver.Chrome(options=options)
-        
-        try:
-            driver.get(url)
-            content_el = driver.find_element(By.CSS_SELECTOR, ".bo_con")
-            if content_el:
-                return clean_content(content_el.text)
-                
-            return "내용을 찾을 수 없습니다."
-            
-        finally:
-            driver.quit()
-            
+        detail = detail or get_job_detail(url)
+        if not detail or not detail["attachments"]:
+            print("Download URL not found")
+            return None, None
+
+        attachment = detail["attachments"][0]
+        print(f"Found download URL: {attachment['url']}")
+        return download_attachment(attachment["url"], attachment["name"] or "downloaded.hwp")
+
     except Exception as e:
-        print(f"Error parsing job detail: {str(e)}")
+        print(f"Error downloading HWP file: {str(e)}")
+        return None, None
+
+def download_hwp_file(url, detail=None):
+    """HWP 파일 다운로드 (캐시에 저장된 파일 경로 반환)"""
+    return _download_hwp_attachment(url, detail)[0]
+
+def extract_document_text(path, listener=None):
+    """
+    추출 엔진의 작업 프로세스에서 실행된다.
+    HWP 는 HWP 텍스트 백엔드(레코드 스트림 직접 읽기, 실패 시 hwp5html)로,
+    그 외 형식(PDF 등)은 스트리밍 병렬 OCR 로 텍스트를 뽑아, 문단/페이지 단위로 바로 정리한다.
+    listener 는 상주 LibreOffice 리스너 정보 (ports, lock_dir).
+    """
+    if path.lower().endswith(".hwp"):
+        chunks = iter_hwp_text_chunks(path)
+    else:
+        chunks = iter_text_with_ocr(path, listener)
+    # 추출기 청크를 바로 정리기에 넘겨, MOFA_CONTENT_MAX_CHARS 에 닿으면 추출도 멈춘다
+    return normalize_text(chunks, MOFA_CONTENT_MAX_CHARS) or None
+
+def _fallback_content(detail):
+    """첨부파일에서 텍스트를 얻지 못했을 때의 본문"""
+    if not detail:
         return "내용을 가져오는데 실패했습니다."
+    if detail["body"]:
+        return clean_content(detail["body"])
+    return "내용을 찾을 수 없습니다."
 
 def run_mofa_job_crawler():
-    results = []
-    
-    # 여러 페이지 확인
-    for page in range(1, 4):  # 1~3페이지까지 확인
-        items = parse_job_list_page(page=page)
-        
-        for item in items:
-            content = parse_job_detail(item["link"])
-
-            results.append({
-                "site": "MOFA 채용정보",
-                "url": item["link"],
-                "type": "JOB",
-                "title": item["title"],
-                "content": content,
-            })
+    # 목록 페이지를 동시에 조건부 요청으로 확인하고, 당일보다 오래된 글이 나오면 중단
+    list_cache = ListPageCache(os.path.join(STATE_DIR, "mofa_list_cache.json"))
+    items = fetch_job_list(max_pages=MOFA_LIST_MAX_PAGES, window=MOFA_LIST_CONCURRENCY, cache=list_cache)
 
     # 중복 제거
-    unique_results = []
+    unique_items = []
     seen = set()
-    for result in results:
-        if result["url"] not in seen:
-            unique_results.append(result)
-            seen.add(result["url"])
+    for item in items:
+        if item["link"] not in seen:
+            unique_items.append(item)
+            seen.add(item["link"])
+
+    # 상세 페이지와 첨부파일을 먼저 받고, 캐시에 없는 첨부파일만 추출 작업으로 모음
+    attachment_cache = get_attachment_cache()
+    details = {}
+    contents = {}
+    digests = {}
+    tasks = []
+    for item in unique_items:
+        url = item["link"]
+        details[url] = get_job_detail(url)
+        if not details[url]:
+            continue
+        path, sha256 = _download_hwp_attachment(url, details[url])
+        if not path:
+            continue
+        cached = attachment_cache.get_text(sha256, EXTRACTOR_VERSION)
+        if cached is not None:
+            contents[url] = cached
+            continue
+        digests[url] = sha256
+        tasks.append((url, path))
+
+    # 첨부파일 추출은 프로세스 풀에서 병렬 실행 (작업별 제한 시간 초과 시 변환기까지 종료)
+    if tasks:
+        listener = None
+        needs_office = any(not path.lower().endswith((".hwp", ".pdf")) for _, path in tasks)
+        if needs_office and OFFICE_CONVERTER_MODE == "resident" and RESIDENT_AVAILABLE:
+            # LibreOffice 변환이 필요한 첨부파일이 처음 나왔을 때 상주 리스너를 띄우고, 이후 실행에서도 재사용
+            pool = get_office_listener_pool()
+            listener = (pool.ports, pool.lock_dir)
+
+        engine = ExtractionEngine(max_workers=MOFA_EXTRACT_WORKERS, timeout=MOFA_EXTRACT_TIMEOUT, env=TESSERACT_ENV)
+        jobs = [(url, extract_document_text, (path, listener)) for url, path in tasks]
+        for url, text, error in engine.run(jobs):
+            if text:
+                contents[url] = text
+                attachment_cache.put_text(digests[url], text, EXTRACTOR_VERSION)
+            else:
+                print(f"Failed to extract attachment text ({url}): {error}")
+
+    # 캐시 적중으로 바뀐 텍스트 사용 시각을 한 번에 저장
+    attachment_cache.save()
+
+    unique_results = [
+        {
+            "site": "MOFA 채용정보",
+            "url": item["link"],
+            "type": "JOB",
+            "title": item["title"],
+            "content": contents.get(item["link"]) or _fallback_content(details.get(item["link"])),
+        }
+        for item in unique_items
+    ]
 
     if unique_results:
-        post_crawled_data_to_api(unique_results)
+        deliver(TOPIC_CRAWL_DATA, unique_results)
         today = datetime.now().strftime("%Y-%m-%d")
         print(f"✅ 총 {len(unique_results)}건 발견 ({today} 공고)")
     else:
         today = datetime.now().strftime("%Y-%m-%d")
         print(f"📭 {today} 채용 공고가 없습니다.")
 
+    # 결과를 outbox 에 기록한 뒤에만 조건부 요청 헤더 저장 (실패한 실행의 페이지는 다음에 다시 확인)
+    list_cache.save()
+
 if __name__ == "__main__":
     run_mofa_job_crawler()
+    flush_outbox()
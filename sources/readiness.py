@@ -0,0 +1,136 @@
+# sources/readiness.py
+"""
+고정 sleep 대신 페이지 준비 상태를 확인하며 기다리는 대기 유틸.
+
+모든 대기에는 상한 시간이 있고, 실제로 기다린 시간을 로그로 남긴다.
+상한에 도달해도 예외를 던지지 않고 (준비 여부, 대기 시간)을 반환하므로,
+호출 측은 기존 고정 sleep 과 같은 최악 시간 안에서 그대로 진행할 수 있다.
+"""
+import asyncio
+import hashlib
+import logging
+import time
+
+def _log_wait(label, ready, elapsed, timeout):
+    if ready:
+        logging.info(f"⏱️ [{label}] 준비 완료 ({elapsed:.2f}초)")
+    else:
+        logging.warning(f"⌛ [{label}] 대기 상한 {timeout}초 도달, 그대로 진행합니다")
+
+def wait_until(condition, timeout, interval=0.2, label="조건"):
+    """
+    condition() 이 참이 될 때까지 최대 timeout 초 기다린다 (동기).
+
+    Returns:
+        tuple: (준비 여부, 대기 시간(초))
+    """
+    start = time.monotonic()
+    ready = False
+    while True:
+        try:
+            ready = bool(condition())
+        except Exception as e:
+            logging.debug(f"[{label}] 조건 확인 중 오류: {str(e)}")
+        elapsed = time.monotonic() - start
+        if ready or elapsed >= timeout:
+            break
+        time.sleep(min(interval, timeout - elapsed))
+    _log_wait(label, ready, elapsed, timeout)
+    return ready, elapsed
+
+async def async_wait_until(condition, timeout, interval=0.2, label="조건"):
+    """condition() 코루틴 함수가 참이 될 때까지 최대 timeout 초 기다린다 (비동기)."""
+    start = time.monotonic()
+    ready = False
+    while True:
+        try:
+            ready = bool(await condition())
+        except Exception as e:
+            logging.debug(f"[{label}] 조건 확인 중 오류: {str(e)}")
+        elapsed = time.monotonic() - start
+        if ready or elapsed >= timeout:
+            break
+        await asyncio.sleep(min(interval, timeout - elapsed))
+    _log_wait(label, ready, elapsed, timeout)
+    return ready, elapsed
+
+# ── Selenium ─────────────────────────────────────────────
+
+_KEYWORD_COUNTS_JS = """
+var ids = arguments[0], selector = arguments[1];
+return ids.map(function (id) {
+    var section = document.querySelector('div.item#' + id);
+    return section ? section.querySelectorAll(selector).length : 0;
+});
+"""
+
+def wait_for_keyword_sections(driver, platforms, selector="span.keyword > a", min_count=1, timeout=5, interval=0.2):
+    """모든 플랫폼 섹션(div.item#<id>)에 selector 요소가 min_count 개 이상 렌더링될 때까지 기다린다."""
+    def condition():
+        counts = driver.execute_script(_KEYWORD_COUNTS_JS, list(platforms), selector)
+        return all(count >= min_count for count in counts)
+
+    return wait_until(condition, timeout, interval, label=f"키워드 섹션 {len(platforms)}개 ≥{min_count}")
+
+# ── Playwright ───────────────────────────────────────────
+
+class NetworkIdleTracker:
+    """
+    page 의 진행 중인 요청 수를 추적한다.
+    페이지 이동 전에 만들어 두어야 이동 중 시작된 요청까지 셀 수 있다.
+    """
+    def __init__(self, page):
+        self.page = page
+        self.inflight = 0
+        self.last_activity = time.monotonic()
+        page.on("request", self._on_start)
+        page.on("requestfinished", self._on_end)
+        page.on("requestfailed", self._on_end)
+
+    def _on_start(self, request):
+        self.inflight += 1
+        self.last_activity = time.monotonic()
+
+    def _on_end(self, request):
+        self.inflight = max(0, self.inflight - 1)
+        self.last_activity = time.monotonic()
+
+    async def wait(self, idle_ms=500, timeout=10, interval=0.05):
+        """진행 중인 요청이 없는 상태가 idle_ms 동안 유지될 때까지 최대 timeout 초 기다린다."""
+        async def idle():
+            return self.inflight == 0 and (time.monotonic() - self.last_activity) * 1000 >= idle_ms
+        return await async_wait_until(idle, timeout, interval, label=f"네트워크 유휴 {idle_ms}ms")
+
+    def detach(self):
+        self.page.remove_listener("request", self._on_start)
+        self.page.remove_listener("requestfinished", self._on_end)
+        self.page.remove_listener("requestfailed", self._on_end)
+
+async def wait_for_network_idle(page, idle_ms=500, timeout=10):
+    """지금부터 idle_ms 동안 새 요청이 없을 때까지 기다린다 (이미 진행 중인 요청은 셀 수 없음)."""
+    tracker = NetworkIdleTracker(page)
+    try:
+        return await tracker.wait(idle_ms, timeout)
+    finally:
+        tracker.detach()
+
+async def wait_for_canvas_stable(page, selector, timeout=15, interval=0.5, stable_frames=2):
+    """
+    selector 요소 영역의 픽셀이 연속 stable_frames 번 동일해질 때까지 기다린다.
+    캔버스 렌더링/애니메이션이 끝났는지 확인하는 용도.
+    """
+    state = {"last": None, "same": 0}
+
+    async def stable():
+        element = await page.query_selector(selector)
+        if element is None:
+            return False
+        digest = hashlib.sha1(await element.screenshot()).digest()
+        if digest == state["last"]:
+            state["same"] += 1
+        else:
+            state["last"] = digest
+            state["same"] = 1
+        return state["same"] >= stable_frames
+
+    return await async_wait_until(stable, timeout, interval, label=f"{selector} 픽셀 안정화")
@@ -4,23 +4,25 @@ from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import WebDriverException, TimeoutException
 from bs4 import BeautifulSoup
-import time
 import logging
+import time
 from utils.config import REALTIME_URL              # .env에서 설정한 수집 대상 URL
-from utils.api import post_keywords_to_api      # 수집된 데이터를 백엔드 API로 전송
+from utils.config import REALTIME_DRIVER_MODE, REALTIME_DRIVER_MAX_RUNS, REALTIME_DRIVER_MAX_RSS_MB
+from utils.config import REALTIME_MIN_KEYWORDS, REALTIME_READY_TIMEOUT
+from sources.chrome_session import ChromeSession
+from sources.readiness import wait_for_keyword_sections
+from utils.api import build_keyword_payloads
+from utils.outbox import deliver, flush_outbox, TOPIC_SEARCH_TERMS  # 수집된 데이터를 outbox 를 거쳐 백엔드 API로 전송
 
 # 수집 대상 플랫폼 ID들 (HTML의 id 속성 기준)
 PLATFORMS = ["daum", "zum", "nate", "googletrend"]
 
-def get_first_source_keywords():
-    """
-    Selenium으로 지정된 URL에서 각 플랫폼별 실시간 키워드를 수집한다.
-    수집 실패 시 로깅하고 빈 딕셔너리 반환.
-    """
-    if not REALTIME_URL:
-        logging.error("REALTIME_URL이 설정되지 않았습니다.")
-        return {}
+# 페이지 로드 대기 상한(초). 작업 제한 시간이 주어지면 남은 시간으로 더 줄인다.
+PAGE_LOAD_TIMEOUT = 30
 
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36"
+
+def _build_options():
     # 브라우저 옵션 설정 (봇 감지 회피)
     options = Options()
     options.add_argument("--headless")  # 창 없이 실행
@@ -37,62 +39,118 @@ def get_first_source_keywords():
     options.add_argument("--disable-infobars")
     
     # 실제 브라우저처럼 보이도록 User-Agent 설정
-    options.add_argument("--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36")
-
-    driver = None
-    try:
-        # Chrome WebDriver 실행
-        driver = webdriver.Chrome(options=options)
-        
-        # 봇 감지 회피를 위한 추가 설정
-        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-        driver.execute_cdp_cmd('Network.setUserAgentOverride', {
-            "userAgent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36"
-        })
-        
-        driver.set_page_load_timeout(30)
+    options.add_argument(f"--user-agent={USER_AGENT}")
+    return options
+
+def _prepare_driver(driver):
+    # 봇 감지 회피를 위한 추가 설정
+    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    driver.execute_cdp_cmd('Network.setUserAgentOverride', {
+        "userAgent": USER_AGENT
+    })
+    driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+
+_resident_session = None
+
+def _get_resident_session():
+    """realtime 작업 전용 상주 Chrome 세션 (프로세스 전역)"""
+    global _resident_session
+    if _resident_session is None:
+        _resident_session = ChromeSession(
+            _build_options,
+            setup=_prepare_driver,
+            name="realtime",
+            max_runs=REALTIME_DRIVER_MAX_RUNS,
+            max_rss_mb=REALTIME_DRIVER_MAX_RSS_MB
+        )
+    return _resident_session
+
+def _capped(limit, deadline):
+    """limit 과 마감까지 남은 시간 중 작은 값 (마감이 지났으면 TimeoutException)"""
+    if deadline is None:
+        return limit
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise TimeoutException("작업 제한 시간 초과")
+    return min(limit, remaining)
+
+def _collect_keywords(driver, deadline=None):
+    # 상주 드라이버는 실행마다 설정이 남으므로, 이번 실행의 남은 시간으로 대기 상한을 매번 다시 정한다
+    driver.set_page_load_timeout(_capped(PAGE_LOAD_TIMEOUT, deadline))
+    driver.set_script_timeout(_capped(PAGE_LOAD_TIMEOUT, deadline))
+
+    # 상주 세션에서 같은 페이지면 새로고침, 아니면 새로 로드
+    if driver.current_url.rstrip("/") == REALTIME_URL.rstrip("/"):
+        driver.refresh()
+    else:
         driver.get(REALTIME_URL)
 
-        time.sleep(5)  # JavaScript가 키워드를 렌더링할 시간 확보
-
-        # 페이지 전체를 BeautifulSoup으로 파싱
-        soup = BeautifulSoup(driver.page_source, "html.parser")
-        result = {}
+    # 고정 5초 대신 모든 플랫폼 섹션에 키워드가 렌더링될 때까지 기다림 (상한 REALTIME_READY_TIMEOUT)
+    wait_for_keyword_sections(
+        driver, PLATFORMS, min_count=REALTIME_MIN_KEYWORDS, timeout=_capped(REALTIME_READY_TIMEOUT, deadline)
+    )
+
+    # 페이지 전체를 BeautifulSoup으로 파싱
+    soup = BeautifulSoup(driver.page_source, "html.parser")
+    result = {}
+
+    for platform in PLATFORMS:
+        try:
+            # 각 플랫폼의 검색어 박스를 찾음
+            section = soup.find("div", {"class": "item", "id": platform})
+            if not section:
+                logging.warning(f"{platform} 섹션을 찾을 수 없습니다.")
+                continue
 
-        for platform in PLATFORMS:
-            try:
-                # 각 플랫폼의 검색어 박스를 찾음
-                section = soup.find("div", {"class": "item", "id": platform})
-                if not section:
-                    logging.warning(f"{platform} 섹션을 찾을 수 없습니다.")
-                    continue
-
-                # 각 키워드 텍스트 추출
-                keywords = [a.text.strip() for a in section.select("span.keyword > a")]
-                if not keywords:
-                    logging.warning(f"{platform}에서 키워드를 찾을 수 없습니다.")
-                    continue
-
-                result[platform] = keywords
-                logging.info(f"{platform}에서 {len(keywords)}개의 키워드를 수집했습니다.")
-
-            except Exception as e:
-                logging.error(f"{platform} 처리 중 오류 발생: {str(e)}")
+            # 각 키워드 텍스트 추출
+            keywords = [a.text.strip() for a in section.select("span.keyword > a")]
+            if not keywords:
+                logging.warning(f"{platform}에서 키워드를 찾을 수 없습니다.")
                 continue
 
-        return result
+            result[platform] = keywords
+            logging.info(f"{platform}에서 {len(keywords)}개의 키워드를 수집했습니다.")
 
-    except WebDriverException as e:
-        logging.error(f"웹드라이버 오류 발생: {str(e)}")
+        except Exception as e:
+            logging.error(f"{platform} 처리 중 오류 발생: {str(e)}")
+            continue
+
+    return result
+
+def get_first_source_keywords(timeout=None):
+    """
+    Selenium으로 지정된 URL에서 각 플랫폼별 실시간 키워드를 수집한다.
+    REALTIME_DRIVER_MODE=resident 이면 상주 Chrome 세션을 재사용하고, fresh 이면 매번 새로 띄운다.
+    timeout(초)을 주면 페이지 로드/스크립트/렌더링 대기를 그 안으로 줄이고, 넘기면 수집을 포기한다.
+    수집 실패 시 로깅하고 빈 딕셔너리 반환.
+    """
+    if not REALTIME_URL:
+        logging.error("REALTIME_URL이 설정되지 않았습니다.")
         return {}
+
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    driver = None
+    try:
+        if REALTIME_DRIVER_MODE == "resident":
+            with _get_resident_session().session() as resident_driver:
+                return _collect_keywords(resident_driver, deadline)
+
+        # Chrome WebDriver 실행
+        driver = webdriver.Chrome(options=_build_options())
+        _prepare_driver(driver)
+        return _collect_keywords(driver, deadline)
+
     except TimeoutException:
         logging.error("페이지 로딩 시간 초과")
         return {}
+    except WebDriverException as e:
+        logging.error(f"웹드라이버 오류 발생: {str(e)}")
+        return {}
     except Exception as e:
         logging.error(f"예상치 못한 오류 발생: {str(e)}")
         return {}
     finally:
-        # 브라우저 종료
+        # 브라우저 종료 (fresh 모드)
         if driver:
             try:
                 driver.quit()
@@ -111,5 +169,8 @@ if __name__ == "__main__":
         for i, keyword in enumerate(keywords, 1):
             print(f"{i}. {keyword}")
 
-    # 💾 수집 결과 백엔드 API로 전송
-    post_keywords_to_api(data)
+    # 💾 수집 결과 백엔드 API로 전송 (outbox 기록 후 바로 flush)
+    deliver(TOPIC_SEARCH_TERMS, build_keyword_payloads(
+        {platform: list(enumerate(keywords, start=1)) for platform, keywords in data.items()}
+    ))
+    flush_outbox()
@@ -0,0 +1,178 @@
+# sources/screener.py
+"""
+선언형 Finviz 스크리너 엔진.
+
+스크리너는 ScreenerSpec 한 줄(이름, 필터, 정렬, 개수, 종목 구분, 지수)로 정의하고,
+ScreenerEngine 이 여러 스펙을 동시에 가져온다.
+- HTTP 빠른 경로로 모든 스펙을 동시에 요청한다
+- HTTP 로 못 가져온 스펙만 브라우저 context 하나에서 페이지를 나눠 동시에 가져온다
+  (스펙이 늘어도 브라우저를 추가로 띄우지 않는다)
+- 결과는 /stocks 스키마(symbol, name, change, type, index, date)로 정규화해 outbox 에 한 번에 기록한다
+
+새 스크리너(예: 다우 30)는 SCREENERS 에 스펙 한 줄을 추가하면 된다.
+"""
+import asyncio
+import logging
+from datetime import datetime
+from utils.config import FINVIZ_FETCH_MODE, NIGHTLY_SCREENERS
+from utils.outbox import deliver, TOPIC_STOCKS
+from .base_scraper import BaseFinvizScraper
+from .finviz_http import fetch_screener_rows
+from .finviz_table import extract_screener_rows
+
+FINVIZ_SCREENER_URL = "https://finviz.com/screener.ashx"
+
+class ScreenerSpec:
+    def __init__(self, name, filters, sort, stock_type, index, limit=20, signal=None, params=None):
+        """
+        Args:
+            name (str): 스크리너 이름 (결과 키, 로그에 사용)
+            filters (str): Finviz f= 필터 (예: "exch_nasd", "idx_sp500")
+            sort (str): Finviz o= 정렬 (예: "-change" 상승순, "change" 하락순)
+            stock_type (str): 저장할 종목 구분 (GAINER / LOSER)
+            index (str): 저장할 지수 이름 (예: NASDAQ100, SP500)
+            limit (int): 가져올 최대 종목 수
+            signal (str, optional): Finviz s= 시그널 (예: "ta_topgainers")
+            params (dict, optional): 그 밖의 쿼리 파라미터 (예: {"ft": "4"})
+        """
+        self.name = name
+        self.filters = filters
+        self.sort = sort
+        self.stock_type = stock_type
+        self.index = index
+        self.limit = limit
+        self.signal = signal
+        self.params = params or {}
+
+    def build_url(self, base_url=FINVIZ_SCREENER_URL):
+        query = [("v", "111")]
+        if self.signal:
+            query.append(("s", self.signal))
+        if self.filters:
+            query.append(("f", self.filters))
+        query += list(self.params.items())
+        query.append(("o", self.sort))
+        return f"{base_url}?" + "&".join(f"{key}={value}" for key, value in query)
+
+    def __repr__(self):
+        return f"ScreenerSpec({self.name!r})"
+
+NASDAQ_GAINERS = ScreenerSpec("nasdaq_gainers", "exch_nasd", "-change", "GAINER", "NASDAQ100", signal="ta_topgainers")
+NASDAQ_LOSERS = ScreenerSpec("nasdaq_losers", "exch_nasd", "change", "LOSER", "NASDAQ100", signal="ta_toplosers")
+SP500_GAINERS = ScreenerSpec("sp500_gainers", "idx_sp500", "-change", "GAINER", "SP500", params={"ft": "4"})
+SP500_LOSERS = ScreenerSpec("sp500_losers", "idx_sp500", "change", "LOSER", "SP500", params={"ft": "4"})
+
+SCREENERS = {spec.name: spec for spec in (NASDAQ_GAINERS, NASDAQ_LOSERS, SP500_GAINERS, SP500_LOSERS)}
+
+def get_screeners(names):
+    """이름 목록을 스펙 목록으로 바꾼다."""
+    unknown = [name for name in names if name not in SCREENERS]
+    if unknown:
+        raise ValueError(f"알 수 없는 스크리너: {', '.join(unknown)}")
+    return [SCREENERS[name] for name in names]
+
+def to_stock_rows(spec, records, collected_at):
+    """스크리너 레코드를 /stocks 스키마 행으로 정규화한다."""
+    return [
+        {
+            "symbol": record["symbol"],
+            "name": record["name"],
+            "change": record["change"],  # 하락 종목은 이미 음수로 들어옴
+            "type": spec.stock_type,
+            "index": spec.index,
+            "date": collected_at
+        }
+        for record in records[:spec.limit]
+    ]
+
+class ScreenerEngine(BaseFinvizScraper):
+    def __init__(self, max_retries=3, retry_delay=5, fetch_mode=FINVIZ_FETCH_MODE, base_url=FINVIZ_SCREENER_URL):
+        super().__init__(max_retries, retry_delay, fetch_mode)
+        self.base_url = base_url
+
+    async def _fetch_http(self, spec):
+        records = await asyncio.to_thread(fetch_screener_rows, spec.build_url(self.base_url), spec.limit)
+        if records:
+            logging.info(f"⚡ [{spec.name}] HTTP 경로로 {len(records)}개 행 수집")
+        return records
+
+    async def _fetch_page(self, context, spec):
+        page, success = await self._load_page_with_retry(context, spec.build_url(self.base_url))
+        try:
+            if not success:
+                logging.error(f"❌ [{spec.name}] 최대 재시도 횟수 초과")
+                return []
+            records = await extract_screener_rows(page, spec.limit)
+            logging.info(f"🌐 [{spec.name}] 브라우저 경로로 {len(records)}개 행 수집")
+            return records
+        finally:
+            await page.close()
+
+    async def fetch_all(self, specs):
+        """
+        모든 스펙의 레코드를 동시에 가져온다.
+
+        Returns:
+            dict: {스펙 이름: 레코드 목록}
+        """
+        results = {spec.name: [] for spec in specs}
+        pending = list(specs)
+
+        if self.fetch_mode != "browser":
+            fetched = await asyncio.gather(*(self._fetch_http(spec) for spec in pending))
+            for spec, records in zip(pending, fetched):
+                results[spec.name] = records or []
+            pending = [spec for spec, records in zip(pending, fetched) if not records]
+            if pending and self.fetch_mode == "http":
+                logging.error(
+                    f"❌ HTTP 경로 실패 (브라우저 폴백 비활성화): {', '.join(spec.name for spec in pending)}"
+                )
+                return results
+            if pending:
+                logging.info(f"🌐 HTTP 경로 실패, 브라우저로 폴백합니다: {', '.join(spec.name for spec in pending)}")
+
+        if pending:
+            async with self._browser_context() as context:
+                fetched = await asyncio.gather(
+                    *(self._fetch_page(context, spec) for spec in pending), return_exceptions=True
+                )
+            for spec, records in zip(pending, fetched):
+                if isinstance(records, Exception):
+                    logging.error(f"❌ [{spec.name}] 페이지 처리 중 오류: {str(records)}")
+                    continue
+                results[spec.name] = records
+        return results
+
+    async def run(self, specs):
+        """
+        스펙을 모두 가져와 정규화한 행을 outbox 에 기록하고, 기록된 행을 스펙별로 반환한다.
+
+        Returns:
+            dict: {스펙 이름: 저장된 행 목록}
+        """
+        saved_rows = {spec.name: [] for spec in specs}
+        try:
+            records = await self.fetch_all(specs)
+            collected_at = datetime.now().isoformat()
+            rows = [
+                (spec.name, row)
+                for spec in specs
+                for row in to_stock_rows(spec, records[spec.name], collected_at)
+            ]
+            logging.info(f"📝 스크리너 {len(specs)}개에서 총 {len(rows)}개 종목 수집")
+
+            # 수집한 행을 outbox 에 기록 (전송은 flusher 가 담당)
+            saved_flags = await asyncio.to_thread(deliver, TOPIC_STOCKS, [row for _, row in rows])
+            for (name, row), saved in zip(rows, saved_flags):
+                if saved:
+                    saved_rows[name].append(row)
+                    logging.info(f"✅ [{name}] {row['symbol']} ({row['name']}, {row['change']}%) 수집 완료")
+        except Exception as e:
+            logging.error(f"❌ 크롤링 중 오류 발생: {str(e)}")
+        return saved_rows
+
+async def run_screeners(specs=None):
+    """스크리너 스펙을 동시에 실행한다 (기본값: NIGHTLY_SCREENERS)."""
+    if specs is None:
+        specs = get_screeners(NIGHTLY_SCREENERS)
+    return await ScreenerEngine().run(specs)
@@ -0,0 +1,324 @@
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+os.environ.setdefault("REALTIME_URL", "http://localhost")
+os.environ.setdefault("MOFA_URL", "http://localhost")
+os.environ.setdefault("CRAWL_INTERVAL_MINUTES", "1")
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+import openai
+from sources.mapping_engine import MappingEngine
+from utils.mapping_cache import MappingCache
+from utils.rate_limiter import RateLimiter
+from utils.run_ledger import RunLedger, select_shard, DONE, FAILED, IN_FLIGHT
+
+# 로컬 completion API 스텁: 종목마다 매핑 1건을 돌려주고, 지정한 종목은 첫 요청에 429 를 돌려준다
+MAPPING = [{
+    "krName": "삼성전자",
+    "krSymbol": "005930",
+    "reason": "테스트",
+    "marketType": "KOSPI",
+    "correlationType": "POSITIVE"
+}]
+
+class StubState:
+    def __init__(self, rate_limited=(), delay=0.05, dropped=(), invalid=()):
+        self.rate_limited = set(rate_limited)
+        self.delay = delay
+        self.dropped = set(dropped)      # 배치 응답에서 빼먹을 종목
+        self.invalid = set(invalid)      # 배치 응답에 잘못된 항목만 담을 종목
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requests = []
+        self.stream_ended = None
+
+def make_handler(state):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status, body, headers=None):
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _stream(self, body, symbols):
+            # 배치 요청: results 배열을 작은 조각으로 나눠 SSE 로 흘려보낸다
+            results = []
+            for symbol in symbols:
+                if symbol in state.dropped:
+                    continue
+                mappings = [dict(MAPPING[0], marketType="NYSE")] if symbol in state.invalid else MAPPING + [{"krName": "누락"}]
+                results.append({"usSymbol": symbol, "mappings": mappings})
+            content = json.dumps({"results": results}, ensure_ascii=False)
+
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.end_headers()
+
+            def event(payload):
+                self.wfile.write(f"data: {json.dumps(payload)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+
+            chunk = {"id": "chatcmpl-test", "object": "chat.completion.chunk", "created": int(time.time()),
+                     "model": body["model"]}
+            for i in range(0, len(content), 20):
+                event({**chunk, "choices": [{"index": 0, "delta": {"content": content[i:i + 20]}, "finish_reason": None}]})
+                time.sleep(state.delay / 10)
+            event({**chunk, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+            event({**chunk, "choices": [], "usage": {"prompt_tokens": 900, "completion_tokens": 900, "total_tokens": 1800}})
+            self.wfile.write(b"data: [DONE]\n\n")
+            with state.lock:
+                state.stream_ended = time.monotonic()
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            prompt = body["messages"][0]["content"]
+            if body.get("stream"):
+                symbols = [line[2:].split(" ")[0] for line in prompt.splitlines() if line.startswith("- ")]
+                with state.lock:
+                    state.requests.append((tuple(symbols), time.monotonic()))
+                self._stream(body, symbols)
+                return
+            symbol = prompt.split("미국 주식 ")[1].split(" ")[0]
+
+            with state.lock:
+                state.requests.append((symbol, time.monotonic()))
+                state.in_flight += 1
+                state.max_in_flight = max(state.max_in_flight, state.in_flight)
+                limited = symbol in state.rate_limited
+                state.rate_limited.discard(symbol)
+            try:
+                time.sleep(state.delay)
+                if limited:
+                    self._send(429, {"error": {"message": "rate limited", "type": "requests"}},
+                               {"retry-after-ms": "300"})
+                    return
+                self._send(200, {
+                    "id": "chatcmpl-test",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": body["model"],
+                    "choices": [{
+                        "index": 0,
+                        "message": {"role": "assistant", "content": json.dumps(MAPPING, ensure_ascii=False)},
+                        "finish_reason": "stop"
+                    }],
+                    "usage": {"prompt_tokens": 900, "completion_tokens": 300, "total_tokens": 1200}
+                })
+            finally:
+                with state.lock:
+                    state.in_flight -= 1
+    return Handler
+
+def run_engine(state, companies, save_ok=True, refresh=False, **kwargs):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(state))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    saved = []
+    kwargs.setdefault("batch_size", 1)
+
+    def save(symbol, mapping, is_sp500):
+        saved.append((symbol, mapping, is_sp500, time.monotonic()))
+        return [save_ok(item) if callable(save_ok) else save_ok for item in mapping]
+
+    try:
+        client = openai.AsyncOpenAI(
+            api_key="test-key", base_url=f"http://127.0.0.1:{server.server_port}/v1", max_retries=0
+        )
+
+        async def main():
+            engine = MappingEngine(client=client, save=save, **kwargs)
+            try:
+                return await engine.run(companies, is_sp500=True, refresh=refresh)
+            finally:
+                await client.close()
+
+        summary = asyncio.run(main())
+    finally:
+        server.shutdown()
+        server.server_close()
+    return summary, saved
+
+def test_concurrent_mapping_with_rate_limit_retry():
+    companies = [{"symbol": f"SYM{i}", "name": f"Company {i}"} for i in range(12)]
+    state = StubState(rate_limited={"SYM3"})
+
+    started = time.monotonic()
+    summary, saved = run_engine(state, companies, concurrency=4, rpm=0, tpm=0)
+    elapsed = time.monotonic() - started
+
+    assert sorted(summary["done"]) == sorted(c["symbol"] for c in companies)
+    assert summary["failed"] == []
+    assert sorted(symbol for symbol, _, _, _ in saved) == sorted(c["symbol"] for c in companies)
+    assert all(mapping == MAPPING and is_sp500 for _, mapping, is_sp500, _ in saved)
+    # 429 를 받은 종목은 한 번 더 요청됨
+    assert [symbol for symbol, _ in state.requests].count("SYM3") == 2
+    # 동시 요청 수는 concurrency 를 넘지 않으면서 실제로 병렬 진행됨
+    assert 1 < state.max_in_flight <= 4
+    # 순차 실행(12 × 0.05초 + 종목당 3초 대기)보다 훨씬 빠름
+    assert elapsed < 3
+
+def test_rate_limit_pauses_other_requests():
+    companies = [{"symbol": f"SYM{i}", "name": f"Company {i}"} for i in range(4)]
+    state = StubState(rate_limited={"SYM0"}, delay=0.01)
+
+    summary, _ = run_engine(state, companies, concurrency=1, rpm=0, tpm=0)
+
+    assert summary["failed"] == []
+    # 429 이후 요청은 Retry-After(0.3초)가 지난 뒤에 나가야 함
+    first_time = state.requests[0][1]
+    assert all(t - first_time >= 0.3 for _, t in state.requests[1:])
+
+def test_requests_per_minute_bucket():
+    companies = [{"symbol": f"SYM{i}", "name": f"Company {i}"} for i in range(5)]
+    state = StubState(delay=0.0)
+
+    # 분당 120회 → 버킷 120개가 가득 찬 상태로 시작하므로 5건은 바로 나가야 함
+    started = time.monotonic()
+    summary, _ = run_engine(state, companies, concurrency=5, rpm=120, tpm=0)
+    assert summary["failed"] == []
+    assert time.monotonic() - started < 1
+
+    # 분당 60회 + 버킷을 비운 상태 → 초당 1건 속도로 나감
+    async def acquire_three():
+        limiter = RateLimiter(rpm=60)
+        limiter.requests.drain()
+        start = time.monotonic()
+        for _ in range(3):
+            await limiter.acquire()
+        return time.monotonic() - start
+
+    assert asyncio.run(acquire_three()) >= 2.5
+
+def test_cache_skips_fresh_symbols():
+    companies = [{"symbol": f"SYM{i}", "name": f"Company {i}"} for i in range(3)]
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = MappingCache(os.path.join(temp_dir, "mapping_cache.db"))
+        options = {"concurrency": 3, "rpm": 0, "tpm": 0, "cache": cache, "prompt_version": "v1"}
+
+        # 첫 실행: GPT 응답은 받았지만 저장 실패
+        state = StubState(delay=0.0)
+        summary, _ = run_engine(state, companies, save_ok=False, **options)
+        assert len(state.requests) == 3 and len(summary["failed"]) == 3
+
+        # 재실행: GPT 는 다시 부르지 않고 캐시된 응답으로 저장만 재시도
+        state = StubState(delay=0.0)
+        summary, saved = run_engine(state, companies, **options)
+        assert state.requests == [] and len(saved) == 3 and len(summary["done"]) == 3
+
+        # 저장까지 끝난 종목은 건너뜀
+        state = StubState(delay=0.0)
+        summary, saved = run_engine(state, companies, **options)
+        assert state.requests == [] and saved == [] and len(summary["skipped"]) == 3
+
+        # 무효화한 종목과 프롬프트가 바뀐 경우만 다시 요청
+        cache.invalidate(["SYM1"])
+        state = StubState(delay=0.0)
+        run_engine(state, companies, **options)
+        assert [symbol for symbol, _ in state.requests] == ["SYM1"]
+
+        state = StubState(delay=0.0)
+        run_engine(state, companies, **{**options, "prompt_version": "v2"})
+        assert len(state.requests) == 3
+
+        # TTL 이 지난 항목은 없는 것으로 봄
+        cache.ttl_seconds = 0
+        assert cache.get("SYM0", "Company 0", "gpt-4o-mini", "v2") is None
+        cache.close()
+
+def test_ledger_resume_and_shards():
+    companies = [{"symbol": f"SYM{i}", "name": f"Company {i}"} for i in range(20)]
+
+    # 샤드는 겹치지 않고 전체를 덮음
+    shards = [select_shard(companies, shard, 3) for shard in range(3)]
+    symbols = [company["symbol"] for shard in shards for company in shard]
+    assert sorted(symbols) == sorted(company["symbol"] for company in companies)
+    assert len(symbols) == len(set(symbols))
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "mapping_runs.db")
+        ledger = RunLedger(path, "run-1")
+        remaining = ledger.begin(companies[:5])
+        assert len(remaining) == 5
+
+        # SYM1 은 저장 실패, SYM2 는 처리 중에 프로세스가 죽은 상태를 흉내
+        state = StubState(delay=0.0)
+        run_engine(state, remaining[:1], save_ok=True, ledger=ledger, concurrency=2, rpm=0, tpm=0)
+        run_engine(StubState(delay=0.0), [remaining[1]], save_ok=False, ledger=ledger, concurrency=1, rpm=0, tpm=0)
+        ledger.mark("SYM2", IN_FLIGHT)
+        assert ledger.counts() == {DONE: 1, FAILED: 1, IN_FLIGHT: 1, "pending": 2}
+        ledger.close()
+
+        # 재시작: 끝난 종목만 빼고 이어서 처리
+        ledger = RunLedger(path, "run-1")
+        remaining = ledger.begin(companies[:5])
+        assert [company["symbol"] for company in remaining] == ["SYM1", "SYM2", "SYM3", "SYM4"]
+        state = StubState(delay=0.0)
+        run_engine(state, remaining, ledger=ledger, concurrency=4, rpm=0, tpm=0)
+        assert sorted(symbol for symbol, _ in state.requests) == ["SYM1", "SYM2", "SYM3", "SYM4"]
+        assert ledger.counts() == {DONE: 5}
+        assert ledger.begin(companies[:5]) == []
+        ledger.close()
+
+def test_batched_streaming_with_single_fallback():
+    companies = [{"symbol": f"SYM{i}", "name": f"Company {i}"} for i in range(8)]
+    state = StubState(delay=0.2, dropped={"SYM2"}, invalid={"SYM5"})
+
+    summary, saved = run_engine(state, companies, batch_size=4, concurrency=2, rpm=0, tpm=0)
+
+    assert sorted(summary["done"]) == sorted(c["symbol"] for c in companies)
+    assert summary["failed"] == []
+    # 배치 2건 + 빠진 종목(SYM2), 유효한 항목이 없는 종목(SYM5)의 단건 재요청 2건
+    batches = [symbols for symbols, _ in state.requests if isinstance(symbols, tuple)]
+    singles = sorted(symbol for symbol, _ in state.requests if isinstance(symbol, str))
+    assert sorted(batches) == [("SYM0", "SYM1", "SYM2", "SYM3"), ("SYM4", "SYM5", "SYM6", "SYM7")]
+    assert singles == ["SYM2", "SYM5"]
+    # 잘못된 항목은 버리고 유효한 항목만 저장
+    assert all(mapping == MAPPING for _, mapping, _, _ in saved)
+    assert len(saved) == 8
+    # 스트림이 끝나기 전에 먼저 완성된 종목부터 저장됨
+    first_saved = min(t for _, _, _, t in saved)
+    assert first_saved < state.stream_ended
+
+def test_ledger_retries_only_failed_rows():
+    companies = [{"symbol": "SYM0", "name": "Company 0"}]
+    rows = MAPPING + [dict(MAPPING[0], krName="SK하이닉스", krSymbol="000660")]
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = MappingCache(os.path.join(temp_dir, "mapping_cache.db"))
+        ledger = RunLedger(os.path.join(temp_dir, "mapping_runs.db"), "run-1")
+        ledger.begin(companies)
+        options = {"concurrency": 1, "rpm": 0, "tpm": 0, "cache": cache, "ledger": ledger, "prompt_version": "v1"}
+        cache.put("SYM0", "Company 0", "gpt-4o-mini", "v1", rows)
+
+        # 첫 실행: 두 번째 행만 저장 실패 → 종목은 failed
+        _, saved = run_engine(StubState(), companies, save_ok=lambda item: item["krSymbol"] == "005930", **options)
+        assert [item["krSymbol"] for item in saved[0][1]] == ["005930", "000660"]
+        assert ledger.counts() == {FAILED: 1}
+
+        # 재실행: 이미 저장된 행은 다시 보내지 않음
+        summary, saved = run_engine(StubState(), ledger.begin(companies), **options)
+        assert [item["krSymbol"] for item in saved[0][1]] == ["000660"]
+        assert summary["done"] == ["SYM0"] and ledger.counts() == {DONE: 1}
+        ledger.close()
+        cache.close()
+
+if __name__ == "__main__":
+    test_concurrent_mapping_with_rate_limit_retry()
+    test_rate_limit_pauses_other_requests()
+    test_requests_per_minute_bucket()
+    test_cache_skips_fresh_symbols()
+    test_ledger_resume_and_shards()
+    test_batched_streaming_with_single_fallback()
+    test_ledger_retries_only_failed_rows()
+    print("✅ mapping engine tests passed")
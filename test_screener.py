@@ -0,0 +1,93 @@
+import asyncio
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+os.environ.setdefault("REALTIME_URL", "http://localhost")
+os.environ.setdefault("MOFA_URL", "http://localhost")
+os.environ.setdefault("CRAWL_INTERVAL_MINUTES", "1")
+
+from sources.screener import SCREENERS, ScreenerEngine, get_screeners, to_stock_rows
+
+HEADERS = ["No.", "Ticker", "Company", "Sector", "Industry", "Country",
+           "Market Cap", "P/E", "Price", "Change", "Volume"]
+
+def build_screener_html(prefix, row_count, sign):
+    head = "".join(f"<th>{h}</th>" for h in HEADERS)
+    body = []
+    for i in range(1, row_count + 1):
+        cells = [str(i), f"{prefix}{i}", f"Company {i}", "Technology", "Software", "USA",
+                 "1.2B", "-", "10.00", f"{sign}{i * 0.5:.2f}%", "12,345"]
+        body.append("<tr>" + "".join(f"<td>{c}</td>" for c in cells) + "</tr>")
+    return (f"<html><body><table class='styled-table-new'><thead><tr>{head}</tr></thead>"
+            f"<tbody>{''.join(body)}</tbody></table></body></html>")
+
+# 로컬 스크리너 스텁: barrier 인원이 모두 도착해야 응답한다 (요청이 순차로 오면 barrier 가 시간 초과로 깨져 500).
+# 동시에 처리 중인 요청 수의 최댓값도 기록하고, 필터/정렬에 맞는 25행 테이블을 돌려준다
+def make_handler(requests, barrier, stats):
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            query = parse_qs(urlparse(self.path).query)
+            with lock:
+                requests.append(query)
+                stats["inflight"] += 1
+                stats["peak"] = max(stats["peak"], stats["inflight"])
+            try:
+                barrier.wait()
+            except threading.BrokenBarrierError:
+                self.send_error(500)
+                return
+            finally:
+                with lock:
+                    stats["inflight"] -= 1
+            prefix = "N" if query["f"][0] == "exch_nasd" else "S"
+            sign = "-" if query["o"][0] == "change" else ""
+            data = build_screener_html(prefix, 25, sign).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+    return Handler
+
+def test_spec_urls_match_finviz_screeners():
+    assert SCREENERS["nasdaq_gainers"].build_url() == \
+        "https://finviz.com/screener.ashx?v=111&s=ta_topgainers&f=exch_nasd&o=-change"
+    assert SCREENERS["sp500_losers"].build_url() == \
+        "https://finviz.com/screener.ashx?v=111&f=idx_sp500&ft=4&o=change"
+
+def test_specs_run_concurrently_over_http():
+    requests = []
+    stats = {"inflight": 0, "peak": 0}
+    barrier = threading.Barrier(4, timeout=5)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(requests, barrier, stats))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        specs = get_screeners(["nasdaq_gainers", "nasdaq_losers", "sp500_gainers", "sp500_losers"])
+        engine = ScreenerEngine(fetch_mode="http", base_url=f"http://127.0.0.1:{server.server_port}/screener.ashx")
+        results = asyncio.run(engine.fetch_all(specs))
+    finally:
+        barrier.abort()
+        server.shutdown()
+        server.server_close()
+
+    # 4개 스크리너 요청이 동시에 진행됨 (순차 실행이면 barrier 가 깨져 결과가 비고 peak 도 1)
+    assert len(requests) == 4
+    assert stats["peak"] == 4
+    assert all(len(records) == 20 for records in results.values())
+
+    rows = to_stock_rows(SCREENERS["sp500_losers"], results["sp500_losers"], "2024-01-01T00:00:00")
+    assert rows[0] == {"symbol": "S1", "name": "Company 1", "change": -0.5, "type": "LOSER",
+                       "index": "SP500", "date": "2024-01-01T00:00:00"}
+    assert {row["index"] for row in to_stock_rows(SCREENERS["nasdaq_gainers"], results["nasdaq_gainers"], "")} == {"NASDAQ100"}
+
+if __name__ == "__main__":
+    test_spec_urls_match_finviz_screeners()
+    test_specs_run_concurrently_over_http()
+    print("✅ screener tests passed")
@@ -1,79 +1,147 @@
 # utils/api.py
-import requests
 import logging
+import os
+import threading
 from datetime import datetime
-from utils.config import BASE_API_URL
+from utils.api_client import get_api_client
+from utils.config import (
+    API_BULK_ENABLED, SEARCH_TERMS_BULK_PATH, STOCKS_BULK_PATH, CRAWL_DATA_BULK_PATH, STOCK_MAPPINGS_BULK_PATH,
+    STATE_DIR
+)
+from utils.crawl_hash_store import CrawlHashStore, content_hash
 
-def post_keywords_to_api(result: dict):
+def _post_keyword(payload: dict, headers=None):
+    platform = payload["platform"]
+    rank = payload["rank"]
+    keyword = payload["keyword"]
+    try:
+        res = get_api_client().post("/search-terms", payload, headers=headers)
+        if res.status_code == 201:
+            logging.info(f"[{platform}] {rank}. '{keyword}' 저장 완료")
+            return True
+        else:
+            logging.warning(f"[{platform}] {rank}. '{keyword}' 저장 실패 → {res.status_code}")
+            return False
+    except Exception as e:
+        logging.error(f"[{platform}] '{keyword}' 전송 오류: {str(e)}")
+        return False
+
+def build_keyword_payloads(entries: dict):
+    """{platform: [(rank, keyword), ...]} 를 /search-terms payload 목록으로 변환한다."""
     now = datetime.now().isoformat()
+    return [
+        {
+            "platform": platform,
+            "keyword": keyword,
+            "rank": rank,
+            "collectedAt": now
+        }
+        for platform, platform_entries in entries.items()
+        for rank, keyword in platform_entries
+    ]
+
+def post_keyword_payloads(payloads: list, keys=None):
+    """키워드 payload 목록을 전송하고 항목별 성공 여부를 반환한다. keys 는 항목별 멱등성 키."""
+    client = get_api_client()
+    if API_BULK_ENABLED:
+        return client.post_bulk(SEARCH_TERMS_BULK_PATH, payloads, _post_keyword, keys=keys)
+    return client.map_with_keys(_post_keyword, payloads, keys)
+
+def _post_crawled_item(payload: dict, headers=None):
+    client = get_api_client()
+    try:
+        # 필수 필드만 포함하여 check 요청
+        check_payload = {"url": payload["url"]}
+        check_res = client.get("/crawl-data/check", check_payload)
+
+        if check_res.status_code == 200:
+            check_data = check_res.json()
+            if check_data.get("exists"):
+                # 이미 존재하면 title과 content만 업데이트
+                update_payload = {
+                    "url": payload["url"],
+                    "title": payload["title"],
+                    "content": payload["content"]
+                }
+                res = client.put("/crawl-data", update_payload, headers=headers)
+                if res.status_code == 200:
+                    logging.info(f"[{payload['site']}] '{payload['title']}' 업데이트 완료")
+                    return True
+                logging.warning(f"[{payload['site']}] '{payload['title']}' 업데이트 실패 → {res.status_code}")
+                return False
+
+        # 없는 경우 새로 생성
+        create_payload = {
+            "site": payload["site"],
+            "url": payload["url"],
+            "type": payload["type"],
+            "title": payload.get("title"),  # optional
+            "content": payload.get("content")  # optional
+        }
+        res = client.post("/crawl-data", create_payload, headers=headers)
+        if res.status_code == 201:
+            logging.info(f"[{payload['site']}] '{payload['title']}' 저장 완료")
+            return True
+        logging.warning(f"[{payload['site']}] '{payload['title']}' 저장 실패 → {res.status_code}")
+        return False
+    except Exception as e:
+        logging.error(f"[{payload['site']}] '{payload['title']}' 전송 오류: {str(e)}")
+        return False
+
+_crawl_hash_store = None
+_crawl_hash_store_lock = threading.Lock()
+
+def _get_crawl_hash_store():
+    global _crawl_hash_store
+    with _crawl_hash_store_lock:
+        if _crawl_hash_store is None:
+            _crawl_hash_store = CrawlHashStore(os.path.join(STATE_DIR, "crawl_data_hashes.json"))
+        return _crawl_hash_store
 
-    for platform, keywords in result.items():
-        for rank, keyword in enumerate(keywords, start=1):
-            payload = {
-                "platform": platform,
-                "keyword": keyword,
-                "rank": rank,
-                "collectedAt": now
-            }
-            try:
-                res = requests.post(f"{BASE_API_URL}/search-terms", json=payload, timeout=10)
-                if res.status_code == 201:
-                    logging.info(f"[{platform}] {rank}. '{keyword}' 저장 완료")
-                else:
-                    logging.warning(f"[{platform}] {rank}. '{keyword}' 저장 실패 → {res.status_code}")
-            except Exception as e:
-                logging.error(f"[{platform}] '{keyword}' 전송 오류: {str(e)}")
-
-def post_crawled_data_to_api(results: list):
-    for payload in results:
-        try:
-            # 필수 필드만 포함하여 check 요청
-            check_payload = {"url": payload["url"]}
-            check_res = requests.get(
-                f"{BASE_API_URL}/crawl-data/check",
-                json=check_payload,
-                timeout=10
-            )
-            
-            if check_res.status_code == 200:
-                check_data = check_res.json()
-                if check_data.get("exists"):
-                    # 이미 존재하면 title과 content만 업데이트
-                    update_payload = {
-                        "url": payload["url"],
-                        "title": payload["title"],
-                        "content": payload["content"]
-                    }
-                    res = requests.put(
-                        f"{BASE_API_URL}/crawl-data",
-                        json=update_payload,
-                        timeout=10
-                    )
-                    if res.status_code == 200:
-                        logging.info(f"[{payload['site']}] '{payload['title']}' 업데이트 완료")
-                    else:
-                        logging.warning(f"[{payload['site']}] '{payload['title']}' 업데이트 실패 → {res.status_code}")
-                    continue
-            
-            # 없는 경우 새로 생성
-            create_payload = {
-                "site": payload["site"],
-                "url": payload["url"],
-                "type": payload["type"],
-                "title": payload.get("title"),  # optional
-                "content": payload.get("content")  # optional
-            }
-            res = requests.post(
-                f"{BASE_API_URL}/crawl-data",
-                json=create_payload,
-                timeout=10
-            )
-            if res.status_code == 201:
-                logging.info(f"[{payload['site']}] '{payload['title']}' 저장 완료")
-            else:
-                logging.warning(f"[{payload['site']}] '{payload['title']}' 저장 실패 → {res.status_code}")
-        except Exception as e:
-            logging.error(f"[{payload['site']}] '{payload['title']}' 전송 오류: {str(e)}")
+def _build_upsert_payload(payload: dict, digest: str):
+    return {
+        "site": payload["site"],
+        "url": payload["url"],
+        "type": payload["type"],
+        "title": payload.get("title"),
+        "content": payload.get("content"),
+        "contentHash": digest
+    }
+
+def post_crawled_data_to_api(results: list, keys=None):
+    """
+    크롤링 결과를 전송하고 항목별 성공 여부를 반환한다.
+    - 마지막으로 전송한 제목/본문 해시와 같은 게시글은 보내지 않고 성공으로 처리한다
+    - 나머지는 url 기준 bulk upsert 엔드포인트로 묶어 보내고,
+      미지원 백엔드(404/405)에서는 check → PUT/POST 단건 전송으로 폴백한다
+    """
+    results = list(results)
+    store = _get_crawl_hash_store()
+    digests = [content_hash(payload) for payload in results]
+    flags = [True] * len(results)
+
+    pending = [
+        i for i, (payload, digest) in enumerate(zip(results, digests))
+        if not store.is_unchanged(payload["url"], digest)
+    ]
+    skipped = len(results) - len(pending)
+    if skipped:
+        logging.info(f"💤 [crawl-data] 내용이 바뀌지 않은 {skipped}건 전송 생략")
+    if not pending:
+        return flags
+
+    payloads = [_build_upsert_payload(results[i], digests[i]) for i in pending]
+    pending_keys = [keys[i] for i in pending] if keys is not None else None
+    client = get_api_client()
+    if API_BULK_ENABLED:
+        sent = client.post_bulk(CRAWL_DATA_BULK_PATH, payloads, _post_crawled_item, keys=pending_keys)
+    else:
+        sent = client.map_with_keys(_post_crawled_item, payloads, pending_keys)
+
+    for i, ok in zip(pending, sent):
+        flags[i] = ok
+    store.update([(results[i]["url"], digests[i]) for i, ok in zip(pending, sent) if ok])
+    return flags
 
 def get_s3_presigned_url(key: str, content_type: str = 'image/png') -> dict:
     """
@@ -85,12 +153,8 @@ def get_s3_presigned_url(key: str, content_type: str = 'image/png') -> dict:
             "type": "put",
             "contentType": content_type
         }
-        res = requests.post(
-            f"{BASE_API_URL}/s3/presigned-url",
-            json=payload,
-            timeout=10
-        )
-        
+        res = get_api_client().post("/s3/presigned-url", payload)
+
         if res.status_code == 201 or res.status_code == 200:
             return res.json()
         else:
@@ -105,7 +169,7 @@ def get_nasdaq_stocks():
     나스닥 종목 목록을 가져옵니다.
     """
     try:
-        res = requests.get(f"{BASE_API_URL}/stocks/nasdaq", timeout=10)
+        res = get_api_client().get("/stocks/nasdaq")
         if res.status_code == 200:
             return res.json()
         else:
@@ -115,12 +179,12 @@ def get_nasdaq_stocks():
         logging.error(f"나스닥 종목 목록 요청 오류: {str(e)}")
         return []
 
-def post_stock_data(stock_data: dict):
+def post_stock_data(stock_data: dict, headers=None):
     """
     주식 데이터를 API로 전송합니다.
     """
     try:
-        res = requests.post(f"{BASE_API_URL}/stocks/us", json=stock_data, timeout=10)
+        res = get_api_client().post("/stocks/us", stock_data, headers=headers)
         if res.status_code == 201:
             logging.info(f"[{stock_data['symbol']}] '{stock_data['name']}' 저장 완료")
             return True
@@ -131,12 +195,23 @@ def post_stock_data(stock_data: dict):
         logging.error(f"[{stock_data['symbol']}] '{stock_data['name']}' 전송 오류: {str(e)}")
         return False
 
+def post_stock_data_batch(stock_rows: list, keys=None):
+    """
+    여러 주식 데이터를 한 번에 전송하고, 입력 순서대로 항목별 성공 여부 리스트를 반환합니다.
+    bulk 엔드포인트가 없는 백엔드에서는 post_stock_data 로 단건 전송합니다.
+    keys 는 항목별 멱등성 키입니다 (outbox 재전송용).
+    """
+    client = get_api_client()
+    if API_BULK_ENABLED:
+        return client.post_bulk(STOCKS_BULK_PATH, stock_rows, post_stock_data, keys=keys)
+    return client.map_with_keys(post_stock_data, stock_rows, keys)
+
 def get_sp500_stocks():
     """
     S&P 500 종목 목록을 가져옵니다.
     """
     try:
-        res = requests.get(f"{BASE_API_URL}/stocks/sp500", timeout=10)
+        res = get_api_client().get("/stocks/sp500")
         if res.status_code == 200:
             return res.json()
         else:
@@ -146,39 +221,55 @@ def get_sp500_stocks():
         logging.error(f"S&P 500 종목 목록 요청 오류: {str(e)}")
         return []
 
-def post_stock_mapping(symbol: str, mapping_data: dict, is_sp500: bool = False):
-    """
-    주식 매핑 데이터를 API로 전송합니다.
-    
-    Args:
-        symbol (str): 미국 주식 심볼
-        mapping_data (dict): 매핑 데이터 (krName, krSymbol, reason)
-        is_sp500 (bool): S&P 500 종목 여부 (기본값: False)
-    """
+def build_stock_mapping_payload(symbol: str, mapping_data: dict, is_sp500: bool = False):
+    """매핑 데이터를 /stocks/kr-mappings DTO 형식의 payload 로 변환한다."""
+    return {
+        "krName": mapping_data["krName"],
+        "krSymbol": mapping_data["krSymbol"],
+        "reason": mapping_data["reason"],
+        "nasdaqSymbol": None if is_sp500 else symbol,
+        "sp500Symbol": symbol if is_sp500 else None,
+        "marketType": mapping_data["marketType"],
+        "correlationType": mapping_data["correlationType"]
+    }
+
+def _post_stock_mapping_payload(payload: dict, headers=None):
+    symbol = payload["sp500Symbol"] or payload["nasdaqSymbol"]
     try:
-        # DTO 형식에 맞게 payload 구성
-        payload = {
-            "krName": mapping_data["krName"],
-            "krSymbol": mapping_data["krSymbol"],
-            "reason": mapping_data["reason"],
-            "nasdaqSymbol": None if is_sp500 else symbol,
-            "sp500Symbol": symbol if is_sp500 else None,
-            "marketType": mapping_data["marketType"],
-            "correlationType": mapping_data["correlationType"]
-        }
-        
-        res = requests.post(
-            f"{BASE_API_URL}/stocks/kr-mappings",
-            json=payload,
-            timeout=10
-        )
+        res = get_api_client().post("/stocks/kr-mappings", payload, headers=headers)
         if res.status_code == 201:
-            logging.info(f"[{symbol}] → {mapping_data['krName']} 매핑 저장 완료")
+            logging.info(f"[{symbol}] → {payload['krName']} 매핑 저장 완료")
             return True
         else:
-            logging.warning(f"[{symbol}] → {mapping_data['krName']} 매핑 저장 실패 → {res.status_code}")
+            logging.warning(f"[{symbol}] → {payload['krName']} 매핑 저장 실패 → {res.status_code}")
             return False
     except Exception as e:
-        logging.error(f"[{symbol}] → {mapping_data['krName']} 매핑 전송 오류: {str(e)}")
+        logging.error(f"[{symbol}] → {payload['krName']} 매핑 전송 오류: {str(e)}")
         return False
 
+def post_stock_mappings(mappings: dict, is_sp500: bool = False, keys=None):
+    """
+    여러 미국 종목의 매핑을 bulk 엔드포인트로 묶어 전송한다.
+    미지원 백엔드(404/405)에서는 /stocks/kr-mappings 단건 전송으로 폴백한다.
+
+    Args:
+        mappings (dict): {미국 종목 심볼: [매핑 데이터, ...]}
+        is_sp500 (bool): S&P 500 종목 여부
+        keys (dict, optional): {미국 종목 심볼: [항목별 멱등성 키, ...]} (mappings 와 같은 순서)
+
+    Returns:
+        dict: {미국 종목 심볼: [항목별 성공 여부]} (입력 순서와 같음)
+    """
+    rows = [(symbol, item) for symbol, items in mappings.items() for item in items]
+    payloads = [build_stock_mapping_payload(symbol, item, is_sp500) for symbol, item in rows]
+    row_keys = [key for symbol in mappings for key in keys[symbol]] if keys is not None else None
+    client = get_api_client()
+    if API_BULK_ENABLED:
+        sent = client.post_bulk(STOCK_MAPPINGS_BULK_PATH, payloads, _post_stock_mapping_payload, keys=row_keys)
+    else:
+        sent = client.map_with_keys(_post_stock_mapping_payload, payloads, row_keys)
+
+    results = {symbol: [] for symbol in mappings}
+    for (symbol, _), ok in zip(rows, sent):
+        results[symbol].append(ok)
+    return results
@@ -0,0 +1,241 @@
+# utils/api_client.py
+"""
+백엔드 API 전송용 공유 클라이언트.
+
+- keep-alive 커넥션 풀 (requests.Session + HTTPAdapter)
+- 5xx / 타임아웃 / 연결 오류 시 지터가 포함된 지수 백오프 재시도
+- 선택적 gzip 요청 본문
+- 동시성 상한이 있는 스레드 풀 전송 (map_concurrent)
+- bulk 엔드포인트 전송과, 미지원 백엔드(404/405)에 대한 단건 전송 폴백 (post_bulk)
+- 선택적 Idempotency-Key 헤더 (재전송 시 백엔드 중복 저장 방지)
+"""
+import gzip
+import hashlib
+import json
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+from utils.config import (
+    BASE_API_URL, API_MAX_WORKERS, API_MAX_RETRIES, API_TIMEOUT, API_GZIP, API_BULK_CHUNK_SIZE
+)
+
+# 재시도 대상 응답 코드
+RETRY_STATUS_CODES = {500, 502, 503, 504}
+
+# bulk 엔드포인트가 없다고 판단하는 응답 코드
+BULK_UNSUPPORTED_STATUS_CODES = {404, 405}
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+def idempotency_headers(keys):
+    """항목 키 목록으로 요청 단위 Idempotency-Key 헤더를 만든다 (단건이면 키 그대로)."""
+    if not keys:
+        return None
+    if len(keys) == 1:
+        return {IDEMPOTENCY_HEADER: keys[0]}
+    return {IDEMPOTENCY_HEADER: hashlib.sha256("\n".join(keys).encode("utf-8")).hexdigest()}
+
+def _item_succeeded(result):
+    if isinstance(result, bool):
+        return result
+    if isinstance(result, dict):
+        if "success" in result:
+            return bool(result["success"])
+        if "status" in result and isinstance(result["status"], int):
+            return 200 <= result["status"] < 300
+        return not result.get("error")
+    return result is not None
+
+def parse_bulk_results(res, count):
+    """
+    bulk 응답에서 항목별 성공 여부를 읽는다.
+    {"results": [...]} 또는 결과 배열을 지원한다. 본문이 비어 있는 2xx 만 전체 성공으로 보고,
+    JSON 이 아니거나 항목별 결과가 없거나 개수가 맞지 않으면 청크 전체를 실패로 본다
+    (outbox 가 성공한 행을 지우므로, 확인되지 않은 행을 성공으로 처리하면 데이터가 사라진다).
+    """
+    if not 200 <= res.status_code < 300:
+        return [False] * count
+    if not res.content or not res.content.strip():
+        return [True] * count
+    try:
+        body = res.json()
+    except ValueError:
+        logging.warning("⚠️ bulk 응답 본문을 JSON 으로 읽을 수 없어 청크 전체를 실패로 처리합니다")
+        return [False] * count
+    results = body.get("results") if isinstance(body, dict) else body
+    if not isinstance(results, list) or len(results) != count:
+        logging.warning(
+            f"⚠️ bulk 응답에 항목별 결과가 없거나 개수가 다릅니다 "
+            f"(요청 {count}건, 결과 {len(results) if isinstance(results, list) else '없음'}) → 청크 전체 실패 처리"
+        )
+        return [False] * count
+    return [_item_succeeded(result) for result in results]
+
+class ApiClient:
+    def __init__(self, base_url, max_workers=8, max_retries=3, timeout=10,
+                 gzip_body=False, backoff_base=0.5, backoff_max=8.0, bulk_chunk_size=100):
+        self.base_url = base_url
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.gzip_body = gzip_body
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.bulk_chunk_size = bulk_chunk_size
+        self._unsupported_bulk_paths = set()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="api")
+
+    def _backoff(self, attempt):
+        """full jitter 지수 백오프 대기 시간(초)"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def request(self, method, path, json_body=None, headers=None, timeout=None, gzip_body=None):
+        """
+        API 요청을 보낸다. 5xx 와 타임아웃/연결 오류는 max_retries 만큼 재시도한다.
+
+        Returns:
+            requests.Response: 마지막 응답 (재시도 후에도 5xx 면 그 응답을 그대로 반환)
+
+        Raises:
+            requests.RequestException: 재시도 후에도 연결/타임아웃 오류가 계속된 경우
+        """
+        url = f"{self.base_url}{path}"
+        request_headers = dict(headers or {})
+        data = None
+
+        if json_body is not None:
+            data = json.dumps(json_body, ensure_ascii=False).encode("utf-8")
+            request_headers["Content-Type"] = "application/json"
+            if self.gzip_body if gzip_body is None else gzip_body:
+                data = gzip.compress(data)
+                request_headers["Content-Encoding"] = "gzip"
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                res = self.session.request(
+                    method, url,
+                    data=data,
+                    headers=request_headers,
+                    timeout=timeout or self.timeout
+                )
+            except (requests.Timeout, requests.ConnectionError) as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._backoff(attempt)
+                logging.warning(f"⚠️ {method} {path} 요청 오류({type(e).__name__}), {delay:.1f}초 후 재시도")
+                time.sleep(delay)
+                continue
+
+            if res.status_code in RETRY_STATUS_CODES and attempt < self.max_retries:
+                delay = self._backoff(attempt)
+                logging.warning(f"⚠️ {method} {path} → {res.status_code}, {delay:.1f}초 후 재시도")
+                time.sleep(delay)
+                continue
+
+            return res
+
+    def get(self, path, json_body=None, **kwargs):
+        return self.request("GET", path, json_body=json_body, **kwargs)
+
+    def post(self, path, json_body=None, **kwargs):
+        return self.request("POST", path, json_body=json_body, **kwargs)
+
+    def put(self, path, json_body=None, **kwargs):
+        return self.request("PUT", path, json_body=json_body, **kwargs)
+
+    def map_concurrent(self, func, items):
+        """
+        items 각각에 func 를 스레드 풀에서 동시에 적용하고, 입력 순서대로 결과 리스트를 반환한다.
+        func 안에서 다시 map_concurrent 를 호출하지 말 것 (풀 고갈로 교착 가능).
+        """
+        items = list(items)
+        if len(items) <= 1:
+            return [func(item) for item in items]
+        return list(self._executor.map(func, items))
+
+    def map_with_keys(self, func, items, keys=None):
+        """
+        map_concurrent 와 같지만, keys 가 있으면 항목별 Idempotency-Key 헤더를 func(item, headers=...) 로 넘긴다.
+        """
+        if keys is None:
+            return self.map_concurrent(func, items)
+        return self.map_concurrent(
+            lambda pair: func(pair[0], headers=idempotency_headers([pair[1]])),
+            list(zip(items, keys))
+        )
+
+    def post_bulk(self, path, items, fallback, chunk_size=None, keys=None):
+        """
+        items 를 크기 제한이 있는 청크로 나눠 bulk 엔드포인트에 {"items": [...]} 로 전송한다.
+        백엔드가 404/405 를 반환하면 해당 경로를 미지원으로 기억하고, fallback 으로 단건 전송한다.
+
+        Args:
+            path (str): bulk 엔드포인트 경로
+            items (list): 전송할 payload 목록
+            fallback (callable): 단건 전송 함수 (payload, headers=None → bool)
+            chunk_size (int, optional): 요청당 최대 항목 수
+            keys (list, optional): items 와 같은 순서의 항목별 멱등성 키
+
+        Returns:
+            list: 입력 순서와 같은 항목별 성공 여부
+        """
+        items = list(items)
+        if not items:
+            return []
+        if keys is not None:
+            keys = list(keys)
+        if path in self._unsupported_bulk_paths:
+            return self.map_with_keys(fallback, items, keys)
+
+        size = chunk_size or self.bulk_chunk_size
+        results = []
+        for start in range(0, len(items), size):
+            chunk = items[start:start + size]
+            chunk_keys = keys[start:start + size] if keys is not None else None
+            try:
+                res = self.post(path, {"items": chunk}, headers=idempotency_headers(chunk_keys))
+            except requests.RequestException as e:
+                logging.error(f"❌ {path} bulk 전송 오류: {str(e)}")
+                results.extend([False] * len(chunk))
+                continue
+
+            if res.status_code in BULK_UNSUPPORTED_STATUS_CODES:
+                logging.warning(f"⚠️ {path} bulk 엔드포인트 미지원({res.status_code}), 단건 전송으로 전환")
+                self._unsupported_bulk_paths.add(path)
+                rest_keys = keys[start:] if keys is not None else None
+                return results + self.map_with_keys(fallback, items[start:], rest_keys)
+
+            chunk_results = parse_bulk_results(res, len(chunk))
+            if not 200 <= res.status_code < 300:
+                logging.warning(f"⚠️ {path} bulk 전송 실패 → {res.status_code}")
+            results.extend(chunk_results)
+
+        logging.info(f"📦 {path}: {sum(results)}/{len(items)}건 전송 완료")
+        return results
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_api_client():
+    """프로세스 전역 API 클라이언트를 반환한다."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = ApiClient(
+                BASE_API_URL,
+                max_workers=API_MAX_WORKERS,
+                max_retries=API_MAX_RETRIES,
+                timeout=API_TIMEOUT,
+                gzip_body=API_GZIP,
+                bulk_chunk_size=API_BULK_CHUNK_SIZE
+            )
+        return _client
@@ -0,0 +1,179 @@
+# utils/attachment_cache.py
+"""
+내용 주소 기반(content-addressed) 첨부파일 캐시와 추출 텍스트 메모.
+
+- 다운로드 URL 별로 ETag / Last-Modified 와 내용 SHA-256 을 기억한다
+- 재수집 시 조건부 GET 을 보내 304 면 저장된 파일을 그대로 쓴다
+- 원본 파일은 SHA-256 이름으로 한 번만 저장한다 (같은 파일명이 덮어써지지 않음)
+- 정리된 추출 텍스트는 (SHA-256, 추출기 설정 버전) 으로 메모하고, 전체 크기 상한을 넘으면 오래 안 쓴 것부터 지운다 (LRU)
+"""
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import time
+import requests
+from utils.json_store import load_json, save_json
+
+def make_text_key(sha256, extractor_version=""):
+    """
+    추출 텍스트 메모 키. 추출기 설정 버전이 다르면 같은 파일이라도 다른 키가 되어 다시 추출한다.
+    """
+    if not extractor_version:
+        return sha256
+    return hashlib.sha256(f"{sha256}\n{extractor_version}".encode("utf-8")).hexdigest()
+
+class AttachmentCache:
+    def __init__(self, root, session=None, text_cache_bytes=64 * 1024 * 1024):
+        """
+        Args:
+            root (str): 캐시 디렉토리
+            session (requests.Session, optional): 다운로드에 사용할 세션
+            text_cache_bytes (int): 추출 텍스트 메모의 전체 크기 상한(bytes)
+        """
+        self.root = root
+        self.session = session or requests.Session()
+        self.text_cache_bytes = text_cache_bytes
+        self.blob_dir = os.path.join(root, "blobs")
+        self.text_dir = os.path.join(root, "texts")
+        self.index_path = os.path.join(root, "index.json")
+        self._lock = threading.Lock()
+        self._dirty = False
+        os.makedirs(self.blob_dir, exist_ok=True)
+        os.makedirs(self.text_dir, exist_ok=True)
+        self._index = self._load_index()
+
+    def _load_index(self):
+        index = load_json(self.index_path, label="첨부파일 캐시 인덱스")
+        index.setdefault("urls", {})
+        index.setdefault("texts", {})
+        return index
+
+    def _save_index(self):
+        save_json(self.index_path, self._index)
+        self._dirty = False
+
+    def blob_path(self, sha256, name=""):
+        ext = os.path.splitext(name)[1].lower()
+        return os.path.join(self.blob_dir, f"{sha256}{ext}")
+
+    def fetch(self, url, name="", timeout=30):
+        """
+        첨부파일을 캐시에서 찾거나 받아온다.
+
+        Returns:
+            tuple: (파일 경로, SHA-256) — 실패 시 (None, None)
+        """
+        with self._lock:
+            entry = dict(self._index["urls"].get(url) or {})
+
+        headers = {}
+        cached_path = self.blob_path(entry["sha256"], entry.get("name", "")) if entry.get("sha256") else None
+        if cached_path and os.path.exists(cached_path):
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        try:
+            with self.session.get(url, headers=headers, stream=True, allow_redirects=True, timeout=timeout) as res:
+                if res.status_code == 304 and headers:
+                    logging.info(f"💾 첨부파일 변경 없음 (304): {name or url}")
+                    return cached_path, entry["sha256"]
+                if res.status_code != 200:
+                    logging.warning(f"⚠️ 첨부파일 다운로드 실패 → {res.status_code}")
+                    return None, None
+                sha256, tmp_path = self._download(res)
+                etag = res.headers.get("ETag")
+                last_modified = res.headers.get("Last-Modified")
+        except (requests.RequestException, OSError) as e:
+            logging.error(f"❌ 첨부파일 다운로드 오류: {str(e)}")
+            return None, None
+
+        path = self.blob_path(sha256, name)
+        if os.path.exists(path):
+            os.remove(tmp_path)
+        else:
+            os.replace(tmp_path, path)
+
+        with self._lock:
+            self._index["urls"][url] = {
+                "sha256": sha256,
+                "name": name,
+                "etag": etag,
+                "last_modified": last_modified,
+            }
+            self._save_index()
+        logging.info(f"📎 첨부파일 저장: {name or url} → {sha256[:12]}")
+        return path, sha256
+
+    def _download(self, res):
+        digest = hashlib.sha256()
+        fd, tmp_path = tempfile.mkstemp(dir=self.blob_dir, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in res.iter_content(chunk_size=64 * 1024):
+                    f.write(chunk)
+                    digest.update(chunk)
+        except Exception:
+            os.remove(tmp_path)
+            raise
+        return digest.hexdigest(), tmp_path
+
+    def _text_path(self, text_key):
+        return os.path.join(self.text_dir, f"{text_key}.txt")
+
+    def get_text(self, sha256, extractor_version=""):
+        """
+        메모된 추출 텍스트 (없으면 None).
+        사용 시각은 메모리에만 갱신하고, put_text() 나 save() 때 함께 저장한다.
+        """
+        text_key = make_text_key(sha256, extractor_version)
+        with self._lock:
+            meta = self._index["texts"].get(text_key)
+            if meta is None:
+                return None
+            try:
+                with open(self._text_path(text_key), "r", encoding="utf-8") as f:
+                    text = f.read()
+            except OSError:
+                del self._index["texts"][text_key]
+                self._dirty = True
+                return None
+            meta["used"] = time.time()
+            self._dirty = True
+        logging.info(f"💾 추출 텍스트 캐시 사용: {sha256[:12]}")
+        return text
+
+    def put_text(self, sha256, text, extractor_version=""):
+        """추출 텍스트를 메모하고, 크기 상한을 넘으면 오래 안 쓴 텍스트부터 지운다."""
+        data = text.encode("utf-8")
+        if len(data) > self.text_cache_bytes:
+            return
+        text_key = make_text_key(sha256, extractor_version)
+        with self._lock:
+            with open(self._text_path(text_key), "wb") as f:
+                f.write(data)
+            self._index["texts"][text_key] = {"size": len(data), "used": time.time()}
+            self._evict_texts()
+            self._save_index()
+
+    def save(self):
+        """get_text() 로 바뀐 사용 시각 등 아직 저장하지 않은 인덱스 변경을 저장한다."""
+        with self._lock:
+            if self._dirty:
+                self._save_index()
+
+    def _evict_texts(self):
+        texts = self._index["texts"]
+        total = sum(meta["size"] for meta in texts.values())
+        for text_key, meta in sorted(texts.items(), key=lambda item: item[1]["used"]):
+            if total <= self.text_cache_bytes:
+                break
+            try:
+                os.remove(self._text_path(text_key))
+            except OSError:
+                pass
+            total -= meta["size"]
+            del texts[text_key]
@@ -34,4 +34,96 @@ except ValueError as e:
 BASE_API_URL = os.getenv("BASE_API_URL")
 REALTIME_URL = os.getenv("REALTIME_URL")
 MOFA_URL = os.getenv("MOFA_URL")
-CRAWL_INTERVAL_MINUTES = os.getenv("CRAWL_INTERVAL_MINUTES")
\ No newline at end of file
+CRAWL_INTERVAL_MINUTES = os.getenv("CRAWL_INTERVAL_MINUTES")
+
+# 공유 브라우저 풀 설정 (Playwright)
+BROWSER_HEADLESS = os.getenv("BROWSER_HEADLESS", "true").lower() != "false"
+BROWSER_MAX_USES = int(os.getenv("BROWSER_MAX_USES", "50"))  # context 를 이 횟수만큼 내준 뒤 브라우저 재시작
+
+# Finviz 스크리너 수집 방식: auto(HTTP 우선, 실패 시 브라우저) / http / browser
+FINVIZ_FETCH_MODE = os.getenv("FINVIZ_FETCH_MODE", "auto").lower()
+# 야간 스케줄에서 함께 실행할 스크리너 (sources/screener.py 의 SCREENERS 이름, 쉼표 구분)
+NIGHTLY_SCREENERS = [
+    name.strip() for name in os.getenv("NIGHTLY_SCREENERS", "nasdaq_gainers,nasdaq_losers").split(",") if name.strip()
+]
+
+# 백엔드 API 클라이언트 설정 (커넥션 풀 / 동시 전송 / 재시도)
+API_MAX_WORKERS = int(os.getenv("API_MAX_WORKERS", "8"))
+API_MAX_RETRIES = int(os.getenv("API_MAX_RETRIES", "3"))
+API_TIMEOUT = float(os.getenv("API_TIMEOUT", "10"))
+API_GZIP = os.getenv("API_GZIP", "false").lower() == "true"  # 백엔드가 gzip 요청 본문을 지원할 때만 사용
+
+# bulk 엔드포인트 설정 (404/405 응답 시 단건 전송으로 자동 폴백)
+API_BULK_ENABLED = os.getenv("API_BULK_ENABLED", "true").lower() != "false"
+API_BULK_CHUNK_SIZE = int(os.getenv("API_BULK_CHUNK_SIZE", "100"))
+SEARCH_TERMS_BULK_PATH = os.getenv("SEARCH_TERMS_BULK_PATH", "/search-terms/bulk")
+STOCKS_BULK_PATH = os.getenv("STOCKS_BULK_PATH", "/stocks/us/bulk")
+CRAWL_DATA_BULK_PATH = os.getenv("CRAWL_DATA_BULK_PATH", "/crawl-data/bulk")  # url 기준 upsert
+STOCK_MAPPINGS_BULK_PATH = os.getenv("STOCK_MAPPINGS_BULK_PATH", "/stocks/kr-mappings/bulk")
+
+# 스케줄러 실행 방식: concurrent(워커 풀, 기본) / serial(기존 단일 스레드)
+SCHEDULER_MODE = os.getenv("SCHEDULER_MODE", "concurrent").lower()
+SCHEDULER_MAX_WORKERS = int(os.getenv("SCHEDULER_MAX_WORKERS", "4"))
+
+# 실시간 키워드 수집용 Chrome 설정: resident(상주 세션 재사용, 기본) / fresh(매번 새로 실행)
+REALTIME_DRIVER_MODE = os.getenv("REALTIME_DRIVER_MODE", "resident").lower()
+REALTIME_DRIVER_MAX_RUNS = int(os.getenv("REALTIME_DRIVER_MAX_RUNS", "120"))  # 이 횟수만큼 사용 후 재시작
+REALTIME_DRIVER_MAX_RSS_MB = int(os.getenv("REALTIME_DRIVER_MAX_RSS_MB", "1024"))  # Chrome 메모리 상한
+
+# 고정 sleep 대신 사용하는 준비 상태 대기 설정 (상한 시간은 기존 고정 대기 시간과 동일)
+REALTIME_MIN_KEYWORDS = int(os.getenv("REALTIME_MIN_KEYWORDS", "5"))  # 플랫폼별 최소 렌더링 키워드 수
+REALTIME_READY_TIMEOUT = float(os.getenv("REALTIME_READY_TIMEOUT", "5"))
+FINVIZ_MAP_READY_TIMEOUT = float(os.getenv("FINVIZ_MAP_READY_TIMEOUT", "15"))
+
+# 로컬 상태 파일 저장 디렉터리 (키워드 스냅샷 등)
+STATE_DIR = os.getenv("STATE_DIR", "state")
+
+# 실시간 키워드 전송 방식: full(매번 전체) / delta(변경분만) / heartbeat(바뀐 플랫폼만 전체)
+REALTIME_DELIVERY_MODE = os.getenv("REALTIME_DELIVERY_MODE", "delta").lower()
+REALTIME_HEARTBEAT_MINUTES = int(os.getenv("REALTIME_HEARTBEAT_MINUTES", "10"))  # 변경이 없어도 전체 재전송하는 주기
+
+# 로컬 outbox 설정: 스크래퍼는 기록만 하고 백그라운드 flusher 가 묶어서 전송
+OUTBOX_ENABLED = os.getenv("OUTBOX_ENABLED", "true").lower() != "false"
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "100"))
+OUTBOX_FLUSH_INTERVAL = float(os.getenv("OUTBOX_FLUSH_INTERVAL", "5"))  # flush 주기(초)
+OUTBOX_BACKOFF_BASE = float(os.getenv("OUTBOX_BACKOFF_BASE", "2"))     # 실패 시 재시도 대기(초), 실패마다 두 배
+OUTBOX_BACKOFF_MAX = float(os.getenv("OUTBOX_BACKOFF_MAX", "300"))
+
+# 외교부 채용정보 목록 탐색 설정
+MOFA_LIST_MAX_PAGES = int(os.getenv("MOFA_LIST_MAX_PAGES", "3"))
+MOFA_LIST_CONCURRENCY = int(os.getenv("MOFA_LIST_CONCURRENCY", "3"))  # 동시에 요청할 목록 페이지 수
+
+# 첨부파일 캐시: 추출 텍스트 메모 크기 상한(MB), 초과 시 오래 안 쓴 것부터 삭제
+ATTACHMENT_TEXT_CACHE_MB = int(os.getenv("ATTACHMENT_TEXT_CACHE_MB", "64"))
+
+# 첨부파일 텍스트 추출 프로세스 풀 설정
+MOFA_EXTRACT_WORKERS = int(os.getenv("MOFA_EXTRACT_WORKERS", str(os.cpu_count() or 2)))
+MOFA_EXTRACT_TIMEOUT = float(os.getenv("MOFA_EXTRACT_TIMEOUT", "120"))  # 문서별 제한 시간(초), 초과 시 변환기까지 종료
+
+# 스트리밍 OCR 설정 (페이지 창 단위 렌더링 + 병렬 Tesseract)
+OCR_DPI = int(os.getenv("OCR_DPI", "200"))
+OCR_WINDOW_PAGES = int(os.getenv("OCR_WINDOW_PAGES", "4"))  # 한 번에 메모리에 올리는 최대 페이지 수
+OCR_WORKERS = int(os.getenv("OCR_WORKERS", str(os.cpu_count() or 2)))
+
+# LibreOffice 변환 설정: resident(상주 리스너, python3-uno 필요) / cold(파일마다 soffice 실행)
+OFFICE_CONVERTER_MODE = os.getenv("OFFICE_CONVERTER_MODE", "resident").lower()
+OFFICE_LISTENERS = int(os.getenv("OFFICE_LISTENERS", "2"))  # 상주 리스너 수
+OFFICE_BASE_PORT = int(os.getenv("OFFICE_BASE_PORT", "2002"))  # 리스너 포트 시작값 (리스너마다 +1)
+OFFICE_CONVERT_TIMEOUT = float(os.getenv("OFFICE_CONVERT_TIMEOUT", "60"))
+
+# HWP 텍스트 추출 백엔드: auto(레코드 스트림 직접 읽기, 실패 시 hwp5html) / inprocess / hwp5html
+HWP_TEXT_BACKEND = os.getenv("HWP_TEXT_BACKEND", "auto").lower()
+
+# 첨부파일 추출 텍스트 최대 글자 수 (0 이면 제한 없음)
+MOFA_CONTENT_MAX_CHARS = int(os.getenv("MOFA_CONTENT_MAX_CHARS", "0"))
+
+# GPT 국내 종목 매핑 엔진 설정
+MAPPING_MODEL = os.getenv("MAPPING_MODEL", "gpt-4o-mini")
+MAPPING_TEMPERATURE = float(os.getenv("MAPPING_TEMPERATURE", "0.4"))
+MAPPING_CONCURRENCY = int(os.getenv("MAPPING_CONCURRENCY", "8"))    # 동시에 진행할 GPT 요청 수
+MAPPING_RPM = int(os.getenv("MAPPING_RPM", "500"))                  # 분당 요청 수 상한 (0: 제한 없음)
+MAPPING_TPM = int(os.getenv("MAPPING_TPM", "200000"))               # 분당 토큰 수 상한 (0: 제한 없음)
+MAPPING_MAX_RETRIES = int(os.getenv("MAPPING_MAX_RETRIES", "5"))    # 429/5xx/연결 오류 재시도 횟수
+MAPPING_COMPLETION_TOKENS = int(os.getenv("MAPPING_COMPLETION_TOKENS", "2500"))  # 응답 토큰 예상치 (TPM 계산용)
+MAPPING_CACHE_TTL_DAYS = float(os.getenv("MAPPING_CACHE_TTL_DAYS", "30"))  # GPT 매핑 응답 캐시 유효 기간 (0: 캐시 사용 안 함)
+MAPPING_BATCH_SIZE = int(os.getenv("MAPPING_BATCH_SIZE", "5"))      # 요청 하나에 묶어 물어볼 종목 수 (1: 종목별 단건 요청)
@@ -0,0 +1,38 @@
+# utils/crawl_hash_store.py
+"""
+크롤링 게시글(URL)별 마지막 전송 내용 해시.
+
+제목과 본문의 SHA-256 을 URL 별로 기억해 두고, 다음 실행에서 내용이 그대로인 게시글은
+백엔드로 다시 보내지 않는다. 해시는 전송에 성공한 항목만 갱신한다.
+"""
+import hashlib
+import threading
+from utils.json_store import load_json, save_json
+
+def content_hash(payload):
+    """게시글 payload 의 제목과 본문으로 만든 SHA-256"""
+    title = payload.get("title") or ""
+    content = payload.get("content") or ""
+    return hashlib.sha256(f"{title}\0{content}".encode("utf-8")).hexdigest()
+
+class CrawlHashStore:
+    def __init__(self, path):
+        """
+        Args:
+            path (str): 해시를 저장할 JSON 파일 경로
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._hashes = load_json(path, label="크롤링 해시")
+
+    def is_unchanged(self, url, digest):
+        with self._lock:
+            return self._hashes.get(url) == digest
+
+    def update(self, entries):
+        """전송에 성공한 [(url, 해시)] 를 저장한다."""
+        if not entries:
+            return
+        with self._lock:
+            self._hashes.update(entries)
+            save_json(self.path, self._hashes)
@@ -0,0 +1,117 @@
+# utils/extraction_engine.py
+"""
+문서(HWP/PDF) 텍스트 추출을 여러 프로세스로 나눠 실행하는 엔진.
+
+- 동시에 실행하는 작업 수를 max_workers 로 제한한다
+- 작업마다 별도 프로세스(새 프로세스 그룹)에서 실행하므로, 제한 시간을 넘기면
+  작업 프로세스와 그 자식(hwp5html, soffice, tesseract 등)을 함께 종료할 수 있다
+- 결과는 끝난 순서대로 돌려준다
+"""
+import logging
+import multiprocessing
+import os
+import time
+from collections import deque
+from multiprocessing.connection import wait
+from utils.process_utils import kill_process_group
+
+def _task_entry(func, args, conn, env=None):
+    """작업 프로세스 진입점. 타임아웃 시 변환기 자식 프로세스까지 종료할 수 있도록 새 프로세스 그룹을 만든다."""
+    if hasattr(os, "setpgrp"):
+        os.setpgrp()
+    if env:
+        # 작업 프로세스(와 그 자식)에만 적용되는 환경 변수 — 부모 프로세스 환경은 바꾸지 않는다
+        os.environ.update(env)
+    try:
+        conn.send(("ok", func(*args)))
+    except Exception as e:
+        conn.send(("error", f"{type(e).__name__}: {str(e)}"))
+    finally:
+        conn.close()
+
+def _default_context():
+    # 스레드가 도는 스케줄러 프로세스에서 fork 하지 않도록 forkserver(없으면 spawn) 사용
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+class ExtractionEngine:
+    def __init__(self, max_workers=None, timeout=120, mp_context=None, env=None):
+        """
+        Args:
+            max_workers (int, optional): 동시에 실행할 작업 프로세스 수 (기본값: CPU 수)
+            timeout (float): 작업별 제한 시간(초)
+            mp_context: multiprocessing 컨텍스트 (기본값: forkserver, 없으면 spawn)
+            env (dict, optional): 작업 프로세스에만 추가할 환경 변수 (예: TESSERACT_ENV)
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.mp_context = mp_context or _default_context()
+        self.env = env
+
+    def _start(self, key, func, args):
+        reader, writer = self.mp_context.Pipe(duplex=False)
+        proc = self.mp_context.Process(
+            target=_task_entry,
+            args=(func, args, writer, self.env),
+            name=f"extract-{key}",
+            daemon=True
+        )
+        proc.start()
+        writer.close()
+        return {"key": key, "proc": proc, "conn": reader, "deadline": time.monotonic() + self.timeout}
+
+    def _finish(self, task):
+        """끝난(또는 연결이 닫힌) 작업의 결과를 읽는다."""
+        try:
+            status, value = task["conn"].recv()
+        except (EOFError, OSError):
+            status, value = "error", "작업 프로세스가 결과 없이 종료됨"
+        finally:
+            task["conn"].close()
+        task["proc"].join(5)
+        if task["proc"].is_alive():
+            kill_process_group(task["proc"])
+        if status == "ok":
+            return task["key"], value, None
+        return task["key"], None, value
+
+    def run(self, tasks):
+        """
+        작업을 실행하고 끝난 순서대로 결과를 내보낸다.
+
+        Args:
+            tasks (iterable): (key, func, args) 목록. func 는 모듈 최상위 함수여야 한다.
+
+        Yields:
+            tuple: (key, 결과, 오류 메시지) — 성공 시 오류 메시지는 None, 실패/시간 초과 시 결과는 None
+        """
+        queue = deque(tasks)
+        running = {}
+
+        try:
+            while queue or running:
+                while queue and len(running) < self.max_workers:
+                    key, func, args = queue.popleft()
+                    task = self._start(key, func, args)
+                    running[task["conn"]] = task
+
+                now = time.monotonic()
+                next_deadline = min(task["deadline"] for task in running.values())
+                ready = wait(list(running), timeout=max(0, next_deadline - now))
+
+                for conn in ready:
+                    yield self._finish(running.pop(conn))
+
+                now = time.monotonic()
+                for conn, task in list(running.items()):
+                    if task["deadline"] <= now:
+                        running.pop(conn)
+                        logging.error(f"⏰ [{task['key']}] 추출 제한 시간 {self.timeout}초 초과, 프로세스를 종료합니다")
+                        kill_process_group(task["proc"])
+                        conn.close()
+                        yield task["key"], None, f"{self.timeout}초 제한 시간 초과"
+        finally:
+            # 소비 측이 중간에 멈춰도 남은 작업 프로세스를 남기지 않는다
+            for task in running.values():
+                kill_process_group(task["proc"])
+                task["conn"].close()
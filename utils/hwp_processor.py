@@ -1,43 +1,191 @@
+"""
+HWP 본문 텍스트 추출 백엔드.
+
+- inprocess: pyhwp(hwp5 모듈)로 BodyText 레코드 스트림을 읽어 문단 텍스트(HWPTAG_PARA_TEXT)만 바로 디코딩한다.
+  XHTML 변환/임시 파일/HTML 파싱 없이 문단 단위로 스트리밍한다.
+- hwp5html: hwp5html 을 실행해 XHTML 로 변환한 뒤 텍스트를 읽는다 (기존 경로).
+- auto: inprocess 로 시도하고, 실패하거나 텍스트가 비어 있으면 hwp5html 로 폴백한다.
+
+iter_hwp_text_chunks 는 같은 백엔드를 청크 단위로 내보내, 정리기가 전체 텍스트를 모으지 않고 처리하게 한다.
+"""
 import os
-from pyhwp import HwpFile
+import re
+import subprocess
+import tempfile
+from contextlib import closing
+from bs4 import BeautifulSoup
+from utils.config import HWP_TEXT_BACKEND
+
+try:
+    from hwp5.filestructure import Hwp5File
+    from hwp5.recordstream import read_records
+    HWP5_AVAILABLE = True
+except ImportError:
+    HWP5_AVAILABLE = False
+
+HWPTAG_PARA_TEXT = 16 + 51
+
+# 문단 텍스트 안의 제어 문자 (hwp5.binmodel.controlchar 기준)
+# 인라인/확장 제어 문자는 제어 문자를 포함해 8 글자(16 bytes)를 차지한다
+_INLINE_CONTROLS = {0x04, 0x05, 0x06, 0x07, 0x08, 0x09, 0x13, 0x14}
+_EXTENDED_CONTROLS = {0x01, 0x02, 0x03, 0x0b, 0x0c, 0x0e, 0x0f, 0x10, 0x11, 0x12, 0x15, 0x16, 0x17}
+_CONTROL_TEXT = {0x09: "\t", 0x0a: "\n", 0x18: "-", 0x1e: " ", 0x1f: " "}
+_CONTROL_RE = re.compile(rb"[\x00-\x1f]\x00")
+
+def decode_para_text(payload):
+    """
+    HWPTAG_PARA_TEXT 레코드(UTF-16LE)를 문자열로 바꾼다.
+    탭/줄바꿈/특수 공백은 대응하는 문자로 바꾸고, 표·그림 등 개체 제어 문자는 건너뛴다.
+    """
+    parts = []
+    start = pos = 0
+    while True:
+        match = _CONTROL_RE.search(payload, pos)
+        if match is None:
+            break
+        index = match.start()
+        if index % 2:
+            # 글자 경계가 아닌 곳(앞 글자의 상위 바이트)에서 찾은 경우
+            pos = index + 1
+            continue
+        if index > start:
+            parts.append(payload[start:index].decode("utf-16-le", "replace"))
+        code = payload[index]
+        parts.append(_CONTROL_TEXT.get(code, ""))
+        width = 16 if code in _INLINE_CONTROLS or code in _EXTENDED_CONTROLS else 2
+        start = pos = index + width
+    if start < len(payload):
+        parts.append(payload[start:].decode("utf-16-le", "replace"))
+    return "".join(parts)
+
+def iter_paragraph_texts(hwp_path):
+    """
+    HWP 파일의 문단 텍스트를 본문 순서대로 내보낸다 (표 안의 문단 포함).
+    배포용 문서는 ViewText 를 읽는다.
+    """
+    with closing(Hwp5File(hwp_path)) as hwp:
+        sections = hwp.text
+        for index in sections.section_indexes():
+            with closing(sections.section(index).open()) as stream:
+                for record in read_records(stream):
+                    if record["tagid"] == HWPTAG_PARA_TEXT:
+                        yield decode_para_text(record["payload"])
+
+def extract_text_inprocess(hwp_path):
+    """레코드 스트림에서 직접 텍스트 추출"""
+    if not HWP5_AVAILABLE:
+        print("pyhwp(hwp5) is not installed")
+        return None
+    try:
+        return "\n".join(iter_paragraph_texts(hwp_path))
+    except Exception as e:
+        print(f"Error reading HWP records {hwp_path}: {str(e)}")
+        return None
+
+def extract_text_from_hwp_html(hwp_path):
+    """HWP 파일을 HTML로 변환하고 텍스트 추출"""
+    try:
+        # 임시 디렉토리 생성
+        with tempfile.TemporaryDirectory() as temp_dir:
+            # HWP를 HTML로 변환
+            cmd = ["hwp5html", "--output", temp_dir, hwp_path]
+
+            result = subprocess.run(cmd, capture_output=True, text=True)
+            if result.returncode != 0:
+                print(f"Error converting HWP to HTML: {result.stderr}")
+                return None
+
+            # HTML 파일 읽기
+            html_path = os.path.join(temp_dir, "index.xhtml")
+            if os.path.exists(html_path):
+                with open(html_path, 'r', encoding='utf-8') as f:
+                    html_content = f.read()
+
+                # HTML에서 텍스트 추출
+                soup = BeautifulSoup(html_content, 'html.parser')
+                return soup.get_text()
+            else:
+                print(f"HTML file not found at {html_path}")
+                return None
 
-def extract_text_from_hwp(hwp_path):
+    except Exception as e:
+        print(f"Error processing HWP file: {str(e)}")
+        return None
+
+BACKENDS = {
+    "inprocess": extract_text_inprocess,
+    "hwp5html": extract_text_from_hwp_html,
+}
+
+def extract_text_from_hwp(hwp_path, backend=None):
     """
     Extract text content from a HWP file.
-    
+
     Args:
         hwp_path (str): Path to the HWP file
-        
+        backend (str, optional): "auto" / "inprocess" / "hwp5html" (기본값: HWP_TEXT_BACKEND)
+
     Returns:
         str: Extracted text content
     """
-    try:
-        hwp = HwpFile(hwp_path)
-        text = hwp.text
-        hwp.close()
+    backend = backend or HWP_TEXT_BACKEND
+    if backend != "auto":
+        return BACKENDS[backend](hwp_path)
+
+    text = extract_text_inprocess(hwp_path)
+    if text and text.strip():
         return text
-    except Exception as e:
-        print(f"Error processing HWP file {hwp_path}: {str(e)}")
-        return None
+    print(f"Falling back to hwp5html: {hwp_path}")
+    return extract_text_from_hwp_html(hwp_path)
+
+def iter_hwp_text_chunks(hwp_path, backend=None):
+    """
+    HWP 텍스트를 청크 단위로 내보낸다 (normalize_text 에 바로 넘기는 용도).
+    inprocess 는 문단마다(줄바꿈 포함), hwp5html 은 변환이 끝난 뒤 한 번에 내보낸다.
+    auto 는 inprocess 가 내용을 내보내기 전에 실패하거나 빈 문서일 때만 hwp5html 로 폴백한다.
+
+    Args:
+        hwp_path (str): Path to the HWP file
+        backend (str, optional): "auto" / "inprocess" / "hwp5html" (기본값: HWP_TEXT_BACKEND)
+    """
+    backend = backend or HWP_TEXT_BACKEND
+    if backend in ("auto", "inprocess"):
+        produced = False
+        if not HWP5_AVAILABLE:
+            print("pyhwp(hwp5) is not installed")
+        else:
+            try:
+                for text in iter_paragraph_texts(hwp_path):
+                    produced = produced or bool(text.strip())
+                    yield text + "\n"
+            except Exception as e:
+                print(f"Error reading HWP records {hwp_path}: {str(e)}")
+        if produced or backend == "inprocess":
+            return
+        print(f"Falling back to hwp5html: {hwp_path}")
+
+    text = extract_text_from_hwp_html(hwp_path)
+    if text:
+        yield text
 
 def process_hwp_file(hwp_path, output_path=None):
     """
     Process a HWP file and optionally save the extracted text to a file.
-    
+
     Args:
         hwp_path (str): Path to the HWP file
         output_path (str, optional): Path to save the extracted text
-        
+
     Returns:
         str: Extracted text content
     """
     text = extract_text_from_hwp(hwp_path)
-    
+
     if text and output_path:
         try:
             with open(output_path, 'w', encoding='utf-8') as f:
                 f.write(text)
         except Exception as e:
             print(f"Error saving text to {output_path}: {str(e)}")
-    
-    return text 
\ No newline at end of file
+
+    return text
@@ -0,0 +1,37 @@
+# utils/json_store.py
+"""
+작은 상태 파일(JSON)을 읽고 쓰는 공용 함수.
+
+- 읽기: 파일이 없거나 깨졌으면 경고만 남기고 기본값으로 새로 시작한다
+- 쓰기: 임시 파일에 쓴 뒤 os.replace 로 바꿔, 중간에 죽어도 반쯤 쓰인 파일이 남지 않는다
+"""
+import json
+import logging
+import os
+
+def load_json(path, default=dict, label="상태 파일"):
+    """
+    Args:
+        path (str): JSON 파일 경로
+        default (callable): 파일이 없거나 읽지 못했을 때 쓸 값을 만드는 함수
+        label (str): 로드 실패 경고에 쓸 이름
+
+    Returns:
+        읽은 값, 또는 default()
+    """
+    if not path or not os.path.exists(path):
+        return default()
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logging.warning(f"⚠️ {label} 로드 실패, 새로 시작합니다: {str(e)}")
+        return default()
+
+def save_json(path, data):
+    """data 를 path 에 원자적으로 저장한다."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
@@ -0,0 +1,85 @@
+# utils/json_stream.py
+"""
+스트리밍으로 들어오는 JSON 텍스트에서 배열 원소를 완성되는 대로 꺼내는 증분 파서.
+
+응답 전체를 기다리지 않고, 처음 나오는 JSON 배열(최상위 배열이든 {"results": [...]} 안의 배열이든)의
+객체/배열 원소가 닫히는 즉시 json.loads 해 돌려준다.
+코드 블록 표시(```json) 같은 배열 바깥의 텍스트는 무시하고, 문자열 안의 괄호는 세지 않는다.
+"""
+import json
+import logging
+
+class JsonArrayStream:
+    def __init__(self):
+        self._in_array = False     # 대상 배열 안인지
+        self._closed = False       # 대상 배열이 닫혔는지
+        self._in_string = False
+        self._escape = False
+        self._element = None       # 만들고 있는 원소 텍스트 조각
+        self._element_depth = 0
+        self.malformed = 0         # 파싱에 실패한 원소 수
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def feed(self, text):
+        """
+        텍스트 조각을 넣고, 이번에 완성된 원소 목록을 반환한다.
+
+        Returns:
+            list: 파싱된 원소 (객체/배열) 목록
+        """
+        completed = []
+        element = self._element
+        for ch in text:
+            if self._closed:
+                break
+
+            if self._in_string:
+                if element is not None:
+                    element.append(ch)
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                if element is not None:
+                    element.append(ch)
+                continue
+
+            if not self._in_array:
+                if ch == "[":
+                    self._in_array = True
+                continue
+
+            if element is None:
+                # 원소 사이 (쉼표, 공백) 또는 배열 끝
+                if ch in "{[":
+                    element = [ch]
+                    self._element_depth = 1
+                elif ch == "]":
+                    self._closed = True
+                continue
+
+            element.append(ch)
+            if ch in "{[":
+                self._element_depth += 1
+            elif ch in "}]":
+                self._element_depth -= 1
+                if self._element_depth == 0:
+                    raw = "".join(element)
+                    element = None
+                    try:
+                        completed.append(json.loads(raw))
+                    except json.JSONDecodeError as e:
+                        self.malformed += 1
+                        logging.warning(f"⚠️ 스트리밍 JSON 원소 파싱 실패: {str(e)}")
+
+        self._element = element
+        return completed
@@ -0,0 +1,125 @@
+# utils/keyword_snapshot.py
+"""
+실시간 키워드의 플랫폼별 마지막 전송 스냅샷과 변경 감지.
+
+매 분 수집한 순위를 마지막으로 전송한 순위와 비교해
+신규 진입(new) / 순위 변동(moved) / 이탈(dropped)을 구분하고,
+전송 모드에 따라 실제로 보낼 항목만 골라낸다.
+
+    full      : 매번 전체 순위 전송 (기존 방식)
+    delta     : 신규 진입 + 순위 변동 항목만 전송
+    heartbeat : 순위가 바뀐 플랫폼만 전체 전송
+
+delta / heartbeat 모드에서도 heartbeat_minutes 가 지나면 플랫폼 전체 순위를 다시 보내
+백엔드와 어긋난 상태가 오래 남지 않게 한다.
+"""
+import threading
+from datetime import datetime, timedelta
+from utils.json_store import load_json, save_json
+
+FULL = "full"
+DELTA = "delta"
+HEARTBEAT = "heartbeat"
+
+def diff_keywords(previous, current):
+    """
+    두 순위 목록을 비교한다.
+
+    Returns:
+        dict: {
+            "new": [(rank, keyword)],            # 새로 진입한 키워드
+            "moved": [(rank, keyword, old_rank)], # 순위가 바뀐 키워드
+            "dropped": [(old_rank, keyword)]      # 순위에서 빠진 키워드
+        }
+    """
+    old_ranks = {keyword: rank for rank, keyword in enumerate(previous or [], start=1)}
+    new_ranks = {keyword: rank for rank, keyword in enumerate(current, start=1)}
+
+    diff = {"new": [], "moved": [], "dropped": []}
+    for keyword, rank in new_ranks.items():
+        old_rank = old_ranks.get(keyword)
+        if old_rank is None:
+            diff["new"].append((rank, keyword))
+        elif old_rank != rank:
+            diff["moved"].append((rank, keyword, old_rank))
+    for keyword, old_rank in old_ranks.items():
+        if keyword not in new_ranks:
+            diff["dropped"].append((old_rank, keyword))
+    return diff
+
+def has_changes(diff):
+    return any(diff.values())
+
+class KeywordSnapshotStore:
+    def __init__(self, path):
+        """
+        Args:
+            path (str): 스냅샷을 저장할 JSON 파일 경로
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._snapshots = load_json(path, label="키워드 스냅샷")
+
+    def get(self, platform):
+        """플랫폼의 마지막 전송 스냅샷 ({"keywords": [...], "fullSentAt": iso}) 또는 None"""
+        with self._lock:
+            return self._snapshots.get(platform)
+
+    def update(self, platform, keywords, full_sent):
+        """전송에 성공한 순위를 저장한다. full_sent 면 전체 전송 시각도 갱신한다."""
+        with self._lock:
+            snapshot = self._snapshots.get(platform, {})
+            snapshot["keywords"] = list(keywords)
+            if full_sent or "fullSentAt" not in snapshot:
+                snapshot["fullSentAt"] = datetime.now().isoformat()
+            self._snapshots[platform] = snapshot
+            save_json(self.path, self._snapshots)
+
+def _heartbeat_due(snapshot, heartbeat_minutes, now):
+    if not heartbeat_minutes or heartbeat_minutes <= 0:
+        return False
+    full_sent_at = snapshot.get("fullSentAt")
+    if not full_sent_at:
+        return True
+    return now - datetime.fromisoformat(full_sent_at) >= timedelta(minutes=heartbeat_minutes)
+
+def plan_delivery(store, result, mode=FULL, heartbeat_minutes=0, now=None):
+    """
+    수집 결과에서 이번에 전송할 항목을 고른다.
+
+    Args:
+        store (KeywordSnapshotStore): 마지막 전송 스냅샷 저장소
+        result (dict): {platform: [keyword, ...]} 이번 수집 결과
+        mode (str): full / delta / heartbeat
+        heartbeat_minutes (int): 이 시간이 지나면 변경이 없어도 전체 순위를 다시 전송
+
+    Returns:
+        dict: {platform: {"entries": [(rank, keyword)], "full": bool, "diff": dict}}
+              전송할 항목이 없는 플랫폼은 포함되지 않는다.
+    """
+    if mode not in (FULL, DELTA, HEARTBEAT):
+        raise ValueError(f"알 수 없는 전송 모드: {mode}")
+    now = now or datetime.now()
+    plan = {}
+
+    for platform, keywords in result.items():
+        snapshot = store.get(platform)
+        full_entries = list(enumerate(keywords, start=1))
+
+        if mode == FULL or snapshot is None:
+            diff = diff_keywords(snapshot["keywords"] if snapshot else [], keywords)
+            plan[platform] = {"entries": full_entries, "full": True, "diff": diff}
+            continue
+
+        diff = diff_keywords(snapshot.get("keywords"), keywords)
+        if _heartbeat_due(snapshot, heartbeat_minutes, now):
+            plan[platform] = {"entries": full_entries, "full": True, "diff": diff}
+        elif not has_changes(diff):
+            continue
+        elif mode == HEARTBEAT:
+            plan[platform] = {"entries": full_entries, "full": True, "diff": diff}
+        else:
+            entries = sorted(diff["new"] + [(rank, keyword) for rank, keyword, _ in diff["moved"]])
+            plan[platform] = {"entries": entries, "full": False, "diff": diff}
+
+    return plan
@@ -0,0 +1,119 @@
+# utils/mapping_cache.py
+"""
+GPT 국내 종목 매핑 응답의 디스크 캐시 (SQLite).
+
+- (미국 종목 심볼, 회사명, 모델, 프롬프트 템플릿 해시) 를 키로 파싱된 매핑 목록을 저장한다
+  → 프롬프트를 고치거나 모델을 바꾸면 키가 달라져 자연스럽게 다시 요청한다
+- ttl 이 지난 항목은 없는 것으로 본다
+- 백엔드 저장 성공 여부(saved_at)를 함께 기록해, GPT 응답은 받았지만 저장에 실패한 종목은
+  다음 실행에서 GPT 를 다시 부르지 않고 저장만 다시 시도할 수 있게 한다
+- invalidate(심볼 목록) / invalidate() 로 수동 무효화
+"""
+import hashlib
+import json
+import logging
+import threading
+import time
+from utils.sqlite_store import connect_sqlite
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS mapping_cache (
+    cache_key TEXT PRIMARY KEY,
+    symbol TEXT NOT NULL,
+    name TEXT NOT NULL,
+    model TEXT NOT NULL,
+    prompt_version TEXT NOT NULL,
+    response TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    saved_at REAL
+);
+CREATE INDEX IF NOT EXISTS mapping_cache_symbol ON mapping_cache (symbol);
+"""
+
+def make_cache_key(symbol, name, model, prompt_version):
+    return hashlib.sha256(f"{symbol}\n{name}\n{model}\n{prompt_version}".encode("utf-8")).hexdigest()
+
+class MappingCache:
+    def __init__(self, path, ttl_seconds=30 * 24 * 3600):
+        """
+        Args:
+            path (str): SQLite 파일 경로
+            ttl_seconds (float): 캐시 유효 기간(초)
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+
+        self._conn = connect_sqlite(path, _SCHEMA)
+
+    def get(self, symbol, name, model, prompt_version):
+        """
+        유효한 캐시 항목을 찾는다.
+
+        Returns:
+            dict: {"mapping": 매핑 목록, "saved": 백엔드 저장 완료 여부} — 없거나 만료됐으면 None
+        """
+        key = make_cache_key(symbol, name, model, prompt_version)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, saved_at FROM mapping_cache WHERE cache_key = ? AND created_at >= ?",
+                (key, time.time() - self.ttl_seconds)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"mapping": json.loads(row[0]), "saved": row[1] is not None}
+
+    def put(self, symbol, name, model, prompt_version, mapping):
+        """GPT 응답(파싱된 매핑 목록)을 저장한다. 저장 완료 표시는 mark_saved 로 따로 남긴다."""
+        key = make_cache_key(symbol, name, model, prompt_version)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO mapping_cache "
+                "(cache_key, symbol, name, model, prompt_version, response, created_at, saved_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, NULL)",
+                (key, symbol, name, model, prompt_version, json.dumps(mapping, ensure_ascii=False), time.time())
+            )
+
+    def mark_saved(self, symbol, name, model, prompt_version):
+        key = make_cache_key(symbol, name, model, prompt_version)
+        with self._lock:
+            self._conn.execute(
+                "UPDATE mapping_cache SET saved_at = ? WHERE cache_key = ?", (time.time(), key)
+            )
+
+    def invalidate(self, symbols=None):
+        """
+        캐시를 지운다.
+
+        Args:
+            symbols (list, optional): 지울 심볼 목록 (없으면 전체)
+
+        Returns:
+            int: 지운 항목 수
+        """
+        with self._lock:
+            if symbols is None:
+                cursor = self._conn.execute("DELETE FROM mapping_cache")
+            else:
+                symbols = list(symbols)
+                if not symbols:
+                    return 0
+                placeholders = ",".join("?" * len(symbols))
+                cursor = self._conn.execute(
+                    f"DELETE FROM mapping_cache WHERE symbol IN ({placeholders})", symbols
+                )
+            removed = cursor.rowcount
+        logging.info(f"🗑️ GPT 매핑 캐시 {removed}건 무효화")
+        return removed
+
+    def prune(self):
+        """만료된 항목을 지운다."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM mapping_cache WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+            )
+            return cursor.rowcount
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
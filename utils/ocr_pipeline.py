@@ -0,0 +1,60 @@
+# utils/ocr_pipeline.py
+"""
+PDF 를 페이지 창 단위로 렌더링해 병렬 OCR 하는 파이프라인.
+
+- 전체 PDF 를 한 번에 메모리에 올리지 않고 window 페이지씩 렌더링한다
+- 중간 PNG 파일 없이 메모리 이미지(그레이스케일, 지정 DPI)를 바로 Tesseract 에 넘긴다
+- 창 안의 페이지는 스레드 풀에서 동시에 OCR 한다 (pytesseract 는 tesseract 프로세스를 띄우므로 GIL 영향 없음)
+- 결과는 페이지 순서대로 내보낸다 (iter_ocr_pages) — 정리기에 바로 넘기면 글자 수 상한에서 OCR 을 멈출 수 있다
+"""
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pdf2image import convert_from_path, pdfinfo_from_path
+import pytesseract
+
+# 페이지 단위로 병렬화하므로 Tesseract 내부 멀티스레딩은 끈다 (코어 과다 점유 방지).
+# pytesseract 는 호출 프로세스의 환경을 그대로 넘기므로, OCR 을 돌리는 작업 프로세스에만 적용한다
+# (예: ExtractionEngine(env=TESSERACT_ENV)) — 현재 프로세스 환경은 바꾸지 않는다.
+TESSERACT_ENV = {"OMP_THREAD_LIMIT": "1"}
+
+def _ocr_page(image, lang):
+    try:
+        return pytesseract.image_to_string(image, lang=lang)
+    finally:
+        image.close()
+
+def iter_ocr_pages(pdf_path, dpi=200, window=4, workers=None, lang="kor+eng"):
+    """
+    PDF 페이지를 OCR 해 페이지 순서대로 텍스트를 내보낸다.
+    소비 측이 중간에 멈추면(제너레이터 close) 다음 창은 렌더링하지 않는다.
+
+    Args:
+        pdf_path (str): PDF 경로
+        dpi (int): 렌더링 DPI
+        window (int): 한 번에 메모리에 올리는 최대 페이지 수
+        workers (int, optional): 동시에 실행할 Tesseract 수 (기본값: CPU 수, window 를 넘지 않음)
+        lang (str): Tesseract 언어
+
+    Yields:
+        str: 페이지별 텍스트
+    """
+    window = max(1, window)
+    # 창 크기가 메모리 상한이므로, 창보다 많은 워커는 놀기만 한다
+    workers = min(workers or os.cpu_count() or 1, window)
+
+    page_count = pdfinfo_from_path(pdf_path)["Pages"]
+    logging.info(f"🔠 OCR 시작: {page_count}페이지 (DPI {dpi}, 창 {window}, 동시 {workers})")
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ocr") as pool:
+        for first in range(1, page_count + 1, window):
+            last = min(first + window - 1, page_count)
+            images = convert_from_path(pdf_path, dpi=dpi, first_page=first, last_page=last, grayscale=True)
+            # map 은 입력 순서대로 결과를 돌려주므로 페이지 순서가 유지된다
+            texts = list(pool.map(lambda image: _ocr_page(image, lang), images))
+            del images
+            yield from texts
+
+def ocr_pdf(pdf_path, dpi=200, window=4, workers=None, lang="kor+eng"):
+    """PDF 의 모든 페이지를 OCR 해 페이지 순서대로 이어 붙인 텍스트를 반환한다 (인자는 iter_ocr_pages 와 같음)."""
+    return "\n".join(iter_ocr_pages(pdf_path, dpi, window, workers, lang))
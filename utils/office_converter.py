@@ -0,0 +1,365 @@
+# utils/office_converter.py
+"""
+LibreOffice 문서 → PDF 변환.
+
+- 상주(resident): headless LibreOffice 리스너를 여러 개 띄워 두고 UNO 소켓으로 변환을 보낸다.
+  인스턴스마다 사용자 프로필을 분리하고, 리스너별 파일 잠금으로 요청을 줄 세운다(다른 프로세스 포함).
+  변환이 제한 시간을 넘기면 해당 리스너를 종료하고, 풀은 주기적으로 UNO 왕복으로 상태를 확인해
+  죽었거나 응답하지 않는 리스너를 재시작한다. 풀은 프로세스 전역으로 하나만 띄워 둔다.
+- 단발(cold): 파일마다 soffice --convert-to pdf 를 실행한다. 동시 실행 시 프로필이 충돌하지 않도록
+  실행마다 별도 UserInstallation 을 사용한다. UNO(python3-uno)나 파일 잠금(fcntl)이 없거나 리스너 변환이 실패하면 이 경로로 폴백한다.
+"""
+import atexit
+import logging
+import os
+import shutil
+import signal
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+from utils.config import OFFICE_LISTENERS, OFFICE_BASE_PORT, STATE_DIR
+
+try:
+    import uno
+    from com.sun.star.beans import PropertyValue
+    UNO_AVAILABLE = True
+except ImportError:
+    UNO_AVAILABLE = False
+
+try:
+    import fcntl  # 리스너별 파일 잠금 (POSIX 전용)
+except ImportError:
+    fcntl = None
+
+# 상주 리스너 경로는 UNO 와 파일 잠금이 모두 있어야 쓸 수 있다 (없으면 단발 변환만 사용)
+RESIDENT_AVAILABLE = UNO_AVAILABLE and fcntl is not None
+
+SOFFICE_BINARY = "soffice"
+
+# 문서 종류별 PDF 내보내기 필터
+_PDF_FILTERS = (
+    ("com.sun.star.text.TextDocument", "writer_pdf_Export"),
+    ("com.sun.star.sheet.SpreadsheetDocument", "calc_pdf_Export"),
+    ("com.sun.star.presentation.PresentationDocument", "impress_pdf_Export"),
+    ("com.sun.star.drawing.DrawingDocument", "draw_pdf_Export"),
+)
+
+def _pdf_path(path, output_dir):
+    base_name = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(output_dir, f"{base_name}.pdf")
+
+def convert_to_pdf_cold(path, output_dir, timeout=60):
+    """soffice 를 새로 실행해 변환한다. 실행마다 임시 프로필을 써서 동시 실행 충돌을 막는다."""
+    os.makedirs(output_dir, exist_ok=True)
+    profile_dir = tempfile.mkdtemp(prefix="lo-profile-")
+    cmd = [
+        SOFFICE_BINARY,
+        f"-env:UserInstallation=file://{profile_dir}",
+        "--headless",
+        "--convert-to", "pdf",
+        "--outdir", output_dir,
+        path
+    ]
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+        if result.returncode != 0:
+            logging.warning(f"⚠️ soffice 변환 실패: {result.stderr.strip()}")
+            return None
+    except (subprocess.TimeoutExpired, OSError) as e:
+        logging.warning(f"⚠️ soffice 실행 오류: {str(e)}")
+        return None
+    finally:
+        shutil.rmtree(profile_dir, ignore_errors=True)
+
+    pdf_path = _pdf_path(path, output_dir)
+    return pdf_path if os.path.exists(pdf_path) else None
+
+def _uno_property(name, value):
+    prop = PropertyValue()
+    prop.Name = name
+    prop.Value = value
+    return prop
+
+def _call_with_timeout(timeout, func, *args):
+    """
+    func 를 데몬 스레드에서 실행하고 결과를 반환한다.
+    UNO 호출은 중단할 방법이 없으므로, timeout 초가 지나면 스레드는 버리고 TimeoutError 를 낸다.
+    """
+    outcome = {}
+
+    def target():
+        try:
+            outcome["value"] = func(*args)
+        except BaseException as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=target, name="uno-call", daemon=True)
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        raise TimeoutError(f"{timeout}초 안에 응답이 없습니다")
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome.get("value")
+
+def _uno_desktop(port):
+    local = uno.getComponentContext()
+    resolver = local.ServiceManager.createInstanceWithContext("com.sun.star.bridge.UnoUrlResolver", local)
+    ctx = resolver.resolve(f"uno:socket,host=127.0.0.1,port={port};urp;StarOffice.ComponentContext")
+    return ctx.ServiceManager.createInstanceWithContext("com.sun.star.frame.Desktop", ctx)
+
+def _uno_ping(port):
+    """리스너에 실제 UNO 요청을 보내 응답하는지 확인한다."""
+    desktop = _uno_desktop(port)
+    if desktop is None:
+        raise RuntimeError("Desktop 서비스를 만들 수 없습니다")
+    desktop.getComponents()
+    return True
+
+def _uno_convert(port, path, pdf_path):
+    desktop = _uno_desktop(port)
+    doc = desktop.loadComponentFromURL(
+        uno.systemPathToFileUrl(os.path.abspath(path)), "_blank", 0, (_uno_property("Hidden", True),)
+    )
+    if doc is None:
+        raise RuntimeError("문서를 열 수 없습니다")
+    try:
+        filter_name = next(
+            (name for service, name in _PDF_FILTERS if doc.supportsService(service)),
+            "writer_pdf_Export"
+        )
+        doc.storeToURL(
+            uno.systemPathToFileUrl(os.path.abspath(pdf_path)), (_uno_property("FilterName", filter_name),)
+        )
+    finally:
+        doc.close(True)
+
+def _lock_path(lock_dir, port):
+    return os.path.join(lock_dir, f"listener-{port}.lock")
+
+def _pid_path(lock_dir, port):
+    return os.path.join(lock_dir, f"listener-{port}.pid")
+
+def _kill_listener(lock_dir, port):
+    """
+    pid 파일로 리스너 프로세스 그룹을 종료한다 (리스너를 띄우지 않은 작업 프로세스에서도 호출 가능).
+    재시작은 풀의 상태 확인 스레드가 맡는다.
+    """
+    try:
+        with open(_pid_path(lock_dir, port)) as handle:
+            pid = int(handle.read().strip())
+        os.killpg(pid, signal.SIGKILL)
+    except (OSError, ValueError) as e:
+        logging.warning(f"⚠️ LibreOffice 리스너({port}) 종료 실패: {str(e)}")
+
+def convert_to_pdf_via_listener(path, output_dir, ports, lock_dir, timeout=60):
+    """
+    상주 리스너 중 비어 있는 것을 골라 변환한다. 모두 사용 중이면 하나를 골라 차례를 기다린다.
+    리스너 변환이 실패하면 단발 변환으로 폴백한다.
+    timeout 초 안에 끝나지 않으면 멈춘 리스너를 종료하고 None 을 반환한다
+    (같은 문서로 단발 변환을 다시 기다리지 않는다).
+    """
+    if not RESIDENT_AVAILABLE or not ports:
+        return convert_to_pdf_cold(path, output_dir, timeout)
+
+    os.makedirs(output_dir, exist_ok=True)
+    pdf_path = _pdf_path(path, output_dir)
+    handles = [open(_lock_path(lock_dir, port), "a") for port in ports]
+    try:
+        chosen = None
+        for port, handle in zip(ports, handles):
+            try:
+                fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                chosen = port, handle
+                break
+            except BlockingIOError:
+                continue
+        if chosen is None:
+            # 전부 사용 중이면 프로세스별로 분산해 한 리스너의 잠금을 기다림 (큐잉)
+            index = os.getpid() % len(ports)
+            fcntl.flock(handles[index], fcntl.LOCK_EX)
+            chosen = ports[index], handles[index]
+
+        port, _ = chosen
+        try:
+            started = time.monotonic()
+            _call_with_timeout(timeout, _uno_convert, port, path, pdf_path)
+            logging.info(f"📄 LibreOffice 리스너({port}) 변환 완료 ({time.monotonic() - started:.2f}초)")
+            return pdf_path
+        except TimeoutError:
+            # 잠금을 쥔 채로 종료해, 멈춘 리스너에 다른 요청이 줄 서지 않게 한다
+            logging.error(f"⏰ LibreOffice 리스너({port}) 변환이 {timeout}초를 넘겨 리스너를 종료합니다")
+            _kill_listener(lock_dir, port)
+            return None
+        except Exception as e:
+            logging.warning(f"⚠️ LibreOffice 리스너({port}) 변환 실패, 단발 변환으로 폴백: {str(e)}")
+            return convert_to_pdf_cold(path, output_dir, timeout)
+    finally:
+        for handle in handles:
+            handle.close()
+
+class OfficeListener:
+    def __init__(self, port, profile_dir, pid_path=None, ping_timeout=5):
+        """
+        Args:
+            port (int): UNO 소켓 포트
+            profile_dir (str): 리스너 전용 사용자 프로필 경로
+            pid_path (str, optional): 다른 프로세스가 리스너를 종료할 수 있도록 pid 를 기록할 파일
+            ping_timeout (float): 상태 확인 UNO 왕복 제한 시간(초)
+        """
+        self.port = port
+        self.profile_dir = profile_dir
+        self.pid_path = pid_path
+        self.ping_timeout = ping_timeout
+        self.proc = None
+
+    def start(self, startup_timeout=30):
+        os.makedirs(self.profile_dir, exist_ok=True)
+        cmd = [
+            SOFFICE_BINARY,
+            f"-env:UserInstallation=file://{os.path.abspath(self.profile_dir)}",
+            "--headless", "--invisible", "--nologo", "--norestore", "--nodefault",
+            f"--accept=socket,host=127.0.0.1,port={self.port};urp;StarOffice.ComponentContext"
+        ]
+        self.proc = subprocess.Popen(
+            cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True
+        )
+        if self.pid_path:
+            with open(self.pid_path, "w") as handle:
+                handle.write(str(self.proc.pid))
+        deadline = time.monotonic() + startup_timeout
+        while time.monotonic() < deadline:
+            if self.is_healthy():
+                logging.info(f"🚀 LibreOffice 리스너 시작 (port {self.port})")
+                return True
+            if self.proc.poll() is not None:
+                break
+            time.sleep(0.2)
+        logging.error(f"❌ LibreOffice 리스너 시작 실패 (port {self.port})")
+        self.stop()
+        return False
+
+    def is_healthy(self):
+        """프로세스가 살아 있고 UNO 요청에 ping_timeout 안에 응답하는지 확인한다."""
+        if self.proc is None or self.proc.poll() is not None:
+            return False
+        if not UNO_AVAILABLE:
+            try:
+                with socket.create_connection(("127.0.0.1", self.port), timeout=1):
+                    return True
+            except OSError:
+                return False
+        try:
+            return _call_with_timeout(self.ping_timeout, _uno_ping, self.port)
+        except Exception:
+            return False
+
+    def stop(self):
+        if self.proc is None:
+            return
+        try:
+            os.killpg(self.proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        try:
+            self.proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            # 종료되지 않는 프로세스가 있어도 재시작은 계속 진행한다
+            logging.warning(f"⚠️ LibreOffice 리스너(port {self.port}, pid {self.proc.pid}) 종료 대기 시간 초과")
+        self.proc = None
+        if self.pid_path and os.path.exists(self.pid_path):
+            os.remove(self.pid_path)
+
+    def restart(self):
+        logging.info(f"♻️ LibreOffice 리스너 재시작 (port {self.port})")
+        self.stop()
+        return self.start()
+
+class OfficeListenerPool:
+    """
+    상주 LibreOffice 리스너 묶음. 시작 후 종료할 때까지 리스너를 유지하고 주기적으로 상태를 확인한다.
+    변환은 convert_to_pdf_via_listener(..., pool.ports, pool.lock_dir) 로 보낸다 (다른 프로세스에서도 가능).
+    """
+    def __init__(self, instances=2, base_port=2002, root=None, check_interval=10):
+        self.root = root or tempfile.mkdtemp(prefix="lo-listeners-")
+        self.lock_dir = self.root
+        self.check_interval = check_interval
+        self.listeners = [
+            OfficeListener(
+                base_port + i,
+                os.path.join(self.root, f"profile-{base_port + i}"),
+                pid_path=_pid_path(self.lock_dir, base_port + i)
+            )
+            for i in range(instances)
+        ]
+        self._start_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._monitor = None
+
+    @property
+    def ports(self):
+        return [listener.port for listener in self.listeners if listener.proc is not None]
+
+    def start(self):
+        """리스너를 동시에 띄우고 상태 확인 스레드를 시작한다. 이미 시작했으면 그대로 둔다."""
+        with self._start_lock:
+            if self._monitor is not None:
+                return self
+            os.makedirs(self.root, exist_ok=True)
+            threads = [
+                threading.Thread(target=listener.start, name=f"office-start-{listener.port}")
+                for listener in self.listeners
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self._stop.clear()
+            self._monitor = threading.Thread(target=self._monitor_loop, name="office-monitor", daemon=True)
+            self._monitor.start()
+            return self
+
+    def _monitor_loop(self):
+        while not self._stop.wait(self.check_interval):
+            for listener in self.listeners:
+                if not listener.is_healthy():
+                    # 변환 중인 요청과 겹치지 않도록 해당 리스너 잠금을 잡은 뒤 재시작
+                    with open(_lock_path(self.lock_dir, listener.port), "a") as handle:
+                        fcntl.flock(handle, fcntl.LOCK_EX)
+                        if not listener.is_healthy():
+                            listener.restart()
+
+    def shutdown(self):
+        self._stop.set()
+        if self._monitor is not None:
+            self._monitor.join()
+            self._monitor = None
+        for listener in self.listeners:
+            listener.stop()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_office_listener_pool():
+    """
+    프로세스 전역 LibreOffice 리스너 풀 (STATE_DIR/office).
+    처음 사용할 때 리스너를 띄우고, 프로세스가 끝날 때 종료한다.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = OfficeListenerPool(
+                instances=OFFICE_LISTENERS,
+                base_port=OFFICE_BASE_PORT,
+                root=os.path.join(STATE_DIR, "office")
+            )
+            atexit.register(_pool.shutdown)
+    return _pool.start()
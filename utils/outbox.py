@@ -0,0 +1,241 @@
+# utils/outbox.py
+"""
+스크래핑과 API 전송을 분리하는 로컬 outbox (SQLite WAL).
+
+스크래퍼는 결과를 outbox 에 기록(enqueue)만 하고 바로 다음 작업으로 넘어가며,
+백그라운드 flusher 가 토픽별로 묶어 전송한다.
+
+- 항목마다 내용 기반 멱등성 키를 만들어 Idempotency-Key 헤더로 보낸다 (재전송 시 중복 저장 방지)
+- 같은 키는 한 번만 기록된다 (INSERT OR IGNORE)
+- 전송 실패 항목은 지수 백오프로 다시 시도하고, 성공한 항목만 삭제한다
+- WAL 모드라 별도 프로세스로 실행되는 작업도 같은 파일에 안전하게 기록할 수 있다
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from utils.api import post_stock_data_batch, post_keyword_payloads, post_crawled_data_to_api
+from utils.sqlite_store import connect_sqlite
+from utils.config import (
+    STATE_DIR, OUTBOX_ENABLED, OUTBOX_BATCH_SIZE, OUTBOX_FLUSH_INTERVAL, OUTBOX_BACKOFF_BASE, OUTBOX_BACKOFF_MAX
+)
+
+# 토픽 → 전송 함수 (payloads, keys → 항목별 성공 여부 리스트)
+TOPIC_STOCKS = "stocks"
+TOPIC_SEARCH_TERMS = "search_terms"
+TOPIC_CRAWL_DATA = "crawl_data"
+
+SENDERS = {
+    TOPIC_STOCKS: post_stock_data_batch,
+    TOPIC_SEARCH_TERMS: post_keyword_payloads,
+    TOPIC_CRAWL_DATA: post_crawled_data_to_api,
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    topic TEXT NOT NULL,
+    idempotency_key TEXT NOT NULL UNIQUE,
+    payload TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    created_at REAL NOT NULL,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS outbox_due ON outbox (topic, next_attempt_at, id);
+"""
+
+def make_idempotency_key(topic, payload):
+    """토픽과 payload 내용으로 멱등성 키를 만든다 (같은 내용이면 같은 키)."""
+    body = json.dumps(payload, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(f"{topic}\n{body}".encode("utf-8")).hexdigest()
+
+class Outbox:
+    def __init__(self, path, senders=None, batch_size=100, backoff_base=2.0, backoff_max=300.0):
+        """
+        Args:
+            path (str): SQLite 파일 경로
+            senders (dict, optional): 토픽 → 전송 함수 (기본값: SENDERS)
+            batch_size (int): 한 번에 전송할 최대 항목 수
+            backoff_base (float): 재시도 대기 기본값(초), 실패할 때마다 두 배
+            backoff_max (float): 재시도 대기 상한(초)
+        """
+        self.path = path
+        self.senders = senders if senders is not None else SENDERS
+        self.batch_size = batch_size
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+        self._conn = connect_sqlite(path, _SCHEMA)
+
+    def enqueue(self, topic, payloads):
+        """
+        payload 목록을 outbox 에 기록한다. 이미 기록된(같은 키) 항목은 무시한다.
+
+        Returns:
+            int: 새로 기록된 항목 수
+        """
+        if topic not in self.senders:
+            raise ValueError(f"알 수 없는 outbox 토픽: {topic}")
+        now = time.time()
+        rows = [
+            (topic, make_idempotency_key(topic, payload), json.dumps(payload, ensure_ascii=False), now, now)
+            for payload in payloads
+        ]
+        with self._lock:
+            before = self._conn.total_changes
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO outbox (topic, idempotency_key, payload, next_attempt_at, created_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    rows
+                )
+            added = self._conn.total_changes - before
+        logging.info(f"📥 [outbox:{topic}] {added}/{len(rows)}건 기록")
+        return added
+
+    def pending_count(self, topic=None):
+        with self._lock:
+            if topic is None:
+                return self._conn.execute("SELECT COUNT(*) FROM outbox").fetchone()[0]
+            return self._conn.execute("SELECT COUNT(*) FROM outbox WHERE topic = ?", (topic,)).fetchone()[0]
+
+    def _due_batch(self, topic, now):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT id, idempotency_key, payload, attempts FROM outbox "
+                "WHERE topic = ? AND next_attempt_at <= ? ORDER BY id LIMIT ?",
+                (topic, now, self.batch_size)
+            ).fetchall()
+
+    def _backoff(self, attempts):
+        return min(self.backoff_max, self.backoff_base * (2 ** (attempts - 1)))
+
+    def _record_results(self, rows, flags, error=None):
+        now = time.time()
+        done = [(row[0],) for row, ok in zip(rows, flags) if ok]
+        failed = [
+            (row[3] + 1, now + self._backoff(row[3] + 1), error, row[0])
+            for row, ok in zip(rows, flags) if not ok
+        ]
+        with self._lock:
+            with self._conn:
+                self._conn.executemany("DELETE FROM outbox WHERE id = ?", done)
+                self._conn.executemany(
+                    "UPDATE outbox SET attempts = ?, next_attempt_at = ?, last_error = ? WHERE id = ?",
+                    failed
+                )
+        return len(done), len(failed)
+
+    def flush(self, max_batches=None):
+        """
+        전송 시각이 된 항목을 토픽별로 묶어 전송한다.
+        한 토픽의 배치가 전부 실패하면(백엔드 장애) 그 토픽은 이번 flush 에서 더 시도하지 않는다.
+
+        Returns:
+            tuple: (전송 성공 수, 실패 수)
+        """
+        sent = failed = 0
+        with self._flush_lock:
+            for topic, sender in self.senders.items():
+                batches = 0
+                while max_batches is None or batches < max_batches:
+                    rows = self._due_batch(topic, time.time())
+                    if not rows:
+                        break
+                    batches += 1
+                    payloads = [json.loads(row[2]) for row in rows]
+                    keys = [row[1] for row in rows]
+                    try:
+                        flags = sender(payloads, keys=keys)
+                        error = None if all(flags) else "전송 실패"
+                    except Exception as e:
+                        flags = [False] * len(rows)
+                        error = str(e)
+                    ok, ng = self._record_results(rows, flags, error)
+                    sent += ok
+                    failed += ng
+                    if ng:
+                        logging.warning(f"⚠️ [outbox:{topic}] {ng}건 전송 실패, 백오프 후 재시도")
+                    if not ok:
+                        break
+        if sent or failed:
+            logging.info(f"📤 [outbox] 전송 {sent}건 / 실패 {failed}건 / 대기 {self.pending_count()}건")
+        return sent, failed
+
+    def _flush_loop(self, interval):
+        while not self._stop.wait(interval):
+            try:
+                self.flush()
+            except Exception as e:
+                logging.error(f"❌ [outbox] flush 오류: {str(e)}")
+
+    def start_flusher(self, interval=5.0):
+        """백그라운드 flusher 스레드를 시작한다."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._flush_loop, args=(interval,), name="outbox-flusher", daemon=True)
+        self._thread.start()
+        logging.info(f"📮 [outbox] flusher 시작 (주기 {interval}초, 대기 {self.pending_count()}건)")
+
+    def stop_flusher(self, flush=True):
+        """flusher 를 멈추고, flush=True 면 남은 항목을 한 번 더 전송한다."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if flush:
+            self.flush()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+_outbox = None
+_outbox_lock = threading.Lock()
+
+def get_outbox():
+    """프로세스 전역 outbox 를 반환한다."""
+    global _outbox
+    with _outbox_lock:
+        if _outbox is None:
+            _outbox = Outbox(
+                os.path.join(STATE_DIR, "outbox.db"),
+                batch_size=OUTBOX_BATCH_SIZE,
+                backoff_base=OUTBOX_BACKOFF_BASE,
+                backoff_max=OUTBOX_BACKOFF_MAX
+            )
+        return _outbox
+
+def start_outbox_flusher():
+    if OUTBOX_ENABLED:
+        get_outbox().start_flusher(OUTBOX_FLUSH_INTERVAL)
+
+def stop_outbox_flusher():
+    if OUTBOX_ENABLED and _outbox is not None:
+        _outbox.stop_flusher()
+
+def deliver(topic, payloads):
+    """
+    스크래퍼용 전송 진입점. 항목별 성공 여부 리스트를 반환한다.
+    OUTBOX_ENABLED 면 outbox 에 기록만 하고(기록 = 성공) 전송은 flusher 에 맡기며,
+    아니면 기존처럼 바로 전송한다.
+    """
+    payloads = list(payloads)
+    if not OUTBOX_ENABLED:
+        return SENDERS[topic](payloads)
+    get_outbox().enqueue(topic, payloads)
+    return [True] * len(payloads)
+
+def flush_outbox():
+    """남은 항목을 즉시 전송한다 (단독 실행 스크립트의 종료 직전 호출용)."""
+    if not OUTBOX_ENABLED:
+        return 0, 0
+    return get_outbox().flush()
@@ -0,0 +1,18 @@
+# utils/process_utils.py
+"""
+작업 프로세스 정리 헬퍼 (스케줄러 실행기와 추출 엔진이 함께 사용).
+"""
+import os
+import signal
+
+def kill_process_group(proc):
+    """setpgrp 로 새 프로세스 그룹을 만든 자식 프로세스를 그 자식들까지 함께 종료한다."""
+    try:
+        if hasattr(os, "killpg"):
+            os.killpg(proc.pid, signal.SIGKILL)
+        else:
+            proc.kill()
+    except ProcessLookupError:
+        # 자식이 아직 프로세스 그룹을 만들기 전이면 프로세스만 종료
+        proc.kill()
+    proc.join(5)
@@ -0,0 +1,82 @@
+# utils/rate_limiter.py
+"""
+분당 요청 수(RPM) / 분당 토큰 수(TPM) 토큰 버킷 (asyncio).
+
+- 요청 전 acquire(예상 토큰 수) 로 두 버킷에서 함께 차감하고, 모자라면 채워질 때까지 기다린다
+- 응답의 실제 사용량으로 adjust() 해 예상치와의 차이를 보정한다
+- 429 응답을 받으면 pause(Retry-After) 로 모든 요청을 잠시 멈추고, 요청 버킷을 비워 천천히 다시 올라가게 한다
+"""
+import asyncio
+import time
+
+class TokenBucket:
+    def __init__(self, per_minute):
+        """
+        Args:
+            per_minute (float): 분당 허용량 (버킷 크기이기도 함)
+        """
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount, now):
+        """amount 만큼 쓸 수 있을 때까지 남은 시간(초)"""
+        self._refill(now)
+        if self.tokens >= amount:
+            return 0
+        return (amount - self.tokens) / self.rate
+
+    def consume(self, amount):
+        self.tokens -= amount
+
+    def drain(self):
+        self.tokens = min(self.tokens, 0)
+
+class RateLimiter:
+    def __init__(self, rpm=0, tpm=0):
+        """
+        Args:
+            rpm (int): 분당 요청 수 상한 (0 이면 제한 없음)
+            tpm (int): 분당 토큰 수 상한 (0 이면 제한 없음)
+        """
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+        self._blocked_until = 0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens=0):
+        """요청 1건과 tokens 만큼의 여유가 생길 때까지 기다린 뒤 차감한다 (요청 순서대로)."""
+        if self.tokens:
+            # 버킷보다 큰 요청이 영원히 기다리지 않도록 버킷 크기로 제한
+            tokens = min(tokens, self.tokens.capacity)
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                wait = self._blocked_until - now
+                if self.requests:
+                    wait = max(wait, self.requests.wait_time(1, now))
+                if self.tokens:
+                    wait = max(wait, self.tokens.wait_time(tokens, now))
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+            if self.requests:
+                self.requests.consume(1)
+            if self.tokens:
+                self.tokens.consume(tokens)
+
+    def adjust(self, delta):
+        """실제 사용 토큰과 예상치의 차이(실제 - 예상)를 반영한다."""
+        if self.tokens:
+            self.tokens.tokens = min(self.tokens.capacity, self.tokens.tokens - delta)
+
+    def pause(self, seconds):
+        """429 응답 시 seconds 동안 새 요청을 막고, 이후 요청 버킷이 다시 차오르며 재개되게 한다."""
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+        if self.requests:
+            self.requests.drain()
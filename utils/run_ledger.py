@@ -0,0 +1,139 @@
+# utils/run_ledger.py
+"""
+종목별 진행 상태를 기록하는 실행 원장 (SQLite).
+
+- 실행 ID 단위로 종목마다 pending / in_flight / done / failed 상태를 남긴다
+- 같은 실행 ID 로 다시 시작하면 done 이 아닌 종목만 이어서 처리한다
+  (이전 실행이 죽으면서 남긴 in_flight 는 pending 으로 되돌린다)
+- 종목 안에서 저장에 성공한 행(매핑 항목)의 키도 기록해, 다시 처리할 때 실패한 행만 보낸다
+- 종목 목록을 심볼 해시로 N 개 샤드로 나눠, 여러 프로세스/머신이 겹치지 않게 나눠 처리할 수 있다
+"""
+import hashlib
+import logging
+import threading
+import time
+from utils.sqlite_store import connect_sqlite
+
+PENDING = "pending"
+IN_FLIGHT = "in_flight"
+DONE = "done"
+FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS run_ledger (
+    run_id TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (run_id, symbol)
+);
+CREATE TABLE IF NOT EXISTS run_ledger_rows (
+    run_id TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    row_key TEXT NOT NULL,
+    saved_at REAL NOT NULL,
+    PRIMARY KEY (run_id, symbol, row_key)
+);
+"""
+
+def shard_of(symbol, shards):
+    """심볼의 샤드 번호 (0 ~ shards-1). 프로세스/머신이 달라도 같은 값이 나오도록 SHA-256 을 쓴다."""
+    if shards <= 1:
+        return 0
+    return int(hashlib.sha256(symbol.encode("utf-8")).hexdigest()[:8], 16) % shards
+
+def select_shard(companies, shard, shards, key="symbol"):
+    """companies 중 shard 번 샤드에 속한 항목만 고른다."""
+    if not 0 <= shard < max(shards, 1):
+        raise ValueError(f"샤드 번호는 0 ~ {shards - 1} 이어야 합니다: {shard}")
+    return [company for company in companies if shard_of(company[key], shards) == shard]
+
+class RunLedger:
+    def __init__(self, path, run_id):
+        """
+        Args:
+            path (str): SQLite 파일 경로
+            run_id (str): 실행 ID (같은 ID 로 다시 시작하면 이어서 처리)
+        """
+        self.path = path
+        self.run_id = run_id
+        self._lock = threading.Lock()
+
+        self._conn = connect_sqlite(path, _SCHEMA)
+
+    def begin(self, companies, key="symbol"):
+        """
+        이번 실행에서 처리할 종목을 원장에 올리고, 아직 끝나지 않은 종목만 반환한다.
+        companies 는 이 프로세스가 맡은 샤드의 종목이어야 한다.
+        """
+        now = time.time()
+        symbols = [company[key] for company in companies]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO run_ledger (run_id, symbol, status, updated_at) VALUES (?, ?, ?, ?)",
+                [(self.run_id, symbol, PENDING, now) for symbol in symbols]
+            )
+            # 이 샤드를 맡았던 이전 프로세스가 처리 중에 죽은 종목
+            self._conn.executemany(
+                "UPDATE run_ledger SET status = ?, updated_at = ? WHERE run_id = ? AND symbol = ? AND status = ?",
+                [(PENDING, now, self.run_id, symbol, IN_FLIGHT) for symbol in symbols]
+            )
+            done = {
+                row[0] for row in self._conn.execute(
+                    "SELECT symbol FROM run_ledger WHERE run_id = ? AND status = ?", (self.run_id, DONE)
+                )
+            }
+
+        remaining = [company for company in companies if company[key] not in done]
+        logging.info(
+            f"📒 실행 원장 [{self.run_id}]: {len(companies)}개 중 완료 {len(companies) - len(remaining)}, "
+            f"남은 종목 {len(remaining)}"
+        )
+        return remaining
+
+    def mark(self, symbol, status, error=None):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE run_ledger SET status = ?, error = ?, updated_at = ?, "
+                "attempts = attempts + (CASE WHEN ? = ? THEN 1 ELSE 0 END) "
+                "WHERE run_id = ? AND symbol = ?",
+                (status, error, time.time(), status, IN_FLIGHT, self.run_id, symbol)
+            )
+
+    def saved_rows(self, symbol):
+        """종목에서 이미 저장에 성공한 행 키 집합"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT row_key FROM run_ledger_rows WHERE run_id = ? AND symbol = ?", (self.run_id, symbol)
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def mark_rows_saved(self, symbol, row_keys):
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO run_ledger_rows (run_id, symbol, row_key, saved_at) VALUES (?, ?, ?, ?)",
+                [(self.run_id, symbol, row_key, now) for row_key in row_keys]
+            )
+
+    def counts(self):
+        """상태별 종목 수"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM run_ledger WHERE run_id = ? GROUP BY status", (self.run_id,)
+            ).fetchall()
+        return dict(rows)
+
+    def failed(self):
+        """실패한 종목과 마지막 오류"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT symbol, error FROM run_ledger WHERE run_id = ? AND status = ? ORDER BY symbol",
+                (self.run_id, FAILED)
+            ).fetchall()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,25 @@
+# utils/sqlite_store.py
+"""
+로컬 상태 저장소(outbox, 매핑 캐시, 실행 원장)가 함께 쓰는 SQLite 연결 설정.
+
+- autocommit 연결 하나를 여러 스레드가 잠금으로 나눠 쓴다 (check_same_thread=False)
+- WAL 모드라 별도 프로세스로 실행되는 작업도 같은 파일에 안전하게 기록할 수 있다
+"""
+import os
+import sqlite3
+
+def connect_sqlite(path, schema):
+    """
+    Args:
+        path (str): SQLite 파일 경로 (상위 디렉토리가 없으면 만든다)
+        schema (str): 연결 직후 실행할 CREATE ... IF NOT EXISTS 스크립트
+
+    Returns:
+        sqlite3.Connection
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(schema)
+    return conn
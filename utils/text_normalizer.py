@@ -0,0 +1,127 @@
+# utils/text_normalizer.py
+"""
+추출 문서 텍스트 정리기 (한 번 훑기, 스트리밍).
+
+- 추출기가 내보내는 청크(문단, 페이지 등)를 받아 줄 단위로 정리한 결과를 조각으로 내보낸다
+- 문서 전체를 줄 목록으로 만들지 않고 청크(긴 문자열은 64K 글자 창) 단위로 줄을 나누며,
+  청크 경계에 걸친 줄만 이어 붙인다
+- 정리 규칙은 clean_content 와 같다: 줄 앞뒤 공백 제거, 연속 빈 줄/연속 중복 줄 제거,
+  표 테두리(+---+) 줄은 중복이어도 유지, 끝의 빈 줄 제거
+- 최대 길이를 주면 상한까지만 쓰고 나머지 입력은 읽지 않는다
+"""
+import logging
+
+WINDOW_CHARS = 64 * 1024
+
+def _windows(text, size):
+    """긴 문자열을 창 단위 청크로 나눈다 (줄 목록을 한 번에 만들지 않도록)"""
+    for start in range(0, len(text), size):
+        yield text[start:start + size]
+
+def _iter_line_batches(chunks):
+    """청크마다 완성된 줄 목록을 내보낸다. 청크 경계에 걸친 줄은 다음 청크와 이어 붙인다."""
+    carry = []
+    for chunk in chunks:
+        if not chunk:
+            continue
+        lines = chunk.split("\n")
+        if len(lines) == 1:
+            carry.append(chunk)
+            continue
+        if carry:
+            carry.append(lines[0])
+            lines[0] = "".join(carry)
+        carry = [lines.pop()]
+        yield lines
+    if carry:
+        yield ["".join(carry)]
+
+def normalize_chunks(chunks):
+    """
+    정리된 텍스트를 청크 단위 조각으로 내보낸다. 조각을 이어 붙이면 clean_content 결과와 같다.
+    빈 줄은 뒤에 내용이 이어질 때만 내보내므로 끝의 빈 줄이 남지 않는다.
+    """
+    prev_line = ""
+    blank_pending = False
+    started = False
+    for lines in _iter_line_batches(chunks):
+        # 앞 조각 뒤에 이어지면 "" 로 시작해 join 결과가 줄바꿈으로 시작하게 한다
+        out = [""] if started else []
+        for line in lines:
+            line = line.strip()
+            if not line:
+                if prev_line:  # 연속된 빈 줄 제거
+                    blank_pending = True
+                    prev_line = ""
+                continue
+
+            if blank_pending:
+                out.append("")
+                blank_pending = False
+
+            # 표 형식 유지
+            if line[0] == "+" and line[-1] == "+":
+                out.append(line)
+                prev_line = line
+                continue
+
+            if line != prev_line:  # 중복 라인 제거
+                out.append(line)
+                prev_line = line
+
+        if len(out) > started:
+            yield "\n".join(out)
+            started = True
+
+class BoundedTextBuffer:
+    """최대 글자 수까지만 담는 텍스트 버퍼"""
+    def __init__(self, max_chars):
+        self.max_chars = max_chars
+        self.size = 0
+        self.truncated = False
+        self._parts = []
+
+    def write(self, text):
+        """text 를 담는다. 상한에 닿으면 잘라 담고 False 를 반환한다."""
+        room = self.max_chars - self.size
+        if len(text) > room:
+            text = text[:room]
+            self.truncated = True
+        if text:
+            self._parts.append(text)
+            self.size += len(text)
+        return not self.truncated
+
+    def getvalue(self):
+        return "".join(self._parts)
+
+def normalize_text(content, max_chars=None):
+    """
+    추출 텍스트를 정리한다.
+
+    Args:
+        content (str | iterable): 텍스트 또는 텍스트 청크 목록/제너레이터
+        max_chars (int, optional): 결과 최대 글자 수 (없거나 0 이면 제한 없음)
+
+    Returns:
+        str: 정리된 텍스트
+    """
+    if not content:
+        return ""
+    chunks = _windows(content, WINDOW_CHARS) if isinstance(content, str) else content
+    if not max_chars:
+        return "".join(normalize_chunks(chunks))
+
+    buffer = BoundedTextBuffer(max_chars)
+    pieces = normalize_chunks(chunks)
+    try:
+        for piece in pieces:
+            if not buffer.write(piece):
+                logging.info(f"✂️ 추출 텍스트가 {max_chars}자를 넘어 잘랐습니다")
+                break
+    finally:
+        # 상한에 닿으면 추출기 제너레이터까지 닫아 남은 문단/페이지는 읽지 않는다
+        pieces.close()
+        if not isinstance(content, str) and hasattr(content, "close"):
+            content.close()
+    return buffer.getvalue()